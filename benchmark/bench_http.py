@@ -0,0 +1,253 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# ローカルの GS2 スタブサーバーに対して fast_requests と AbstractGs2Client のスループットとレイテンシを計測する
+# Python 2 では同期版 (スレッド)、Python 3 では asyncio 版を計測する
+#
+#   python benchmark/bench_http.py [--concurrency 1,8,32] [--sizes 256,16384] [--requests 2000]
+#                                  [--output result.json] [--baseline baseline.json] [--threshold 0.1]
+#
+# --baseline を指定すると結果を比較し、スループットまたは p99 が threshold を超えて悪化したケースがあれば
+# 終了コード 1 で終了する
+
+import argparse
+import base64
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+from stub_server import StubServer
+
+from gs2_core_client.AbstractGs2Client import AbstractGs2Client
+from gs2_core_client.model.BasicGs2Credential import BasicGs2Credential
+
+METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+
+CLIENT_ID = 'GKIT-BENCHMARK'
+CLIENT_SECRET = base64.b64encode(b'0123456789abcdef0123456789abcdef').decode('ascii')
+
+
+def make_credential():
+    return BasicGs2Credential(CLIENT_ID, CLIENT_SECRET)
+
+
+def make_sync_call(target, method, url, size):
+    """
+    1回分のリクエストを発行する関数を生成する
+    :return: 関数
+    :rtype: () -> None
+    """
+    from gs2_core_client.fast_requests import requests
+
+    body = {'payload': 'x' * size} if method in ('POST', 'PUT') else None
+    if target == 'fast_requests':
+        func = getattr(requests, method.lower())
+        if body is None:
+            return lambda: func(url=url, headers={})
+        return lambda: func(url=url, json=body, headers={})
+
+    client = AbstractGs2Client(make_credential(), 'local')
+    if method == 'GET':
+        return lambda: client._do_get_request(url, 'bench', 'Bench', 'Get', {}, {})
+    elif method == 'POST':
+        return lambda: client._do_post_request(url, 'bench', 'Bench', 'Post', body, {})
+    elif method == 'PUT':
+        return lambda: client._do_put_request(url, 'bench', 'Bench', 'Put', body, {})
+    return lambda: client._do_delete_request(url, 'bench', 'Bench', 'Delete', {}, {})
+
+
+def run_sync(target, method, url, size, concurrency, total):
+    """
+    スレッドで並列にリクエストを発行して計測する
+    :return: (各リクエストの所要時間, エラー数, 全体の所要時間)
+    :rtype: (list[float], int, float)
+    """
+    call = make_sync_call(target, method, url, size)
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    per_worker = total // concurrency
+
+    def worker():
+        local = []
+        failed = 0
+        for _ in range(per_worker):
+            started_at = time.time()
+            try:
+                call()
+            except Exception:
+                failed += 1
+            local.append(time.time() - started_at)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started_at = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.time() - started_at
+
+
+def percentile(values, quantile):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(quantile * (len(values) - 1))))
+    return values[index]
+
+
+def case_key(result):
+    return '{target} {method} c={concurrency} size={size}'.format(**result)
+
+
+def compare(results, baseline, threshold):
+    """
+    ベースラインと比較する
+    :return: 悪化したケースの説明
+    :rtype: list[str]
+    """
+    previous = dict((case_key(result), result) for result in baseline['results'])
+    regressions = []
+    print('')
+    print('{case:<44} {rps:>22} {p99:>24}'.format(case='case', rps='rps (baseline)', p99='p99 ms (baseline)'))
+    for result in results:
+        key = case_key(result)
+        base = previous.get(key)
+        if base is None:
+            continue
+        rps_change = result['rps'] / base['rps'] - 1 if base['rps'] else 0.0
+        p99_change = result['p99_ms'] / base['p99_ms'] - 1 if base['p99_ms'] else 0.0
+        mark = ''
+        if rps_change < -threshold or p99_change > threshold:
+            mark = '  REGRESSION'
+            regressions.append('{key}: rps {rps_change:+.1%}, p99 {p99_change:+.1%}'.format(
+                key=key, rps_change=rps_change, p99_change=p99_change))
+        print('{case:<44} {rps:9.0f} ({base_rps:9.0f}) {p99:10.2f} ({base_p99:10.2f}){mark}'.format(
+            case=key, rps=result['rps'], base_rps=base['rps'], p99=result['p99_ms'], base_p99=base['p99_ms'],
+            mark=mark))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='fast_requests / AbstractGs2Client benchmark')
+    parser.add_argument('--concurrency', default='1,8,32')
+    parser.add_argument('--sizes', default='256,16384')
+    parser.add_argument('--methods', default=','.join(METHODS))
+    parser.add_argument('--targets', default='fast_requests,client')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per case')
+    parser.add_argument('--latency', type=float, default=0.0, help='server latency in seconds')
+    parser.add_argument('--drop-every', type=int, default=0, help='server drops keep-alive every N responses')
+    parser.add_argument('--certfile', help='serve HTTPS with this certificate (verification is disabled)')
+    parser.add_argument('--keyfile')
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--baseline', help='compare with a previous JSON result')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed regression ratio')
+    args = parser.parse_args()
+
+    concurrency_levels = [int(value) for value in args.concurrency.split(',')]
+    sizes = [int(value) for value in args.sizes.split(',')]
+    methods = [value.upper() for value in args.methods.split(',')]
+    targets = args.targets.split(',')
+
+    server = StubServer(
+        latency=args.latency,
+        drop_every=args.drop_every,
+        certfile=args.certfile,
+        keyfile=args.keyfile,
+    ).start()
+
+    use_async = sys.version_info[0] >= 3
+    if use_async:
+        from bench_http_async import run_async as run
+        if server.secure:
+            from gs2_core_client.fast_requests import async_requests
+            from gs2_core_client.fast_requests.tls import create_session_resuming_context
+            async_requests._ssl_context = create_session_resuming_context(verify=False)
+    else:
+        run = run_sync
+        from gs2_core_client.fast_requests import requests
+        requests.configure_pool(max_size=max(concurrency_levels))
+        if server.secure:
+            import ssl
+            ssl._create_default_https_context = ssl._create_unverified_context
+
+    results = []
+    for target in targets:
+        for method in methods:
+            for size in sizes:
+                url = '{base}/size/{size}'.format(base=server.get_url(), size=size)
+                run(target, method, url, size, 1, min(50, args.requests))
+                for concurrency in concurrency_levels:
+                    latencies, errors, elapsed = run(target, method, url, size, concurrency, args.requests)
+                    latencies.sort()
+                    result = {
+                        'target': target,
+                        'method': method,
+                        'concurrency': concurrency,
+                        'size': size,
+                        'requests': len(latencies),
+                        'errors': errors,
+                        'rps': len(latencies) / elapsed if elapsed else 0.0,
+                        'mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+                        'p50_ms': percentile(latencies, 0.5) * 1000,
+                        'p99_ms': percentile(latencies, 0.99) * 1000,
+                    }
+                    results.append(result)
+                    print('{case:<44} {rps:9.0f} rps  p50 {p50:8.2f} ms  p99 {p99:8.2f} ms  errors {errors}'.format(
+                        case=case_key(result), rps=result['rps'], p50=result['p50_ms'], p99=result['p99_ms'],
+                        errors=errors))
+
+    server.shutdown()
+
+    output = {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'mode': 'asyncio' if use_async else 'threads',
+            'timestamp': int(time.time()),
+            'latency': args.latency,
+            'drop_every': args.drop_every,
+            'tls': server.secure,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('')
+            print('{count} regression(s) beyond {threshold:.0%}:'.format(
+                count=len(regressions), threshold=args.threshold))
+            for regression in regressions:
+                print('  ' + regression)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# bench_http.py から Python 3 で実行したときに使用する asyncio 版の計測処理
+
+import asyncio
+import time
+
+from gs2_core_client.AbstractGs2AsyncClient import AbstractGs2AsyncClient
+from gs2_core_client.fast_requests import async_requests
+
+from bench_http import make_credential
+
+_loop = None
+
+
+def run_async(target, method, url, size, concurrency, total):
+    """
+    asyncio で並列にリクエストを発行して計測する
+    :return: (各リクエストの所要時間, エラー数, 全体の所要時間)
+    :rtype: (list[float], int, float)
+    """
+    body = {'payload': 'x' * size} if method in ('POST', 'PUT') else None
+    client = AbstractGs2AsyncClient(make_credential(), 'local')
+
+    def call():
+        if target == 'fast_requests':
+            func = getattr(async_requests, method.lower())
+            if body is None:
+                return func(url=url, headers={})
+            return func(url=url, json=body, headers={})
+        if method == 'GET':
+            return client._do_get_request_async(url, 'bench', 'Bench', 'Get', {}, {})
+        elif method == 'POST':
+            return client._do_post_request_async(url, 'bench', 'Bench', 'Post', body, {})
+        elif method == 'PUT':
+            return client._do_put_request_async(url, 'bench', 'Bench', 'Put', body, {})
+        return client._do_delete_request_async(url, 'bench', 'Bench', 'Delete', {}, {})
+
+    latencies = []
+    errors = [0]
+    per_worker = total // concurrency
+
+    async def worker():
+        for _ in range(per_worker):
+            started_at = time.time()
+            try:
+                await call()
+            except Exception:
+                errors[0] += 1
+            latencies.append(time.time() - started_at)
+
+    async def main():
+        started_at = time.time()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        return time.time() - started_at
+
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    elapsed = _loop.run_until_complete(main())
+    return latencies, errors[0], elapsed
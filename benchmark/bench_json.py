@@ -0,0 +1,91 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# GS2 のレスポンスに近いサイズの JSON で、各バックエンドのエンコード/デコード速度を計測する
+#
+#   python benchmark/bench_json.py [iterations]
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+from gs2_core_client.fast_requests import json_codec
+
+
+def make_item(index):
+    return {
+        'itemId': 'grn:gs2:ap-northeast-1:0123456789:inventory:inventory-0001:user-{index:08d}:item-{index}'.format(
+            index=index),
+        'inventoryId': 'grn:gs2:ap-northeast-1:0123456789:inventory:inventory-0001:user-{index:08d}'.format(
+            index=index),
+        'userId': 'user-{index:08d}'.format(index=index),
+        'name': u'ポーション-{index}'.format(index=index),
+        'count': index % 99,
+        'max': 99,
+        'meta': '{"rarity": 3, "tags": ["consumable", "heal"]}',
+        'expireAt': 0,
+        'createAt': 1500000000000 + index,
+        'updateAt': 1500000000000 + index,
+    }
+
+
+PAYLOADS = [
+    ('small (1 item)', {'item': make_item(0)}),
+    ('medium (30 items)', {'items': [make_item(i) for i in range(30)], 'nextPageToken': 'token'}),
+    ('large (1000 items)', {'items': [make_item(i) for i in range(1000)], 'nextPageToken': 'token'}),
+]
+
+
+def legacy_loads(body):
+    try:
+        body = body.encode('utf-8')
+    except (UnicodeDecodeError, AttributeError):
+        pass
+    return json.loads(body)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    backends = []
+    for name in json_codec.BACKENDS:
+        try:
+            json_codec.set_backend(name)
+            backends.append(name)
+        except ImportError:
+            pass
+
+    for label, payload in PAYLOADS:
+        encoded = json.dumps(payload).encode('utf-8')
+        number = iterations or max(10, 2000000 // len(encoded))
+        print('{label}: {size} bytes, {number} iterations'.format(label=label, size=len(encoded), number=number))
+
+        elapsed = min(timeit.repeat(lambda: legacy_loads(encoded), number=number, repeat=3))
+        print('  {name:<28} loads {usec:10.2f} usec'.format(name='legacy (encode + json)', usec=elapsed / number * 1e6))
+        for name in backends:
+            json_codec.set_backend(name)
+            loads = min(timeit.repeat(lambda: json_codec.loads(encoded), number=number, repeat=3))
+            dumps = min(timeit.repeat(lambda: json_codec.dumps(payload), number=number, repeat=3))
+            print('  {name:<28} loads {loads:10.2f} usec  dumps {dumps:10.2f} usec'.format(
+                name=name, loads=loads / number * 1e6, dumps=dumps / number * 1e6))
+
+    json_codec.set_backend()
+
+
+if __name__ == '__main__':
+    main()
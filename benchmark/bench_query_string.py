@@ -0,0 +1,90 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# GS2 の GET/DELETE で使われる程度のクエリストリングで、url_encoder と urlencode のエンコード速度を計測する
+#
+#   python benchmark/bench_query_string.py [iterations]
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+try:
+    from urllib import quote, urlencode
+except ImportError:
+    from urllib.parse import quote, urlencode
+
+from gs2_core_client.fast_requests import url_encoder
+
+CASES = [
+    ('paging (2 params)', {'pageToken': 'eyJvZmZzZXQiOiAxMDB9', 'limit': 30}),
+    ('query (5 params)', {
+        'namespaceName': 'namespace-0001',
+        'userId': 'user-00000001',
+        'pageToken': None,
+        'limit': 100,
+        'name': u'ポーション',
+    }),
+    ('list (10 values)', {'itemNames': ['item-{index:04d}'.format(index=index) for index in range(10)]}),
+]
+
+
+def legacy_to_query_string(query_strings):
+    def encode(value):
+        if not isinstance(value, str):
+            value = value.encode('utf-8') if hasattr(value, 'encode') else str(value)
+        return quote(value, safe='-_.~')
+
+    return '&'.join(
+        map(lambda key: '{key}={value}'.format(
+            key=key,
+            value=encode(query_strings[key]),
+        ), query_strings.keys())
+    )
+
+
+def urlencode_to_query_string(query_strings):
+    return urlencode(sorted(
+        (key, value.encode('utf-8') if isinstance(value, type(u'')) and str is bytes else value)
+        for key, value in query_strings.items() if value is not None
+    ), doseq=True)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    def cold(query_strings):
+        url_encoder._memo.clear()
+        return url_encoder.to_query_string(query_strings)
+
+    for label, query_strings in CASES:
+        print('{label}: {query}'.format(label=label, query=url_encoder.to_query_string(query_strings)))
+        functions = [
+            ('urllib urlencode (sorted, doseq)', urlencode_to_query_string),
+            ('url_encoder, memo cleared', cold),
+            ('url_encoder, memoized', url_encoder.to_query_string),
+        ]
+        if not any(isinstance(value, list) for value in query_strings.values()):
+            functions.insert(0, ('legacy (map/format/join)', legacy_to_query_string))
+        for name, func in functions:
+            elapsed = min(timeit.repeat(lambda: func(query_strings), number=iterations, repeat=3))
+            print('  {name:<34} {usec:8.3f} usec'.format(name=name, usec=elapsed / iterations * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# Gs2UserRequest の生成コストとメモリ使用量を計測するマイクロベンチマーク
+#
+#   python benchmark/bench_request_object.py [iterations]
+
+import gc
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+from gs2_core_client.Gs2UserRequest import Gs2UserRequest
+
+try:
+    _text_types = (str, unicode)
+except NameError:
+    _text_types = (str,)
+
+PARAMS = {
+    'X-GS2-CLIENT-ID': 'client-id',
+    'X-GS2-REQUEST-ID': 'request-id',
+    'X-GS2-ACCESS-TOKEN': 'access-token',
+}
+
+
+class LegacyBasicRequest(object):
+    """
+    __slots__ を持たず、params.keys() を走査していた以前の Gs2BasicRequest
+    """
+
+    def __init__(self, params=None):
+        if params is None:
+            self.__client_id = None
+            self.__timestamp = None
+            self.__request_sign = None
+            self.__request_id = None
+        else:
+            client_id = params['X-GS2-CLIENT-ID'] if 'X-GS2-CLIENT-ID' in params.keys() else None
+            if client_id is not None:
+                self.__set_client_id(client_id)
+            timestamp = params['X-GS2-TIMESTAMP'] if 'X-GS2-TIMESTAMP' in params.keys() else None
+            if timestamp is not None:
+                self.__set_timestamp(timestamp)
+            request_sign = params['X-GS2-REQUEST-SIGN'] if 'X-GS2-REQUEST-SIGN' in params.keys() else None
+            if request_sign is not None:
+                self.__set_request_sign(request_sign)
+            request_id = params['X-GS2-REQUEST-ID'] if 'X-GS2-REQUEST-ID' in params.keys() else None
+            if request_id is not None:
+                self.set_request_id(request_id)
+
+    def __set_client_id(self, client_id):
+        if not isinstance(client_id, _text_types):
+            raise TypeError()
+        self.__client_id = client_id
+
+    def __set_timestamp(self, timestamp):
+        if not isinstance(timestamp, _text_types):
+            raise TypeError()
+        self.__timestamp = timestamp
+
+    def __set_request_sign(self, request_sign):
+        if not isinstance(request_sign, _text_types):
+            raise TypeError()
+        self.__request_sign = request_sign
+
+    def get_client_id(self):
+        return self.__client_id
+
+    def get_request_id(self):
+        return self.__request_id
+
+    def set_request_id(self, request_id):
+        if not isinstance(request_id, _text_types):
+            raise TypeError()
+        self.__request_id = request_id
+
+
+class LegacyUserRequest(LegacyBasicRequest):
+    """
+    __slots__ を持たず、params.keys() を走査していた以前の Gs2UserRequest
+    """
+
+    def __init__(self, params=None):
+        super(LegacyUserRequest, self).__init__(params)
+        if params is None:
+            self.__access_token = None
+        else:
+            self.set_access_token(params['X-GS2-ACCESS-TOKEN'] if 'X-GS2-ACCESS-TOKEN' in params.keys() else None)
+
+    def get_access_token(self):
+        return self.__access_token
+
+    def set_access_token(self, access_token):
+        if access_token is not None and not isinstance(access_token, _text_types):
+            raise TypeError()
+        self.__access_token = access_token
+
+
+def legacy_to_headers(request, headers):
+    """
+    以前の呼び出し側で行っていた、getter を1つずつ呼び出してヘッダを組み立てる処理
+    """
+    if request.get_client_id() is not None:
+        headers['X-GS2-CLIENT-ID'] = request.get_client_id()
+    if request.get_request_id() is not None:
+        headers['X-GS2-REQUEST-ID'] = request.get_request_id()
+    if request.get_access_token() is not None:
+        headers['X-GS2-ACCESS-TOKEN'] = request.get_access_token()
+    return headers
+
+
+def measure_memory(factory, count=100000):
+    """
+    1オブジェクトあたりのメモリ使用量(バイト)を計測する
+    """
+    try:
+        import tracemalloc
+    except ImportError:
+        obj = factory()
+        return sys.getsizeof(obj) + (sys.getsizeof(obj.__dict__) if hasattr(obj, '__dict__') else 0)
+    gc.collect()
+    tracemalloc.start()
+    objects = [factory() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return float(size) / count
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    legacy = LegacyUserRequest(PARAMS)
+    current = Gs2UserRequest(PARAMS)
+    assert legacy_to_headers(legacy, {}) == current.to_headers()
+
+    cases = [
+        ('legacy, empty', lambda: LegacyUserRequest()),
+        ('Gs2UserRequest, empty', lambda: Gs2UserRequest()),
+        ('legacy, from dict', lambda: LegacyUserRequest(PARAMS)),
+        ('Gs2UserRequest, from dict', lambda: Gs2UserRequest(PARAMS)),
+        ('legacy, to_headers', lambda: legacy_to_headers(legacy, {})),
+        ('Gs2UserRequest, to_headers', lambda: current.to_headers()),
+    ]
+    for name, func in cases:
+        elapsed = min(timeit.repeat(func, number=iterations, repeat=3))
+        print('{name:<40} {usec:8.3f} usec/call'.format(name=name, usec=elapsed / iterations * 1000000))
+
+    for name, factory in (
+            ('legacy', lambda: LegacyUserRequest(PARAMS)),
+            ('Gs2UserRequest', lambda: Gs2UserRequest(PARAMS)),
+    ):
+        print('{name:<40} {size:8.1f} bytes/object'.format(name=name, size=measure_memory(factory)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# BasicGs2Credential の署名コストを計測するマイクロベンチマーク
+#
+#   python benchmark/bench_signer.py [iterations]
+
+import base64
+import hashlib
+import hmac
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+from gs2_core_client.model.RequestSigner import RequestSigner
+
+CLIENT_SECRET = base64.b64encode(b'0123456789abcdef0123456789abcdef').decode('ascii')
+MODULE = 'Inventory'
+FUNCTION = 'AcquireItem'
+TIMESTAMP = 1500000000
+
+
+def legacy_sign(module, function, timestamp):
+    return base64.b64encode(
+        hmac.new(
+            base64.b64decode(CLIENT_SECRET),
+            (module + ":" + function + ":" + str(timestamp)).encode('utf-8'),
+            hashlib.sha256
+        ).digest())
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    signer = RequestSigner(CLIENT_SECRET)
+    counter = [TIMESTAMP]
+
+    def signer_cold():
+        counter[0] += 1
+        signer.sign(MODULE, FUNCTION, counter[0])
+
+    cases = [
+        ('legacy (decode + hmac.new per call)', lambda: legacy_sign(MODULE, FUNCTION, TIMESTAMP)),
+        ('RequestSigner, new timestamp', signer_cold),
+        ('RequestSigner, same second', lambda: signer.sign(MODULE, FUNCTION, TIMESTAMP)),
+    ]
+    assert legacy_sign(MODULE, FUNCTION, TIMESTAMP).decode('ascii') == signer.sign(MODULE, FUNCTION, TIMESTAMP)
+
+    for name, func in cases:
+        elapsed = min(timeit.repeat(func, number=iterations, repeat=3))
+        print('{name:<40} {usec:8.3f} usec/request'.format(name=name, usec=elapsed / iterations * 1000000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# GS2 のエンドポイントを模したローカルの HTTP/HTTPS サーバー
+# リクエストパスに key/value を並べてレスポンスを制御する
+#
+#   /status/404              ステータスコード(AbstractGs2Client が扱うすべてのステータスコードを返せる)
+#   /size/4096               レスポンスボディのおおよそのサイズ(バイト)
+#   /latency/20              レスポンスを返すまでの待ち時間(ミリ秒)
+#   /close/1                 レスポンス後に Connection: close を付けずに切断する(キープアライブの切断)
+#
+# 単体でも起動できる
+#
+#   python benchmark/stub_server.py [--port 8080] [--latency 0] [--drop-every 0] [--certfile cert.pem --keyfile key.pem]
+#
+# HTTPS 用の自己署名証明書は次のように作成する
+#
+#   openssl req -x509 -newkey rsa:2048 -nodes -subj /CN=localhost -keyout key.pem -out cert.pem -days 1
+
+import argparse
+import json
+import threading
+import time
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+ERROR_BODY = json.dumps({
+    'message': json.dumps([{'component': 'stub', 'message': 'stub.error.failed'}]),
+}).encode('utf-8')
+
+
+def make_body(size):
+    """
+    おおよそ size バイトの GS2 らしい JSON を生成する
+    :param size: サイズ(バイト)
+    :type size: int
+    :return: JSON
+    :rtype: bytes
+    """
+    body = {
+        'item': {
+            'itemId': 'grn:gs2:ap-northeast-1:0123456789:inventory:inventory-0001:user-00000001:item-0001',
+            'count': 1,
+            'payload': '',
+        },
+    }
+    padding = max(0, size - len(json.dumps(body)))
+    body['item']['payload'] = 'x' * padding
+    return json.dumps(body).encode('utf-8')
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def __options(self):
+        options = {}
+        parts = [part for part in self.path.split('?', 1)[0].split('/') if part]
+        for i in range(0, len(parts) - 1, 2):
+            options[parts[i]] = parts[i + 1]
+        return options
+
+    def __handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        server = self.server
+        options = self.__options()
+        status = int(options.get('status', 200))
+        size = int(options.get('size', server.size))
+        latency = float(options.get('latency', server.latency * 1000)) / 1000
+        drop = options.get('close') == '1'
+        if server.drop_every:
+            with server.lock:
+                server.served += 1
+                drop = drop or server.served % server.drop_every == 0
+
+        if latency > 0:
+            time.sleep(latency)
+
+        if status == 200:
+            body = server.bodies.get(size)
+            if body is None:
+                body = server.bodies[size] = make_body(size)
+        else:
+            body = ERROR_BODY
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 503:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(body)
+        if drop:
+            self.close_connection = True
+
+    do_GET = do_POST = do_PUT = do_DELETE = __handle
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, size=256, drop_every=0, certfile=None, keyfile=None):
+        """
+        GS2 のエンドポイントを模したサーバー
+        :param host: 待ち受けるアドレス
+        :type host: str
+        :param port: 待ち受けるポート。0 の場合は空いているポート
+        :type port: int
+        :param latency: レスポンスを返すまでの待ち時間の既定値(秒)
+        :type latency: float
+        :param size: レスポンスボディのサイズの既定値(バイト)
+        :type size: int
+        :param drop_every: N 回に1回、レスポンス後に予告なくコネクションを切断する。0 の場合は切断しない
+        :type drop_every: int
+        :param certfile: 証明書のパス。指定すると HTTPS で待ち受ける
+        :type certfile: str or None
+        :param keyfile: 秘密鍵のパス
+        :type keyfile: str or None
+        """
+        HTTPServer.__init__(self, (host, port), _Handler)
+        self.latency = latency
+        self.size = size
+        self.drop_every = drop_every
+        self.served = 0
+        self.lock = threading.Lock()
+        self.bodies = {}
+        self.secure = certfile is not None
+        if self.secure:
+            import ssl
+            context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
+            context.load_cert_chain(certfile, keyfile)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+
+    def get_url(self):
+        """
+        サーバーの URL を取得
+        :return: URL
+        :rtype: str
+        """
+        return '{protocol}://{host}:{port}'.format(
+            protocol='https' if self.secure else 'http',
+            host=self.server_address[0],
+            port=self.server_address[1],
+        )
+
+    def start(self):
+        """
+        バックグラウンドのスレッドで待ち受けを開始する
+        :return: this
+        """
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GS2 stand-in server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help='default latency in seconds')
+    parser.add_argument('--size', type=int, default=256, help='default response size in bytes')
+    parser.add_argument('--drop-every', type=int, default=0, help='drop the keep-alive connection every N responses')
+    parser.add_argument('--certfile')
+    parser.add_argument('--keyfile')
+    args = parser.parse_args()
+
+    server = StubServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        size=args.size,
+        drop_every=args.drop_every,
+        certfile=args.certfile,
+        keyfile=args.keyfile,
+    )
+    print('listening on {url}'.format(url=server.get_url()))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
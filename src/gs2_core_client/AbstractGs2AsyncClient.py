@@ -0,0 +1,555 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# asyncio 版のクライアント (Python 3.5 以降でのみ利用可能)
+
+from gs2_core_client.AbstractGs2Client import AbstractGs2Client
+from gs2_core_client.fast_requests.deadline import DeadlineExceededError, get_deadline, get_remaining
+
+
+class _LeaderCancelledError(Exception):
+    """
+    集約したリクエストを実行していた呼び出しが取り消された
+    """
+    pass
+
+
+class AbstractGs2AsyncClient(AbstractGs2Client):
+
+    async def __coalesce_async(self, single_flight, key, fetch, deadline):
+        """
+        同じキーで実行中のリクエストがあればその結果を共有し、なければ fetch を実行する
+        実行していたリクエストが取り消された場合は、待っていた呼び出しのひとつが代わりに実行する
+        :param single_flight: 同一GETリクエストの集約
+        :type single_flight: gs2_core_client.Gs2SingleFlight.Gs2SingleFlight
+        :param key: キー
+        :type key: tuple
+        :param fetch: リクエストを実行するコルーチンを返す関数
+        :type fetch: () -> collections.abc.Awaitable
+        :param deadline: 期限(エポック秒)。None の場合は期限なし。実行中のリクエストを待つ時間もこの期限で打ち切る
+        :type deadline: float or None
+        :return: HTTPレスポンス
+        :rtype: gs2_core_client.fast_requests.requests.HttpResponse
+        :raises DeadlineExceededException: 実行中のリクエストが期限までに完了しなかった場合
+        """
+        import asyncio
+
+        loop = asyncio.get_event_loop()
+        key = (loop, key)
+        while True:
+            future, leader = single_flight.join(key, loop.create_future)
+            if leader:
+                break
+            try:
+                if deadline is None:
+                    return await asyncio.shield(future)
+                return await asyncio.wait_for(asyncio.shield(future), get_remaining(deadline))
+            except _LeaderCancelledError:
+                continue
+            except (asyncio.TimeoutError, DeadlineExceededError):
+                from gs2_core_client.exception.DeadlineExceededException import DeadlineExceededException
+                raise DeadlineExceededException('deadline exceeded')
+
+        try:
+            response = await fetch()
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            # 取り消されたのは実行していた呼び出しだけなので、待っている呼び出しには取り消しを伝えずに再実行させる
+            future.set_exception(_LeaderCancelledError() if isinstance(e, asyncio.CancelledError) else e)
+            # 待機している呼び出しがなくても "exception was never retrieved" を出さないようにする
+            future.exception()
+            raise
+        finally:
+            single_flight.leave(key)
+
+    async def __fetch_async(self, method, url, endpoint, service, component, target_function, query_strings, body,
+                            headers, cache_key, ttl, deadline):
+        """
+        レート制限を適用してリクエストを送信し、レスポンスキャッシュを更新する
+        :return: HTTPレスポンス
+        :rtype: gs2_core_client.fast_requests.requests.HttpResponse
+        """
+        import asyncio
+        import time
+
+        rate_limiter = self.get_rate_limiter()
+        if rate_limiter is not None:
+            max_wait = rate_limiter.get_max_wait()
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.time())
+                max_wait = remaining if max_wait is None else min(max_wait, remaining)
+            wait = rate_limiter.reserve(service, component, target_function, max_wait)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+        try:
+            response = await self.__send_async(
+                method, url, endpoint, component, target_function, query_strings, body, headers, deadline,
+                self._make_attempt_hook(service, component, target_function, deadline))
+        except DeadlineExceededError as e:
+            from gs2_core_client.exception.DeadlineExceededException import DeadlineExceededException
+            raise DeadlineExceededException(str(e))
+
+        if rate_limiter is not None:
+            rate_limiter.feedback(service, component, target_function, response.status_code)
+        self._store_response_cache(method, url, cache_key, ttl, response)
+        return response
+
+    async def __send_async(self, method, url, endpoint, component, target_function, query_strings, body, headers,
+                           deadline, on_attempt=None):
+        """
+        認証情報を付与してリクエストを非同期に送信する
+        :param method: HTTPメソッド
+        :type method: str
+        :param url: URL
+        :type url: str
+        :param endpoint: エンドポイント
+        :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body
+        :type body: dict or bytes or None
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param deadline: 期限(エポック秒)。None の場合は期限なし
+        :type deadline: float or None
+        :param on_attempt: リトライするたびに呼び出す関数。None の場合は呼び出さない
+        :type on_attempt: ((int or None) -> float or None) or None
+        :return: HTTPレスポンス
+        :rtype: gs2_core_client.fast_requests.requests.HttpResponse
+        """
+        import time
+        from gs2_core_client.fast_requests import async_requests
+
+        get_remaining(deadline)
+        signed_at = time.time()
+        self._authorize(component, target_function, headers)
+        sign_time = time.time() - signed_at
+
+        if method == 'GET':
+            response = await async_requests.get(
+                url=url,
+                params=query_strings,
+                headers=headers,
+                retry_policy=self.get_retry_policy(),
+                compression=self.get_compression(),
+                endpoint=endpoint,
+                deadline=deadline,
+                max_body_size=self.get_max_body_size(),
+                on_attempt=on_attempt,
+            )
+        elif method == 'POST':
+            response = await async_requests.post(
+                url=url,
+                json=body,
+                headers=headers,
+                retry_policy=self.get_retry_policy(),
+                compression=self.get_compression(),
+                endpoint=endpoint,
+                deadline=deadline,
+                max_body_size=self.get_max_body_size(),
+                on_attempt=on_attempt,
+            )
+        elif method == 'PUT':
+            response = await async_requests.put(
+                url=url,
+                json=body,
+                headers=headers,
+                retry_policy=self.get_retry_policy(),
+                compression=self.get_compression(),
+                endpoint=endpoint,
+                deadline=deadline,
+                max_body_size=self.get_max_body_size(),
+                on_attempt=on_attempt,
+            )
+        else:
+            response = await async_requests.delete(
+                url=url,
+                params=query_strings,
+                headers=headers,
+                retry_policy=self.get_retry_policy(),
+                compression=self.get_compression(),
+                endpoint=endpoint,
+                deadline=deadline,
+                max_body_size=self.get_max_body_size(),
+                on_attempt=on_attempt,
+            )
+        response.timings['sign'] = sign_time
+        return response
+
+    async def __fetch_with_single_flight_async(self, method, url, endpoint, service, component, target_function,
+                                               query_strings, body, headers, cache_key, ttl, deadline):
+        """
+        リクエストを送信する。同一GETリクエストの集約が設定されていれば集約する
+        :return: HTTPレスポンス
+        :rtype: gs2_core_client.fast_requests.requests.HttpResponse
+        """
+        single_flight = self.get_single_flight()
+        if single_flight is not None and method == 'GET':
+            response = await self.__coalesce_async(
+                single_flight,
+                self._make_request_key(url, query_strings, headers),
+                lambda: self.__fetch_async(method, url, endpoint, service, component, target_function, query_strings,
+                                           body, headers, cache_key, ttl, deadline),
+                deadline,
+            )
+        else:
+            response = await self.__fetch_async(
+                method, url, endpoint, service, component, target_function, query_strings, body, headers, cache_key,
+                ttl, deadline)
+
+        return response
+
+    async def __request_async(self, method, url, service, component, target_function, query_strings, body, headers,
+                              timeout=None):
+        """
+        リクエストを非同期に発行する
+        :param method: HTTPメソッド
+        :type method: str
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body
+        :type body: dict or bytes or None
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        import time
+
+        started_at = time.time()
+        endpoint, url = self._resolve_endpoint(url, service)
+        return await self.__dispatch_async(
+            method, url, endpoint, service, component, target_function, query_strings, body, headers, started_at,
+            time.time() - started_at, self._get_deadline(started_at, timeout))
+
+    async def __dispatch_async(self, method, url, endpoint, service, component, target_function, query_strings, body,
+                               headers, started_at, resolve_time, deadline):
+        """
+        エンドポイントを解決済みのリクエストを非同期に発行する
+        :param method: HTTPメソッド
+        :type method: str
+        :param url: URL
+        :type url: unicode
+        :param endpoint: エンドポイント
+        :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body
+        :type body: dict or bytes or None
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param started_at: リクエストを開始した時刻
+        :type started_at: float
+        :param resolve_time: URL の組み立てに要した時間(秒)
+        :type resolve_time: float
+        :param deadline: 期限(エポック秒)。None の場合は期限なし
+        :type deadline: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        import time
+
+        span = self._start_span(method, url, service, component, target_function, headers)
+
+        cache_key, ttl, response = self._lookup_response_cache(
+            method, url, service, target_function, query_strings, headers)
+        if response is not None:
+            if span is not None:
+                span.set_attribute('gs2.cache_hit', True)
+                self._end_span(span, response)
+            return self._parse_response(response)
+
+        circuit_breaker = self.get_circuit_breaker()
+        if circuit_breaker is not None:
+            try:
+                circuit_breaker.before_call(service, self.get_region())
+            except BaseException as e:
+                if span is not None:
+                    self._end_span(span, None, e)
+                raise
+
+        parse_started_at = None
+        try:
+            response = await self.__fetch_with_single_flight_async(
+                method, url, endpoint, service, component, target_function, query_strings, body, headers, cache_key,
+                ttl, deadline)
+            parse_started_at = time.time()
+            result = self._parse_response(response, headers.get('X-GS2-REQUEST-ID') if headers else None)
+        except BaseException as e:
+            self._record_call(
+                service, component, target_function, started_at, resolve_time, response, parse_started_at, span, e)
+            raise
+        self._record_call(
+            service, component, target_function, started_at, resolve_time, response, parse_started_at, span)
+        return result
+
+    async def warm_up_async(self, services, connections=1, url=None):
+        """
+        サービスへのコネクションをあらかじめ張っておく
+        :param services: サービス名のリスト (例: ['inventory', 'stamina'])
+        :type services: list[str]
+        :param connections: サービスごとに用意するコネクション数
+        :type connections: int
+        :param url: エンドポイントの URL テンプレート。None の場合は Gs2Constant.ENDPOINT_HOST
+        :type url: str or None
+        :return: protocol://host:port をキーとした、用意できたコネクション数
+        :rtype: dict[str, int]
+        """
+        from gs2_core_client.fast_requests import async_requests
+
+        return await async_requests.warm_up(self._get_service_endpoints(services, url), connections)
+
+    async def _do_prepared_request_async(self, prepared, query_strings, body, headers, timeout=None):
+        """
+        準備済みリクエストを非同期に発行する
+        :param prepared: 準備済みリクエスト
+        :type prepared: gs2_core_client.Gs2PreparedRequest.Gs2PreparedRequest
+        :param query_strings: クエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body(エンコード済みの JSON)
+        :type body: bytes or None
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        import time
+
+        started_at = time.time()
+        return await self.__dispatch_async(
+            prepared.get_method(), prepared.get_url(), prepared.get_endpoint(), prepared.get_service(),
+            prepared.get_component(), prepared.get_target_function(), query_strings, body, headers, started_at, 0.0,
+            self._get_deadline(started_at, timeout))
+
+    async def __execute_operation_async(self, operation, batch_deadline):
+        """
+        まとめて発行するリクエストの1つを非同期に発行する
+        :return: レスポンス
+        :rtype: dict
+        """
+        url, endpoint, headers, started_at, resolve_time, deadline = self._prepare_operation(operation, batch_deadline)
+        return await self.__dispatch_async(
+            operation.get_method(), url, endpoint, operation.get_service(), operation.get_component(),
+            operation.get_target_function(), operation.get_query_strings(), operation.get_body(), headers, started_at,
+            resolve_time, deadline)
+
+    async def execute_bulk_async(self, operations, concurrency=8, stop_on_error=False, timeout=None):
+        """
+        複数のリクエストを並行して非同期に発行する
+        結果は operations と同じ順序で返し、失敗したリクエストの位置には送出された例外を格納する
+        :param operations: 発行するリクエストのリスト
+        :type operations: list[gs2_core_client.Gs2BulkOperation.Gs2BulkOperation]
+        :param concurrency: 同時に発行するリクエスト数の上限
+        :type concurrency: int
+        :param stop_on_error: 最初に失敗した時点で、まだ発行していないリクエストの発行を取りやめるか
+                              取りやめたリクエストの位置は None になる
+        :type stop_on_error: bool
+        :param timeout: 全体のタイムアウト時間(秒)。期限までに完了しなかったリクエストの位置には
+                        DeadlineExceededException を格納する。None の場合は期限なし
+        :type timeout: float or None
+        :return: レスポンスまたは例外のリスト
+        :rtype: list[dict or Exception or None]
+        """
+        import asyncio
+
+        operations = list(operations)
+        results = [None] * len(operations)
+        batch_deadline = get_deadline(timeout)
+        pending = iter(range(len(operations)))
+        state = {'stopped': False}
+
+        async def run():
+            for index in pending:
+                if state['stopped']:
+                    return
+                try:
+                    results[index] = await self.__execute_operation_async(operations[index], batch_deadline)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    results[index] = e
+                    if stop_on_error:
+                        state['stopped'] = True
+
+        await asyncio.gather(*[run() for _ in range(min(max(concurrency, 1), len(operations)))])
+        return results
+
+    def paginate_async(self, url, service, component, target_function, query_strings=None, headers=None,
+                       items_key='items', next_page_token_key='nextPageToken', page_token_param='pageToken',
+                       max_buffered_pages=1, timeout=None):
+        """
+        ページトークンで続きを取得する GET リクエストの結果を、1件ずつ遅延して返す非同期イテレータを生成する
+        呼び出し元が現在のページを処理している間に、次のページを先読みする
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: 最初のページを取得する際のクエリストリング
+        :type query_strings: dict or None
+        :param headers: リクエストヘッダ
+        :type headers: dict or None
+        :param items_key: レスポンスのうち要素のリストを保持するキー
+        :type items_key: str
+        :param next_page_token_key: レスポンスのうち次のページのトークンを保持するキー
+        :type next_page_token_key: str
+        :param page_token_param: ページトークンを指定するクエリストリングの名前
+        :type page_token_param: str
+        :param max_buffered_pages: 先読みしてバッファに保持するページ数の上限。0 の場合は先読みしない
+        :type max_buffered_pages: int
+        :param timeout: 1ページあたりのリトライを含めたタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: 要素を返す非同期イテレータ
+        :rtype: gs2_core_client.Gs2AsyncPaginator.Gs2AsyncPaginator
+        """
+        from gs2_core_client.Gs2AsyncPaginator import Gs2AsyncPaginator
+
+        async def fetch(page_query_strings):
+            return await self._do_get_request_async(
+                url, service, component, target_function, page_query_strings, dict(headers) if headers else {},
+                timeout)
+
+        return Gs2AsyncPaginator(
+            fetch,
+            query_strings=query_strings,
+            items_key=items_key,
+            next_page_token_key=next_page_token_key,
+            page_token_param=page_token_param,
+            max_buffered_pages=max_buffered_pages,
+        )
+
+    async def _do_get_request_async(self, url, service, component, target_function, query_strings, headers,
+                                    timeout=None):
+        """
+        GETリクエストを非同期に発行する
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        return await self.__request_async(
+            'GET', url, service, component, target_function, query_strings, None, headers, timeout)
+
+    async def _do_post_request_async(self, url, service, component, target_function, body, headers,
+                                     timeout=None):
+        """
+        POSTリクエストを非同期に発行する
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param body: POST Body(dict またはエンコード済みの JSON)
+        :type body: dict or bytes
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        return await self.__request_async(
+            'POST', url, service, component, target_function, None, body, headers, timeout)
+
+    async def _do_put_request_async(self, url, service, component, target_function, body, headers,
+                                    timeout=None):
+        """
+        PUTリクエストを非同期に発行する
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param body: POST Body(dict またはエンコード済みの JSON)
+        :type body: dict or bytes
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        return await self.__request_async(
+            'PUT', url, service, component, target_function, None, body, headers, timeout)
+
+    async def _do_delete_request_async(self, url, service, component, target_function, query_strings, headers,
+                                       timeout=None):
+        """
+        DELETEリクエストを非同期に発行する
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        return await self.__request_async(
+            'DELETE', url, service, component, target_function, query_strings, None, headers, timeout)
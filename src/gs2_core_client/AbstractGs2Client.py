@@ -16,6 +16,51 @@
 
 from abc import ABCMeta
 
+from gs2_core_client.fast_requests.endpoint import split_base, get_service_endpoint
+from gs2_core_client.fast_requests.deadline import DeadlineExceededError, get_deadline, get_remaining, is_expired
+from gs2_core_client.fast_requests import json_codec
+
+_exception_classes = None
+
+
+def _get_exception_class(status_code):
+    """
+    ステータスコードに対応する例外クラスを取得する。対応表は最初の呼び出しで一度だけ作成する
+    :param status_code: ステータスコード。None の場合はレスポンスを解釈できなかった場合の例外クラス
+    :type status_code: int or None
+    :return: 例外クラス
+    :rtype: type
+    """
+    global _exception_classes
+    if _exception_classes is None:
+        from gs2_core_client.exception.BadRequestException import BadRequestException
+        from gs2_core_client.exception.UnauthorizedException import UnauthorizedException
+        from gs2_core_client.exception.QuotaExceedException import QuotaExceedException
+        from gs2_core_client.exception.NotFoundException import NotFoundException
+        from gs2_core_client.exception.ConflictException import ConflictException
+        from gs2_core_client.exception.InternalServerErrorException import InternalServerErrorException
+        from gs2_core_client.exception.BadGatewayException import BadGatewayException
+        from gs2_core_client.exception.ServiceUnavailableException import ServiceUnavailableException
+        from gs2_core_client.exception.RequestTimeoutException import RequestTimeoutException
+        from gs2_core_client.exception.UnknownException import UnknownException
+
+        _exception_classes = {
+            None: UnknownException,
+            400: BadRequestException,
+            401: UnauthorizedException,
+            402: QuotaExceedException,
+            404: NotFoundException,
+            409: ConflictException,
+            500: InternalServerErrorException,
+            502: BadGatewayException,
+            503: ServiceUnavailableException,
+            504: RequestTimeoutException,
+        }
+    exception_class = _exception_classes.get(status_code)
+    if exception_class is None:
+        return _exception_classes[None]
+    return exception_class
+
 
 class AbstractGs2Client(object):
     __metaclass__ = ABCMeta
@@ -30,74 +75,366 @@ class AbstractGs2Client(object):
         """
         self.__credential = credential
         self.__region = region
+        self.__retry_policy = None
+        self.__compression = None
+        self.__response_cache = None
+        self.__single_flight = None
+        self.__rate_limiter = None
+        self.__circuit_breaker = None
+        self.__timeout = None
+        self.__max_body_size = None
+        self.__metrics = None
+        self.__tracer = None
+
+    def get_region(self):
+        """
+        GS2リージョンを取得
+        :return: GS2リージョン
+        :rtype: str
+        """
+        return self.__region
+
+    def get_retry_policy(self):
+        """
+        リトライポリシーを取得
+        :return: リトライポリシー
+        :rtype: gs2_core_client.fast_requests.retry.RetryPolicy or None
+        """
+        return self.__retry_policy
+
+    def set_retry_policy(self, retry_policy):
+        """
+        リトライポリシーを設定
+        None の場合は fast_requests.retry.DEFAULT_RETRY_POLICY を使用する
+        :param retry_policy: リトライポリシー
+        :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+        """
+        self.__retry_policy = retry_policy
+
+    def with_retry_policy(self, retry_policy):
+        """
+        リトライポリシーを設定
+        :param retry_policy: リトライポリシー
+        :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+        :return: this
+        """
+        self.set_retry_policy(retry_policy)
+        return self
+
+    def get_compression(self):
+        """
+        HTTP 圧縮の設定を取得
+        :return: HTTP 圧縮の設定
+        :rtype: gs2_core_client.fast_requests.compression.CompressionConfig or None
+        """
+        return self.__compression
+
+    def set_compression(self, compression):
+        """
+        HTTP 圧縮の設定を設定
+        None の場合は圧縮しない
+        :param compression: HTTP 圧縮の設定
+        :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+        """
+        self.__compression = compression
+
+    def with_compression(self, compression):
+        """
+        HTTP 圧縮の設定を設定
+        :param compression: HTTP 圧縮の設定
+        :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+        :return: this
+        """
+        self.set_compression(compression)
+        return self
+
+    def get_response_cache(self):
+        """
+        レスポンスキャッシュを取得
+        :return: レスポンスキャッシュ
+        :rtype: gs2_core_client.Gs2ResponseCache.Gs2ResponseCache or None
+        """
+        return self.__response_cache
+
+    def set_response_cache(self, response_cache):
+        """
+        レスポンスキャッシュを設定
+        None の場合はキャッシュしない
+        :param response_cache: レスポンスキャッシュ
+        :type response_cache: gs2_core_client.Gs2ResponseCache.Gs2ResponseCache or None
+        """
+        self.__response_cache = response_cache
+
+    def with_response_cache(self, response_cache):
+        """
+        レスポンスキャッシュを設定
+        :param response_cache: レスポンスキャッシュ
+        :type response_cache: gs2_core_client.Gs2ResponseCache.Gs2ResponseCache or None
+        :return: this
+        """
+        self.set_response_cache(response_cache)
+        return self
+
+    def get_single_flight(self):
+        """
+        同一GETリクエストの集約を取得
+        :return: 同一GETリクエストの集約
+        :rtype: gs2_core_client.Gs2SingleFlight.Gs2SingleFlight or None
+        """
+        return self.__single_flight
+
+    def set_single_flight(self, single_flight):
+        """
+        同一GETリクエストの集約を設定
+        設定すると、同じURL・クエリストリング・認証情報で同時に発行されたGETリクエストは1回の通信にまとめられる
+        :param single_flight: 同一GETリクエストの集約
+        :type single_flight: gs2_core_client.Gs2SingleFlight.Gs2SingleFlight or None
+        """
+        self.__single_flight = single_flight
+
+    def with_single_flight(self, single_flight):
+        """
+        同一GETリクエストの集約を設定
+        :param single_flight: 同一GETリクエストの集約
+        :type single_flight: gs2_core_client.Gs2SingleFlight.Gs2SingleFlight or None
+        :return: this
+        """
+        self.set_single_flight(single_flight)
+        return self
+
+    def get_rate_limiter(self):
+        """
+        クライアント側のレート制限を取得
+        :return: クライアント側のレート制限
+        :rtype: gs2_core_client.Gs2RateLimiter.Gs2RateLimiter or None
+        """
+        return self.__rate_limiter
+
+    def set_rate_limiter(self, rate_limiter):
+        """
+        クライアント側のレート制限を設定
+        :param rate_limiter: クライアント側のレート制限
+        :type rate_limiter: gs2_core_client.Gs2RateLimiter.Gs2RateLimiter or None
+        """
+        self.__rate_limiter = rate_limiter
+
+    def with_rate_limiter(self, rate_limiter):
+        """
+        クライアント側のレート制限を設定
+        :param rate_limiter: クライアント側のレート制限
+        :type rate_limiter: gs2_core_client.Gs2RateLimiter.Gs2RateLimiter or None
+        :return: this
+        """
+        self.set_rate_limiter(rate_limiter)
+        return self
+
+    def get_circuit_breaker(self):
+        """
+        サーキットブレーカーを取得
+        :return: サーキットブレーカー
+        :rtype: gs2_core_client.Gs2CircuitBreaker.Gs2CircuitBreaker or None
+        """
+        return self.__circuit_breaker
+
+    def set_circuit_breaker(self, circuit_breaker):
+        """
+        サーキットブレーカーを設定
+        :param circuit_breaker: サーキットブレーカー
+        :type circuit_breaker: gs2_core_client.Gs2CircuitBreaker.Gs2CircuitBreaker or None
+        """
+        self.__circuit_breaker = circuit_breaker
+
+    def with_circuit_breaker(self, circuit_breaker):
+        """
+        サーキットブレーカーを設定
+        :param circuit_breaker: サーキットブレーカー
+        :type circuit_breaker: gs2_core_client.Gs2CircuitBreaker.Gs2CircuitBreaker or None
+        :return: this
+        """
+        self.set_circuit_breaker(circuit_breaker)
+        return self
+
+    def get_metrics(self):
+        """
+        リクエストの所要時間の集計を取得
+        :return: リクエストの所要時間の集計
+        :rtype: gs2_core_client.Gs2Metrics.Gs2Metrics or None
+        """
+        return self.__metrics
+
+    def set_metrics(self, metrics):
+        """
+        リクエストの所要時間の集計を設定
+        None の場合は集計しない
+        :param metrics: リクエストの所要時間の集計
+        :type metrics: gs2_core_client.Gs2Metrics.Gs2Metrics or None
+        """
+        self.__metrics = metrics
+
+    def with_metrics(self, metrics):
+        """
+        リクエストの所要時間の集計を設定
+        :param metrics: リクエストの所要時間の集計
+        :type metrics: gs2_core_client.Gs2Metrics.Gs2Metrics or None
+        :return: this
+        """
+        self.set_metrics(metrics)
+        return self
+
+    def get_tracer(self):
+        """
+        トレーサーを取得
+        :return: トレーサー
+        :rtype: gs2_core_client.Gs2Tracer.Gs2Tracer or None
+        """
+        return self.__tracer
+
+    def set_tracer(self, tracer):
+        """
+        トレーサーを設定
+        None の場合はトレースしない
+        :param tracer: トレーサー
+        :type tracer: gs2_core_client.Gs2Tracer.Gs2Tracer or None
+        """
+        self.__tracer = tracer
+
+    def with_tracer(self, tracer):
+        """
+        トレーサーを設定
+        :param tracer: トレーサー
+        :type tracer: gs2_core_client.Gs2Tracer.Gs2Tracer or None
+        :return: this
+        """
+        self.set_tracer(tracer)
+        return self
+
+    def get_timeout(self):
+        """
+        リクエストのタイムアウト時間を取得
+        :return: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合は試行ごとに 60 秒
+        :rtype: float or None
+        """
+        return self.__timeout
+
+    def set_timeout(self, timeout):
+        """
+        リクエストのタイムアウト時間を設定
+        署名・接続・送信・受信・リトライの待ち時間をすべて含めてこの時間を超えると DeadlineExceededException を送出する
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合は試行ごとに 60 秒
+        :type timeout: float or None
+        """
+        self.__timeout = timeout
+
+    def with_timeout(self, timeout):
+        """
+        リクエストのタイムアウト時間を設定
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合は試行ごとに 60 秒
+        :type timeout: float or None
+        :return: this
+        """
+        self.set_timeout(timeout)
+        return self
+
+    def get_max_body_size(self):
+        """
+        レスポンスボディの最大サイズを取得
+        :return: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+        :rtype: int or None
+        """
+        return self.__max_body_size
+
+    def set_max_body_size(self, max_body_size):
+        """
+        レスポンスボディの最大サイズを設定
+        超えるレスポンスはそれ以上受信せずに ResponseTooLargeError を送出する
+        :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+        :type max_body_size: int or None
+        """
+        self.__max_body_size = max_body_size
+
+    def with_max_body_size(self, max_body_size):
+        """
+        レスポンスボディの最大サイズを設定
+        :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+        :type max_body_size: int or None
+        :return: this
+        """
+        self.set_max_body_size(max_body_size)
+        return self
 
     @staticmethod
-    def __parse_response(response):
+    def __parse_response(response, request_id=None):
         """
         HTTPレスポンスをパースする
         :param response: HTTPレスポンス
-        :type response: aws_sdk_for_serverless.common.fast_requests.requests.HttpResponse
+        :type response: gs2_core_client.fast_requests.requests.HttpResponse
+        :param request_id: リクエストID。エラーの場合に例外に保持する
+        :type request_id: str or None
         :return: レスポンス
         :rtype: dict
         """
-        if response.status_code == 200:
+        status_code = response.status_code
+        if status_code == 200:
             try:
-                import json
-                return json.loads(response.text)
+                return json_codec.loads(response.content)
             except ValueError:
-                from gs2_core_client.exception.UnknownException import UnknownException
-                raise UnknownException(response.text)
-        elif response.status_code == 400:
-            from gs2_core_client.exception.BadRequestException import BadRequestException
-            raise BadRequestException(response.text)
-        elif response.status_code == 401:
-            from gs2_core_client.exception.UnauthorizedException import UnauthorizedException
-            raise UnauthorizedException(response.text)
-        elif response.status_code == 402:
-            from gs2_core_client.exception.QuotaExceedException import QuotaExceedException
-            raise QuotaExceedException(response.text)
-        elif response.status_code == 404:
-            from gs2_core_client.exception.NotFoundException import NotFoundException
-            raise NotFoundException(response.text)
-        elif response.status_code == 409:
-            from gs2_core_client.exception.ConflictException import ConflictException
-            raise ConflictException(response.text)
-        elif response.status_code == 500:
-            from gs2_core_client.exception.InternalServerErrorException import InternalServerErrorException
-            raise InternalServerErrorException(response.text)
-        elif response.status_code == 502:
-            from gs2_core_client.exception.BadGatewayException import BadGatewayException
-            raise BadGatewayException(response.text)
-        elif response.status_code == 503:
-            from gs2_core_client.exception.ServiceUnavailableException import ServiceUnavailableException
-            raise ServiceUnavailableException('')
-        elif response.status_code == 504:
-            from gs2_core_client.exception.RequestTimeoutException import RequestTimeoutException
-            raise RequestTimeoutException(response.text)
-        else:
-            from gs2_core_client.exception.UnknownException import UnknownException
-            raise UnknownException(response.text)
+                raise _get_exception_class(None)(response.text, status_code, response.headers, request_id)
+        # 503 はレスポンスボディを保持しない
+        raise _get_exception_class(status_code)(
+            '' if status_code == 503 else response.text, status_code, response.headers, request_id)
 
-    def _do_get_request(self, url, service, component, target_function, query_strings, headers):
+    @classmethod
+    def _parse_response(cls, response, request_id=None):
         """
-        GETリクエストを発行する
+        HTTPレスポンスをパースする
+        :param response: HTTPレスポンス
+        :type response: gs2_core_client.fast_requests.requests.HttpResponse
+        :param request_id: リクエストID。エラーの場合に例外に保持する
+        :type request_id: str or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        return cls.__parse_response(response, request_id)
+
+    def _resolve_endpoint(self, url, service):
+        """
+        URLテンプレートのエンドポイント部分を解決する。解決済みのエンドポイントはキャッシュされる
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :return: (エンドポイント, URL)
+        :rtype: (gs2_core_client.fast_requests.endpoint.Endpoint, unicode)
+        """
+        url_template, path = split_base(url)
+        endpoint = get_service_endpoint(url_template, service, self.__region)
+        if '{' in path:
+            path = path.replace('{service}', service).replace('{region}', self.__region)
+        return endpoint, endpoint.base_url + path
+
+    def _build_url(self, url, service):
+        """
+        URLテンプレートにサービス名とリージョンを埋め込む
         :param url: URL
         :type url: unicode
         :param service: サービス名
         :type service: str
+        :return: URL
+        :rtype: unicode
+        """
+        return self._resolve_endpoint(url, service)[1]
+
+    def _authorize(self, component, target_function, headers):
+        """
+        リクエストヘッダに認証情報を付与する
         :param component: モジュール名
         :type component: str
         :param target_function: ファンクション名
         :type target_function: str
-        :param query_strings: クエリストリング
-        :type query_strings: dict
         :param headers: リクエストヘッダ
         :type headers: dict
-        :return: レスポンス
-        :rtype: dict
         """
         import time
-        from gs2_core_client.fast_requests import requests
 
         self.__credential.authorized(
             module=component,
@@ -106,53 +443,389 @@ class AbstractGs2Client(object):
             timestamp=int(time.time())
         )
 
-        response = requests.get(
-            url=url.replace('{service}', service).replace('{region}', self.__region),
-            params=query_strings,
-            headers=headers
+    def _make_request_key(self, url, query_strings, headers):
+        """
+        同一のリクエストかどうかを判定するためのキーを生成する
+        :param url: URL
+        :type url: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict or None
+        :param headers: リクエストヘッダ
+        :type headers: dict or None
+        :return: キー
+        :rtype: tuple
+        """
+        return (
+            self.__credential.get_identity(),
+            url,
+            tuple(sorted(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in query_strings.items()
+            )) if query_strings else (),
+            headers.get('X-GS2-ACCESS-TOKEN') if headers else None,
         )
 
-        return self.__parse_response(response)
+    def _lookup_response_cache(self, method, url, service, target_function, query_strings, headers):
+        """
+        レスポンスキャッシュを参照する
+        :param method: HTTPメソッド
+        :type method: str
+        :param url: URL
+        :type url: str
+        :param service: サービス名
+        :type service: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :return: (キャッシュキー, 有効期間, キャッシュされたレスポンス)。キャッシュ対象外の場合はキャッシュキーが None
+        :rtype: (tuple or None, float or None, gs2_core_client.fast_requests.requests.HttpResponse or None)
+        """
+        cache = self.__response_cache
+        if cache is None or method != 'GET':
+            return None, None, None
+        ttl = cache.get_ttl(service, target_function)
+        if not ttl:
+            return None, None, None
+        key = cache.make_key(self.__credential, url, query_strings, headers)
+        content = cache.get(key)
+        if content is None:
+            return key, ttl, None
+
+        from gs2_core_client.fast_requests.requests import HttpResponse
+        return key, ttl, HttpResponse(status_code=200, headers={}, body=content)
 
-    def _do_post_request(self, url, service, component, target_function, body, headers):
+    def _store_response_cache(self, method, url, key, ttl, response):
         """
-        POSTリクエストを発行する
+        レスポンスをキャッシュに格納する。更新系のリクエストの場合は関連するキャッシュを破棄する
+        :param method: HTTPメソッド
+        :type method: str
         :param url: URL
-        :type url: unicode
+        :type url: str
+        :param key: キャッシュキー
+        :type key: tuple or None
+        :param ttl: 有効期間(秒)
+        :type ttl: float or None
+        :param response: HTTPレスポンス
+        :type response: gs2_core_client.fast_requests.requests.HttpResponse
+        """
+        cache = self.__response_cache
+        if cache is None:
+            return
+        if method != 'GET':
+            cache.invalidate(url)
+        elif key is not None and response.status_code == 200:
+            cache.put(key, url, response.content, ttl)
+
+    def _start_span(self, method, url, service, component, target_function, headers):
+        """
+        トレーサーが設定されていればスパンを開始し、トレースコンテキストとリクエストIDをリクエストヘッダに設定する
+        :param method: HTTPメソッド
+        :type method: str
+        :param url: URL
+        :type url: str
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :return: スパン。トレースしない場合は None
+        :rtype: gs2_core_client.Gs2Tracer.Gs2Span or None
+        """
+        tracer = self.__tracer
+        if tracer is None:
+            return None
+        span = tracer.start_span(
+            '{component}.{function}'.format(component=component, function=target_function),
+            headers,
+        )
+        if span is None:
+            return None
+
+        request_id = headers.get('X-GS2-REQUEST-ID') if headers is not None else None
+        if request_id is None:
+            import uuid
+            request_id = str(uuid.uuid4())
+            if headers is not None:
+                headers['X-GS2-REQUEST-ID'] = request_id
+
+        span.set_attribute('gs2.service', service)
+        span.set_attribute('gs2.component', component)
+        span.set_attribute('gs2.function', target_function)
+        span.set_attribute('gs2.region', self.__region)
+        span.set_attribute('gs2.request_id', request_id)
+        span.set_attribute('http.method', method)
+        span.set_attribute('http.url', url)
+        return span
+
+    @staticmethod
+    def _end_span(span, response, exception=None):
+        """
+        レスポンスの情報をスパンに記録して終了する
+        :param span: スパン
+        :type span: gs2_core_client.Gs2Tracer.Gs2Span
+        :param response: HTTPレスポンス。通信エラーの場合は None
+        :type response: gs2_core_client.fast_requests.requests.HttpResponse or None
+        :param exception: 発生した例外
+        :type exception: BaseException or None
+        """
+        if response is not None:
+            span.set_attribute('http.status_code', response.status_code)
+            span.set_attribute('gs2.retry_count', response.attempts - 1)
+        if exception is not None:
+            span.record_exception(exception)
+        span.end()
+
+    def _record_call(self, service, component, target_function, started_at, resolve_time, response,
+                     parse_started_at, span, exception=None):
+        """
+        リクエストの結果をサーキットブレーカーとメトリクスとスパンに記録する
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param started_at: リクエストを開始した時刻
+        :type started_at: float
+        :param resolve_time: URL の組み立てに要した時間(秒)
+        :type resolve_time: float
+        :param response: HTTPレスポンス。通信エラーの場合は None
+        :type response: gs2_core_client.fast_requests.requests.HttpResponse or None
+        :param parse_started_at: レスポンスのパースを開始した時刻。パースしていない場合は None
+        :type parse_started_at: float or None
+        :param span: スパン
+        :type span: gs2_core_client.Gs2Tracer.Gs2Span or None
+        :param exception: 発生した例外
+        :type exception: BaseException or None
+        """
+        import time
+
+        now = time.time()
+        if self.__circuit_breaker is not None:
+            self.__circuit_breaker.record(service, self.__region, now - started_at, exception)
+
+        metrics = self.__metrics
+        if metrics is not None:
+            if response is None:
+                status = None
+                timings = {}
+            else:
+                status = response.status_code
+                timings = dict(response.timings)
+            timings['resolve'] = resolve_time
+            if parse_started_at is not None:
+                timings['parse'] = now - parse_started_at
+            timings['total'] = now - started_at
+            metrics.record(service, component, target_function, status, timings)
+
+        if span is not None:
+            self._end_span(span, response, exception)
+
+    def _get_deadline(self, started_at, timeout=None):
+        """
+        リクエストの期限を計算する
+        :param started_at: リクエストを開始した時刻
+        :type started_at: float
+        :param timeout: このリクエストのタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: 期限(エポック秒)。期限なしの場合は None
+        :rtype: float or None
+        """
+        return get_deadline(timeout if timeout is not None else self.__timeout, started_at)
+
+    def _make_attempt_hook(self, service, component, target_function, deadline):
+        """
+        トランスポートがリトライするたびにレート制限を適用する関数を生成する
+        失敗した試行のステータスコードで送信レートを調整し、次の試行のためにトークンを予約する
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param deadline: 期限(エポック秒)。None の場合は期限なし
+        :type deadline: float or None
+        :return: トランスポートの on_attempt に渡す関数。レート制限が設定されていない場合は None
+        :rtype: ((int or None) -> float or None) or None
+        """
+        rate_limiter = self.__rate_limiter
+        if rate_limiter is None:
+            return None
+
+        def on_attempt(status_code):
+            import time
+            from gs2_core_client.exception.ThrottledException import ThrottledException
+
+            if status_code is not None:
+                rate_limiter.feedback(service, component, target_function, status_code)
+            max_wait = rate_limiter.get_max_wait()
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.time())
+                max_wait = remaining if max_wait is None else min(max_wait, remaining)
+            try:
+                return rate_limiter.reserve(service, component, target_function, max_wait)
+            except ThrottledException:
+                # リトライに使えるトークンがなければリトライせず、失敗した試行の結果を返す
+                return None
+
+        return on_attempt
+
+    def __send(self, method, url, endpoint, service, component, target_function, query_strings, body, headers,
+               deadline):
+        """
+        レート制限を適用してリクエストを送信する
+        :param method: HTTPメソッド
+        :type method: str
+        :param url: URL
+        :type url: str
+        :param endpoint: エンドポイント
+        :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint
         :param service: サービス名
         :type service: str
         :param component: モジュール名
         :type component: str
         :param target_function: ファンクション名
         :type target_function: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict or None
         :param body: POST Body
-        :type body: dict
+        :type body: dict or bytes or None
         :param headers: リクエストヘッダ
         :type headers: dict
-        :return: レスポンス
-        :rtype: dict
+        :param deadline: 期限(エポック秒)。None の場合は期限なし
+        :type deadline: float or None
+        :return: HTTPレスポンス
+        :rtype: gs2_core_client.fast_requests.requests.HttpResponse
+        """
+        import time
+
+        rate_limiter = self.__rate_limiter
+        if rate_limiter is not None:
+            if deadline is None:
+                rate_limiter.acquire(service, component, target_function)
+            else:
+                max_wait = rate_limiter.get_max_wait()
+                remaining = max(0.0, deadline - time.time())
+                wait = rate_limiter.reserve(
+                    service, component, target_function, remaining if max_wait is None else min(max_wait, remaining))
+                if wait > 0:
+                    time.sleep(wait)
+
+        try:
+            response = self.__transport(
+                method, url, endpoint, component, target_function, query_strings, body, headers, deadline,
+                self._make_attempt_hook(service, component, target_function, deadline))
+        except DeadlineExceededError as e:
+            from gs2_core_client.exception.DeadlineExceededException import DeadlineExceededException
+            raise DeadlineExceededException(str(e))
+
+        if rate_limiter is not None:
+            rate_limiter.feedback(service, component, target_function, response.status_code)
+        return response
+
+    def __transport(self, method, url, endpoint, component, target_function, query_strings, body, headers, deadline,
+                    on_attempt=None):
+        """
+        認証情報を付与して HTTP リクエストを送信する
+        :return: HTTPレスポンス
+        :rtype: gs2_core_client.fast_requests.requests.HttpResponse
         """
         import time
         from gs2_core_client.fast_requests import requests
 
-        self.__credential.authorized(
-            module=component,
-            function=target_function,
-            headers=headers,
-            timestamp=int(time.time())
-        )
+        get_remaining(deadline)
+        signed_at = time.time()
+        self._authorize(component, target_function, headers)
+        sign_time = time.time() - signed_at
 
-        response = requests.post(
-            url=url.replace('{service}', service).replace('{region}', self.__region),
-            json=body,
-            headers=headers
-        )
+        if method == 'GET':
+            response = requests.get(
+                url=url,
+                params=query_strings,
+                headers=headers,
+                retry_policy=self.__retry_policy,
+                compression=self.__compression,
+                endpoint=endpoint,
+                deadline=deadline,
+                max_body_size=self.__max_body_size,
+                on_attempt=on_attempt,
+            )
+        elif method == 'POST':
+            response = requests.post(
+                url=url,
+                json=body,
+                headers=headers,
+                retry_policy=self.__retry_policy,
+                compression=self.__compression,
+                endpoint=endpoint,
+                deadline=deadline,
+                max_body_size=self.__max_body_size,
+                on_attempt=on_attempt,
+            )
+        elif method == 'PUT':
+            response = requests.put(
+                url=url,
+                json=body,
+                headers=headers,
+                retry_policy=self.__retry_policy,
+                compression=self.__compression,
+                endpoint=endpoint,
+                deadline=deadline,
+                max_body_size=self.__max_body_size,
+                on_attempt=on_attempt,
+            )
+        else:
+            response = requests.delete(
+                url=url,
+                params=query_strings,
+                headers=headers,
+                retry_policy=self.__retry_policy,
+                compression=self.__compression,
+                endpoint=endpoint,
+                deadline=deadline,
+                max_body_size=self.__max_body_size,
+                on_attempt=on_attempt,
+            )
+        response.timings['sign'] = sign_time
+        return response
+
+    def __fetch(self, method, url, endpoint, service, component, target_function, query_strings, body, headers,
+                cache_key, ttl, deadline):
+        """
+        リクエストを送信し、レスポンスキャッシュを更新する。同一GETリクエストの集約が設定されていれば集約する
+        :return: HTTPレスポンス
+        :rtype: gs2_core_client.fast_requests.requests.HttpResponse
+        """
+        if self.__single_flight is not None and method == 'GET':
+            def fetch():
+                result = self.__send(
+                    method, url, endpoint, service, component, target_function, query_strings, body, headers, deadline)
+                self._store_response_cache(method, url, cache_key, ttl, result)
+                return result
 
-        return self.__parse_response(response)
+            try:
+                response = self.__single_flight.do(self._make_request_key(url, query_strings, headers), fetch, deadline)
+            except DeadlineExceededError as e:
+                from gs2_core_client.exception.DeadlineExceededException import DeadlineExceededException
+                raise DeadlineExceededException(str(e))
+        else:
+            response = self.__send(
+                method, url, endpoint, service, component, target_function, query_strings, body, headers, deadline)
+            self._store_response_cache(method, url, cache_key, ttl, response)
 
-    def _do_put_request(self, url, service, component, target_function, body, headers):
+        return response
+
+    def __request(self, method, url, service, component, target_function, query_strings, body, headers, timeout=None):
         """
-        PUTリクエストを発行する
+        リクエストを発行する
+        :param method: HTTPメソッド
+        :type method: str
         :param url: URL
         :type url: unicode
         :param service: サービス名
@@ -161,34 +834,326 @@ class AbstractGs2Client(object):
         :type component: str
         :param target_function: ファンクション名
         :type target_function: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict or None
         :param body: POST Body
-        :type body: dict
+        :type body: dict or bytes or None
         :param headers: リクエストヘッダ
         :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
         :return: レスポンス
         :rtype: dict
         """
         import time
+
+        started_at = time.time()
+        endpoint, url = self._resolve_endpoint(url, service)
+        return self.__dispatch(method, url, endpoint, service, component, target_function, query_strings, body, headers,
+                               started_at, time.time() - started_at, self._get_deadline(started_at, timeout))
+
+    def __dispatch(self, method, url, endpoint, service, component, target_function, query_strings, body, headers,
+                   started_at, resolve_time, deadline):
+        """
+        エンドポイントを解決済みのリクエストを発行する
+        :param method: HTTPメソッド
+        :type method: str
+        :param url: URL
+        :type url: unicode
+        :param endpoint: エンドポイント
+        :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body
+        :type body: dict or bytes or None
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param started_at: リクエストを開始した時刻
+        :type started_at: float
+        :param resolve_time: URL の組み立てに要した時間(秒)
+        :type resolve_time: float
+        :param deadline: 期限(エポック秒)。None の場合は期限なし
+        :type deadline: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        import time
+
+        span = self._start_span(method, url, service, component, target_function, headers)
+
+        cache_key, ttl, response = self._lookup_response_cache(
+            method, url, service, target_function, query_strings, headers)
+        if response is not None:
+            if span is not None:
+                span.set_attribute('gs2.cache_hit', True)
+                self._end_span(span, response)
+            return self.__parse_response(response)
+
+        if self.__circuit_breaker is not None:
+            try:
+                self.__circuit_breaker.before_call(service, self.__region)
+            except BaseException as e:
+                if span is not None:
+                    self._end_span(span, None, e)
+                raise
+
+        parse_started_at = None
+        try:
+            response = self.__fetch(method, url, endpoint, service, component, target_function, query_strings, body,
+                                    headers, cache_key, ttl, deadline)
+            parse_started_at = time.time()
+            result = self.__parse_response(response, headers.get('X-GS2-REQUEST-ID') if headers else None)
+        except BaseException as e:
+            self._record_call(
+                service, component, target_function, started_at, resolve_time, response, parse_started_at, span, e)
+            raise
+        self._record_call(
+            service, component, target_function, started_at, resolve_time, response, parse_started_at, span)
+        return result
+
+    def _get_service_endpoints(self, services, url=None):
+        """
+        サービスのエンドポイントを取得する
+        :param services: サービス名のリスト
+        :type services: list[str]
+        :param url: エンドポイントの URL テンプレート。None の場合は Gs2Constant.ENDPOINT_HOST
+        :type url: str or None
+        :return: エンドポイントのリスト
+        :rtype: list[gs2_core_client.fast_requests.endpoint.Endpoint]
+        """
+        if url is None:
+            from gs2_core_client.Gs2Constant import Gs2Constant
+            url = Gs2Constant.ENDPOINT_HOST
+        url_template = split_base(url)[0]
+        return [get_service_endpoint(url_template, service, self.__region) for service in services]
+
+    def warm_up(self, services, connections=1, url=None):
+        """
+        サービスへのコネクションをあらかじめ張っておく
+        起動直後の最初のリクエストで名前解決・TCP 接続・TLS ハンドシェイクの時間がかからないように、起動時に呼び出す
+        :param services: サービス名のリスト (例: ['inventory', 'stamina'])
+        :type services: list[str]
+        :param connections: サービスごとに用意するコネクション数
+        :type connections: int
+        :param url: エンドポイントの URL テンプレート。None の場合は Gs2Constant.ENDPOINT_HOST
+        :type url: str or None
+        :return: protocol://host:port をキーとした、用意できたコネクション数
+        :rtype: dict[str, int]
+        """
         from gs2_core_client.fast_requests import requests
 
-        self.__credential.authorized(
-            module=component,
-            function=target_function,
+        return requests.warm_up(self._get_service_endpoints(services, url), connections)
+
+    def prepare(self, method, url, service, component, target_function, query_strings=None, body=None, headers=None):
+        """
+        同じファンクションを繰り返し呼び出すための準備済みリクエストを生成する
+        エンドポイントの解決・固定のリクエストヘッダ・リクエストボディの固定部分のエンコードを一度だけ行い、
+        呼び出しごとには変化する部分だけを組み立てる
+        :param method: HTTPメソッド
+        :type method: str
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: 固定のクエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body の固定部分
+        :type body: dict or None
+        :param headers: 固定のリクエストヘッダ
+        :type headers: dict or None
+        :return: 準備済みリクエスト
+        :rtype: gs2_core_client.Gs2PreparedRequest.Gs2PreparedRequest
+        """
+        from gs2_core_client.Gs2PreparedRequest import Gs2PreparedRequest
+
+        endpoint, resolved_url = self._resolve_endpoint(url, service)
+        return Gs2PreparedRequest(
+            client=self,
+            method=method,
+            url=resolved_url,
+            endpoint=endpoint,
+            service=service,
+            component=component,
+            target_function=target_function,
+            query_strings=query_strings,
+            body=body,
             headers=headers,
-            timestamp=int(time.time())
         )
 
-        response = requests.put(
-            url=url.replace('{service}', service).replace('{region}', self.__region),
-            json=body,
-            headers=headers
-        )
+    def _do_prepared_request(self, prepared, query_strings, body, headers, timeout=None):
+        """
+        準備済みリクエストを発行する
+        :param prepared: 準備済みリクエスト
+        :type prepared: gs2_core_client.Gs2PreparedRequest.Gs2PreparedRequest
+        :param query_strings: クエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body(エンコード済みの JSON)
+        :type body: bytes or None
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        import time
 
-        return self.__parse_response(response)
+        started_at = time.time()
+        return self.__dispatch(
+            prepared.get_method(), prepared.get_url(), prepared.get_endpoint(), prepared.get_service(),
+            prepared.get_component(), prepared.get_target_function(), query_strings, body, headers, started_at, 0.0,
+            self._get_deadline(started_at, timeout))
 
-    def _do_delete_request(self, url, service, component, target_function, query_strings, headers):
+    def _prepare_operation(self, operation, batch_deadline):
         """
-        DELETEリクエストを発行する
+        まとめて発行するリクエストの1つについて、発行に必要な値を用意する
+        :param operation: リクエスト
+        :type operation: gs2_core_client.Gs2BulkOperation.Gs2BulkOperation
+        :param batch_deadline: まとめて発行するリクエスト全体の期限(エポック秒)。None の場合は期限なし
+        :type batch_deadline: float or None
+        :return: (エンドポイントを解決済みの URL, エンドポイント, リクエストヘッダ, 開始時刻, URL の組み立てに要した時間, 期限)
+        :rtype: (unicode, gs2_core_client.fast_requests.endpoint.Endpoint, dict, float, float, float or None)
+        :raises DeadlineExceededException: 全体の期限を過ぎている場合
+        """
+        import time
+
+        if is_expired(batch_deadline):
+            from gs2_core_client.exception.DeadlineExceededException import DeadlineExceededException
+            raise DeadlineExceededException('deadline exceeded')
+        started_at = time.time()
+        endpoint, url = self._resolve_endpoint(operation.get_url(), operation.get_service())
+        deadline = self._get_deadline(started_at)
+        if batch_deadline is not None and (deadline is None or batch_deadline < deadline):
+            deadline = batch_deadline
+        # リクエストIDや認証情報を書き込むため、リクエスト間で共有されている可能性のあるヘッダはコピーする
+        headers = dict(operation.get_headers()) if operation.get_headers() else {}
+        return url, endpoint, headers, started_at, time.time() - started_at, deadline
+
+    def __execute_operation(self, operation, batch_deadline):
+        """
+        まとめて発行するリクエストの1つを発行する
+        :return: レスポンス
+        :rtype: dict
+        """
+        url, endpoint, headers, started_at, resolve_time, deadline = self._prepare_operation(operation, batch_deadline)
+        return self.__dispatch(
+            operation.get_method(), url, endpoint, operation.get_service(), operation.get_component(),
+            operation.get_target_function(), operation.get_query_strings(), operation.get_body(), headers, started_at,
+            resolve_time, deadline)
+
+    def execute_bulk(self, operations, concurrency=8, stop_on_error=False, timeout=None):
+        """
+        複数のリクエストを並行して発行する
+        結果は operations と同じ順序で返し、失敗したリクエストの位置には送出された例外を格納する
+        コネクションプールの最大数を超える並行数を指定すると、超えた分はコネクションの返却を待つ
+        :param operations: 発行するリクエストのリスト
+        :type operations: list[gs2_core_client.Gs2BulkOperation.Gs2BulkOperation]
+        :param concurrency: 同時に発行するリクエスト数の上限
+        :type concurrency: int
+        :param stop_on_error: 最初に失敗した時点で、まだ発行していないリクエストの発行を取りやめるか
+                              取りやめたリクエストの位置は None になる
+        :type stop_on_error: bool
+        :param timeout: 全体のタイムアウト時間(秒)。期限までに完了しなかったリクエストの位置には
+                        DeadlineExceededException を格納する。None の場合は期限なし
+        :type timeout: float or None
+        :return: レスポンスまたは例外のリスト
+        :rtype: list[dict or Exception or None]
+        """
+        import threading
+
+        operations = list(operations)
+        results = [None] * len(operations)
+        batch_deadline = get_deadline(timeout)
+        pending = iter(range(len(operations)))
+        lock = threading.Lock()
+        state = {'stopped': False}
+
+        def run():
+            while True:
+                with lock:
+                    if state['stopped']:
+                        return
+                    index = next(pending, None)
+                if index is None:
+                    return
+                try:
+                    results[index] = self.__execute_operation(operations[index], batch_deadline)
+                except Exception as e:
+                    results[index] = e
+                    if stop_on_error:
+                        with lock:
+                            state['stopped'] = True
+
+        # 呼び出し元のスレッドも1つのワーカーとして動作する
+        workers = [threading.Thread(target=run) for _ in range(min(max(concurrency, 1), len(operations)) - 1)]
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+        run()
+        for worker in workers:
+            worker.join()
+        return results
+
+    def paginate(self, url, service, component, target_function, query_strings=None, headers=None,
+                 items_key='items', next_page_token_key='nextPageToken', page_token_param='pageToken',
+                 max_buffered_pages=1, timeout=None):
+        """
+        ページトークンで続きを取得する GET リクエストの結果を、1件ずつ遅延して返すイテレータを生成する
+        呼び出し元が現在のページを処理している間に、次のページを先読みする
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: 最初のページを取得する際のクエリストリング
+        :type query_strings: dict or None
+        :param headers: リクエストヘッダ
+        :type headers: dict or None
+        :param items_key: レスポンスのうち要素のリストを保持するキー
+        :type items_key: str
+        :param next_page_token_key: レスポンスのうち次のページのトークンを保持するキー
+        :type next_page_token_key: str
+        :param page_token_param: ページトークンを指定するクエリストリングの名前
+        :type page_token_param: str
+        :param max_buffered_pages: 先読みしてバッファに保持するページ数の上限。0 の場合は先読みしない
+        :type max_buffered_pages: int
+        :param timeout: 1ページあたりのリトライを含めたタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: 要素を返すイテレータ
+        :rtype: gs2_core_client.Gs2Paginator.Gs2Paginator
+        """
+        from gs2_core_client.Gs2Paginator import Gs2Paginator
+
+        def fetch(page_query_strings):
+            return self._do_get_request(
+                url, service, component, target_function, page_query_strings, dict(headers) if headers else {},
+                timeout)
+
+        return Gs2Paginator(
+            fetch,
+            query_strings=query_strings,
+            items_key=items_key,
+            next_page_token_key=next_page_token_key,
+            page_token_param=page_token_param,
+            max_buffered_pages=max_buffered_pages,
+        )
+
+    def _do_get_request(self, url, service, component, target_function, query_strings, headers, timeout=None):
+        """
+        GETリクエストを発行する
         :param url: URL
         :type url: unicode
         :param service: サービス名
@@ -201,23 +1166,75 @@ class AbstractGs2Client(object):
         :type query_strings: dict
         :param headers: リクエストヘッダ
         :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
         :return: レスポンス
         :rtype: dict
         """
-        import time
-        from gs2_core_client.fast_requests import requests
+        return self.__request('GET', url, service, component, target_function, query_strings, None, headers, timeout)
 
-        self.__credential.authorized(
-            module=component,
-            function=target_function,
-            headers=headers,
-            timestamp=int(time.time())
-        )
+    def _do_post_request(self, url, service, component, target_function, body, headers, timeout=None):
+        """
+        POSTリクエストを発行する
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param body: POST Body(dict またはエンコード済みの JSON)
+        :type body: dict or bytes
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        return self.__request('POST', url, service, component, target_function, None, body, headers, timeout)
 
-        response = requests.delete(
-            url=url.replace('{service}', service).replace('{region}', self.__region),
-            params=query_strings,
-            headers=headers
-        )
+    def _do_put_request(self, url, service, component, target_function, body, headers, timeout=None):
+        """
+        PUTリクエストを発行する
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param body: POST Body(dict またはエンコード済みの JSON)
+        :type body: dict or bytes
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        return self.__request('PUT', url, service, component, target_function, None, body, headers, timeout)
 
-        return self.__parse_response(response)
+    def _do_delete_request(self, url, service, component, target_function, query_strings, headers, timeout=None):
+        """
+        DELETEリクエストを発行する
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        return self.__request('DELETE', url, service, component, target_function, query_strings, None, headers, timeout)
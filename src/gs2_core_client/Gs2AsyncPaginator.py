@@ -0,0 +1,189 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# asyncio 版の Gs2Paginator (Python 3.5 以降でのみ利用可能)
+
+import asyncio
+
+
+class _PageFetcher(object):
+
+    def __init__(self, fetch, query_strings, items_key, next_page_token_key, page_token_param):
+        """
+        ページを順に取得する
+        先読みのタスクから参照されるため、イテレータ本体を参照しないように分けている
+        """
+        self.__fetch = fetch
+        self.__query_strings = query_strings
+        self.__items_key = items_key
+        self.__next_page_token_key = next_page_token_key
+        self.__page_token_param = page_token_param
+        self.done = False
+
+    async def fetch(self):
+        """
+        次のページを取得する
+        :return: 要素のリスト
+        :rtype: list
+        """
+        response = await self.__fetch(dict(self.__query_strings))
+        page_token = response.get(self.__next_page_token_key)
+        if page_token:
+            query_strings = dict(self.__query_strings)
+            query_strings[self.__page_token_param] = page_token
+            self.__query_strings = query_strings
+        else:
+            self.done = True
+        return response.get(self.__items_key) or []
+
+
+async def _prefetch(fetcher, buffer, slots):
+    try:
+        while not fetcher.done:
+            # 取り出されていないページの数を max_buffered_pages 以下に保つため、ページを取得する前に枠を確保する
+            await slots.acquire()
+            page = await fetcher.fetch()
+            buffer.put_nowait((page, None))
+        await buffer.put((None, None))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        await buffer.put((None, e))
+
+
+class _PageIterator(object):
+
+    def __init__(self, fetcher, max_buffered_pages):
+        """
+        ページ単位の非同期イテレータ
+        走査を途中で打ち切ってイテレータが破棄されるか close() を呼び出すと、先読みを停止する
+        """
+        self.__fetcher = fetcher
+        self.__max_buffered_pages = max_buffered_pages
+        self.__buffer = None
+        self.__slots = None
+        self.__task = None
+        self.__closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.__closed:
+            raise StopAsyncIteration
+        if self.__max_buffered_pages <= 0:
+            if self.__fetcher.done:
+                self.close()
+                raise StopAsyncIteration
+            try:
+                return await self.__fetcher.fetch()
+            except BaseException:
+                self.close()
+                raise
+
+        if self.__task is None:
+            self.__buffer = asyncio.Queue()
+            self.__slots = asyncio.Semaphore(self.__max_buffered_pages)
+            self.__task = asyncio.ensure_future(_prefetch(self.__fetcher, self.__buffer, self.__slots))
+        page, error = await self.__buffer.get()
+        if error is not None:
+            self.close()
+            raise error
+        if page is None:
+            self.close()
+            raise StopAsyncIteration
+        self.__slots.release()
+        return page
+
+    def close(self):
+        """
+        走査を終了し、先読みを停止する
+        """
+        self.__closed = True
+        if self.__task is not None and not self.__task.done():
+            self.__task.cancel()
+        self.__task = None
+        self.__buffer = None
+        self.__slots = None
+
+    def __del__(self):
+        self.close()
+
+
+class _ItemIterator(object):
+
+    def __init__(self, pages):
+        """
+        要素単位の非同期イテレータ
+        """
+        self.__pages = pages
+        self.__items = iter(())
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            for item in self.__items:
+                return item
+            self.__items = iter(await self.__pages.__anext__())
+
+    def close(self):
+        """
+        走査を終了し、先読みを停止する
+        """
+        self.__pages.close()
+
+
+class Gs2AsyncPaginator(object):
+
+    def __init__(self, fetch, query_strings=None, items_key='items', next_page_token_key='nextPageToken',
+                 page_token_param='pageToken', max_buffered_pages=1):
+        """
+        ページトークンで続きを取得する Describe 系 API の結果を、1件ずつ遅延して返す非同期イテレータ
+        呼び出し元が現在のページを処理している間に、次のページを別のタスクで先読みする
+        走査するたびに最初のページから取得し直す
+        :param fetch: クエリストリングを受け取り、1ページ分のレスポンスを返すコルーチン関数
+        :type fetch: (dict) -> dict
+        :param query_strings: 最初のページを取得する際のクエリストリング
+        :type query_strings: dict or None
+        :param items_key: レスポンスのうち要素のリストを保持するキー
+        :type items_key: str
+        :param next_page_token_key: レスポンスのうち次のページのトークンを保持するキー
+        :type next_page_token_key: str
+        :param page_token_param: ページトークンを指定するクエリストリングの名前
+        :type page_token_param: str
+        :param max_buffered_pages: 先読みしてバッファに保持するページ数の上限。0 の場合は先読みしない
+        :type max_buffered_pages: int
+        """
+        self.__fetch = fetch
+        self.__query_strings = dict(query_strings) if query_strings else {}
+        self.__items_key = items_key
+        self.__next_page_token_key = next_page_token_key
+        self.__page_token_param = page_token_param
+        self.__max_buffered_pages = max_buffered_pages
+
+    def __aiter__(self):
+        return _ItemIterator(self.iter_pages())
+
+    def iter_pages(self):
+        """
+        ページ単位で走査する
+        :return: ページごとの要素のリストを返す非同期イテレータ
+        """
+        fetcher = _PageFetcher(
+            self.__fetch, self.__query_strings, self.__items_key, self.__next_page_token_key, self.__page_token_param)
+        return _PageIterator(fetcher, self.__max_buffered_pages)
@@ -14,33 +14,72 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+try:
+    _text_types = (str, unicode)
+except NameError:
+    _text_types = (str,)
+
 
 class Gs2BasicRequest(object):
 
+    # 大量に生成されるため、インスタンスごとの __dict__ を持たない
+    __slots__ = ('__client_id', '__timestamp', '__request_sign', '__request_id')
+
     def __init__(self, params=None):
         """
         コンストラクタ
         :param params: 辞書配列形式のパラメータ初期値リスト
         :type params: dict|None
         """
-        if params is None:
-            self.__client_id = None
-            self.__timestamp = None
-            self.__request_sign = None
-            self.__request_id = None
-        else:
-            client_id = params['X-GS2-CLIENT-ID'] if 'X-GS2-CLIENT-ID' in params.keys() else None
+        self.__client_id = None
+        self.__timestamp = None
+        self.__request_sign = None
+        self.__request_id = None
+        if params:
+            # setter を経由せずに型を検査して代入する
+            get = params.get
+            client_id = get('X-GS2-CLIENT-ID')
             if client_id is not None:
-                self.__set_client_id(client_id)
-            timestamp = params['X-GS2-TIMESTAMP'] if 'X-GS2-TIMESTAMP' in params.keys() else None
+                if not isinstance(client_id, _text_types):
+                    raise TypeError()
+                self.__client_id = client_id
+            timestamp = get('X-GS2-TIMESTAMP')
+            if timestamp is None:
+                timestamp = get('X-GS2-REQUEST-TIMESTAMP')
             if timestamp is not None:
-                self.__set_timestamp(timestamp)
-            request_sign = params['X-GS2-REQUEST-SIGN'] if 'X-GS2-REQUEST-SIGN' in params.keys() else None
+                if not isinstance(timestamp, _text_types):
+                    raise TypeError()
+                self.__timestamp = timestamp
+            request_sign = get('X-GS2-REQUEST-SIGN')
             if request_sign is not None:
-                self.__set_request_sign(request_sign)
-            request_id = params['X-GS2-REQUEST-ID'] if 'X-GS2-REQUEST-ID' in params.keys() else None
+                if not isinstance(request_sign, _text_types):
+                    raise TypeError()
+                self.__request_sign = request_sign
+            request_id = get('X-GS2-REQUEST-ID')
             if request_id is not None:
-                self.set_request_id(request_id)
+                if not isinstance(request_id, _text_types):
+                    raise TypeError()
+                self.__request_id = request_id
+
+    def to_headers(self, headers=None):
+        """
+        設定されている値をリクエストヘッダに書き込む。値が設定されていない項目は書き込まない
+        :param headers: 書き込み先のリクエストヘッダ。None の場合は新しく生成する
+        :type headers: dict or None
+        :return: リクエストヘッダ
+        :rtype: dict
+        """
+        if headers is None:
+            headers = {}
+        if self.__client_id is not None:
+            headers['X-GS2-CLIENT-ID'] = self.__client_id
+        if self.__timestamp is not None:
+            headers['X-GS2-REQUEST-TIMESTAMP'] = self.__timestamp
+        if self.__request_sign is not None:
+            headers['X-GS2-REQUEST-SIGN'] = self.__request_sign
+        if self.__request_id is not None:
+            headers['X-GS2-REQUEST-ID'] = self.__request_id
+        return headers
 
     def __get_client_id(self):
         """
@@ -56,7 +95,7 @@ class Gs2BasicRequest(object):
         :param client_id: GS2クライアントID
         :type client_id: str
         """
-        if not isinstance(client_id, str) and not isinstance(client_id, unicode):
+        if not isinstance(client_id, _text_types):
             raise TypeError()
         self.__client_id = client_id
 
@@ -83,7 +122,7 @@ class Gs2BasicRequest(object):
         :param timestamp: リクエスト時刻
         :type timestamp: str
         """
-        if not isinstance(timestamp, str) and not isinstance(timestamp, unicode):
+        if not isinstance(timestamp, _text_types):
             raise TypeError()
         self.__timestamp = timestamp
 
@@ -110,7 +149,7 @@ class Gs2BasicRequest(object):
         :param request_sign: 署名
         :type request_sign: str
         """
-        if not isinstance(request_sign, str) and not isinstance(request_sign, unicode):
+        if not isinstance(request_sign, _text_types):
             raise TypeError()
         self.__request_sign = request_sign
 
@@ -137,7 +176,7 @@ class Gs2BasicRequest(object):
         :param request_id: リクエストID
         :type request_id: str
         """
-        if not isinstance(request_id, str) and not isinstance(request_id, unicode):
+        if not isinstance(request_id, _text_types):
             raise TypeError()
         self.__request_id = request_id
 
@@ -148,4 +187,4 @@ class Gs2BasicRequest(object):
         :type request_id: str
         """
         self.set_request_id(request_id)
-        return self
\ No newline at end of file
+        return self
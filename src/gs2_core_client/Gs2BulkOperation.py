@@ -0,0 +1,115 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+class Gs2BulkOperation(object):
+
+    __slots__ = (
+        '__method', '__url', '__service', '__component', '__target_function', '__query_strings', '__body', '__headers',
+    )
+
+    def __init__(self, method, url, service, component, target_function, query_strings=None, body=None, headers=None):
+        """
+        AbstractGs2Client.execute_bulk() でまとめて発行するリクエスト
+        :param method: HTTPメソッド
+        :type method: str
+        :param url: URL
+        :type url: unicode
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body(dict またはエンコード済みの JSON)
+        :type body: dict or bytes or None
+        :param headers: リクエストヘッダ
+        :type headers: dict or None
+        """
+        self.__method = method
+        self.__url = url
+        self.__service = service
+        self.__component = component
+        self.__target_function = target_function
+        self.__query_strings = query_strings
+        self.__body = body
+        self.__headers = headers
+
+    def get_method(self):
+        """
+        HTTPメソッドを取得
+        :return: HTTPメソッド
+        :rtype: str
+        """
+        return self.__method
+
+    def get_url(self):
+        """
+        URLを取得
+        :return: URL
+        :rtype: unicode
+        """
+        return self.__url
+
+    def get_service(self):
+        """
+        サービス名を取得
+        :return: サービス名
+        :rtype: str
+        """
+        return self.__service
+
+    def get_component(self):
+        """
+        モジュール名を取得
+        :return: モジュール名
+        :rtype: str
+        """
+        return self.__component
+
+    def get_target_function(self):
+        """
+        ファンクション名を取得
+        :return: ファンクション名
+        :rtype: str
+        """
+        return self.__target_function
+
+    def get_query_strings(self):
+        """
+        クエリストリングを取得
+        :return: クエリストリング
+        :rtype: dict or None
+        """
+        return self.__query_strings
+
+    def get_body(self):
+        """
+        POST Body を取得
+        :return: POST Body
+        :rtype: dict or bytes or None
+        """
+        return self.__body
+
+    def get_headers(self):
+        """
+        リクエストヘッダを取得
+        :return: リクエストヘッダ
+        :rtype: dict or None
+        """
+        return self.__headers
@@ -0,0 +1,300 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import threading
+import time
+from collections import deque
+
+# サーキットの失敗とみなすステータスコード
+_FAILURE_STATUS_CODES = frozenset((500, 502, 503, 504))
+
+
+class _Circuit(object):
+
+    def __init__(self):
+        """
+        サービス/リージョン単位のサーキットの状態
+        """
+        self.state = Gs2CircuitBreaker.STATE_CLOSED
+        self.outcomes = deque()
+        self.failures = 0
+        self.slow_calls = 0
+        self.opened_at = None
+        self.trial_calls = 0
+        self.trial_successes = 0
+        self.rejected = 0
+
+
+class Gs2CircuitBreaker(object):
+
+    STATE_CLOSED = 'closed'
+    STATE_OPEN = 'open'
+    STATE_HALF_OPEN = 'half_open'
+
+    def __init__(
+            self,
+            failure_rate_threshold=0.5,
+            slow_call_rate_threshold=1.0,
+            slow_call_duration=10.0,
+            minimum_calls=20,
+            window=30.0,
+            open_duration=10.0,
+            half_open_max_calls=3,
+    ):
+        """
+        サービス/リージョン単位のサーキットブレーカー
+        直近 window 秒の失敗率または遅延率がしきい値を超えるとサーキットを開き、open_duration 秒の間は通信せずに
+        CircuitOpenException を送出する。その後 half_open_max_calls 回の試行がすべて成功すればサーキットを閉じる
+        失敗とみなすのは InternalServerErrorException / BadGatewayException / ServiceUnavailableException /
+        RequestTimeoutException と通信エラー
+        :param failure_rate_threshold: サーキットを開く失敗率(0.0 - 1.0)
+        :type failure_rate_threshold: float
+        :param slow_call_rate_threshold: サーキットを開く遅延率(0.0 - 1.0)。1.0 を超える値を指定すると遅延では開かない
+        :type slow_call_rate_threshold: float
+        :param slow_call_duration: 遅延とみなす所要時間(秒)
+        :type slow_call_duration: float
+        :param minimum_calls: 失敗率を判定するために必要な最小の呼び出し数
+        :type minimum_calls: int
+        :param window: 失敗率を集計する期間(秒)
+        :type window: float
+        :param open_duration: サーキットを開いておく時間(秒)
+        :type open_duration: float
+        :param half_open_max_calls: 半開状態で許可する試行の数
+        :type half_open_max_calls: int
+        """
+        self.__failure_rate_threshold = failure_rate_threshold
+        self.__slow_call_rate_threshold = slow_call_rate_threshold
+        self.__slow_call_duration = slow_call_duration
+        self.__minimum_calls = minimum_calls
+        self.__window = window
+        self.__open_duration = open_duration
+        self.__half_open_max_calls = half_open_max_calls
+        self.__lock = threading.Lock()
+        self.__circuits = {}
+        self.__listeners = []
+
+    @staticmethod
+    def is_failure(exception):
+        """
+        例外がサーキットの失敗にあたるか
+        :param exception: 例外
+        :type exception: BaseException
+        :return: 失敗の場合 True, 成功の場合 False, 集計対象外の場合 None
+        :rtype: bool or None
+        """
+        get_status_code = getattr(exception, 'get_status_code', None)
+        if get_status_code is not None:
+            status_code = get_status_code()
+            if status_code is not None:
+                # HTTP レスポンスから生成した例外はステータスコードだけで判定する
+                return status_code in _FAILURE_STATUS_CODES
+
+        from gs2_core_client.exception.Gs2Exception import Gs2Exception
+        from gs2_core_client.exception.InternalServerErrorException import InternalServerErrorException
+        from gs2_core_client.exception.BadGatewayException import BadGatewayException
+        from gs2_core_client.exception.ServiceUnavailableException import ServiceUnavailableException
+        from gs2_core_client.exception.RequestTimeoutException import RequestTimeoutException
+        from gs2_core_client.exception.ThrottledException import ThrottledException
+        from gs2_core_client.exception.CircuitOpenException import CircuitOpenException
+
+        if isinstance(exception, (InternalServerErrorException, BadGatewayException, ServiceUnavailableException,
+                                  RequestTimeoutException)):
+            return True
+        if isinstance(exception, (ThrottledException, CircuitOpenException)):
+            return None
+        if isinstance(exception, Gs2Exception):
+            # サービスが応答したうえでのクライアントエラーはサービスの異常ではない
+            return False
+        if isinstance(exception, (IOError, OSError, EnvironmentError)):
+            return True
+        try:
+            from httplib import HTTPException
+        except ImportError:
+            from http.client import HTTPException
+        if isinstance(exception, HTTPException):
+            return True
+        try:
+            import asyncio
+            if isinstance(exception, (asyncio.TimeoutError, asyncio.IncompleteReadError)):
+                return True
+        except ImportError:
+            pass
+        return None
+
+    def add_listener(self, listener):
+        """
+        状態遷移を通知するリスナーを登録する
+        :param listener: (service, region, 遷移前の状態, 遷移後の状態) を受け取る関数
+        :type listener: (str, str, str, str) -> None
+        """
+        self.__listeners.append(listener)
+
+    def before_call(self, service, region):
+        """
+        呼び出しの前に実行する。サーキットが開いている場合は CircuitOpenException を送出する
+        :param service: サービス名
+        :type service: str
+        :param region: リージョン
+        :type region: str
+        :raises CircuitOpenException: サーキットが開いている場合
+        """
+        transition = None
+        with self.__lock:
+            circuit = self.__circuits.get((service, region))
+            if circuit is None:
+                circuit = self.__circuits[(service, region)] = _Circuit()
+            if circuit.state == self.STATE_CLOSED:
+                return
+            if circuit.state == self.STATE_OPEN:
+                if time.time() - circuit.opened_at < self.__open_duration:
+                    circuit.rejected += 1
+                    rejected = True
+                else:
+                    transition = self.__transition(circuit, self.STATE_HALF_OPEN)
+                    rejected = False
+            else:
+                rejected = False
+            if not rejected:
+                if circuit.trial_calls < self.__half_open_max_calls:
+                    circuit.trial_calls += 1
+                else:
+                    circuit.rejected += 1
+                    rejected = True
+
+        if transition is not None:
+            self.__notify(service, region, transition)
+        if rejected:
+            from gs2_core_client.exception.CircuitOpenException import CircuitOpenException
+            raise CircuitOpenException('circuit is open: {service} ({region})'.format(service=service, region=region))
+
+    def record(self, service, region, duration, exception=None):
+        """
+        呼び出しの結果を記録する。before_call が例外を送出しなかった呼び出しごとに1回実行する
+        :param service: サービス名
+        :type service: str
+        :param region: リージョン
+        :type region: str
+        :param duration: 所要時間(秒)
+        :type duration: float
+        :param exception: 発生した例外。成功した場合は None
+        :type exception: BaseException or None
+        """
+        failure = False if exception is None else self.is_failure(exception)
+        slow = duration >= self.__slow_call_duration
+        now = time.time()
+
+        transition = None
+        with self.__lock:
+            circuit = self.__circuits.get((service, region))
+            if circuit is None:
+                return
+            if circuit.state == self.STATE_HALF_OPEN:
+                if failure is None:
+                    circuit.trial_calls -= 1
+                elif failure or slow:
+                    transition = self.__transition(circuit, self.STATE_OPEN, now)
+                else:
+                    circuit.trial_successes += 1
+                    if circuit.trial_successes >= self.__half_open_max_calls:
+                        transition = self.__transition(circuit, self.STATE_CLOSED)
+            elif circuit.state == self.STATE_CLOSED and failure is not None:
+                circuit.outcomes.append((now, failure, slow))
+                circuit.failures += failure
+                circuit.slow_calls += slow
+                self.__expire(circuit, now)
+                calls = len(circuit.outcomes)
+                if calls >= self.__minimum_calls and (
+                        float(circuit.failures) / calls >= self.__failure_rate_threshold or
+                        float(circuit.slow_calls) / calls >= self.__slow_call_rate_threshold):
+                    transition = self.__transition(circuit, self.STATE_OPEN, now)
+
+        if transition is not None:
+            self.__notify(service, region, transition)
+
+    def get_state(self, service, region):
+        """
+        サーキットの状態を取得する
+        :param service: サービス名
+        :type service: str
+        :param region: リージョン
+        :type region: str
+        :return: closed / open / half_open
+        :rtype: str
+        """
+        circuit = self.__circuits.get((service, region))
+        return circuit.state if circuit is not None else self.STATE_CLOSED
+
+    def get_stats(self):
+        """
+        すべてのサーキットの状態を取得する
+        :return: (service, region) をキーとした状態、集計中の呼び出し数、失敗率、遅延率、拒否した回数
+        :rtype: dict[tuple, dict]
+        """
+        now = time.time()
+        with self.__lock:
+            stats = {}
+            for key, circuit in self.__circuits.items():
+                self.__expire(circuit, now)
+                calls = len(circuit.outcomes)
+                stats[key] = {
+                    'state': circuit.state,
+                    'calls': calls,
+                    'failure_rate': float(circuit.failures) / calls if calls else 0.0,
+                    'slow_call_rate': float(circuit.slow_calls) / calls if calls else 0.0,
+                    'rejected': circuit.rejected,
+                    'opened_at': circuit.opened_at,
+                }
+            return stats
+
+    def reset(self, service, region):
+        """
+        サーキットを閉じて集計をリセットする
+        :param service: サービス名
+        :type service: str
+        :param region: リージョン
+        :type region: str
+        """
+        with self.__lock:
+            circuit = self.__circuits.get((service, region))
+            transition = self.__transition(circuit, self.STATE_CLOSED) if circuit is not None else None
+        if transition is not None and transition[0] != transition[1]:
+            self.__notify(service, region, transition)
+
+    def __expire(self, circuit, now):
+        outcomes = circuit.outcomes
+        limit = now - self.__window
+        while outcomes and outcomes[0][0] < limit:
+            _, failure, slow = outcomes.popleft()
+            circuit.failures -= failure
+            circuit.slow_calls -= slow
+
+    def __transition(self, circuit, state, now=None):
+        previous = circuit.state
+        circuit.state = state
+        circuit.trial_calls = 0
+        circuit.trial_successes = 0
+        if state == self.STATE_OPEN:
+            circuit.opened_at = now if now is not None else time.time()
+        elif state == self.STATE_CLOSED:
+            circuit.opened_at = None
+            circuit.outcomes.clear()
+            circuit.failures = 0
+            circuit.slow_calls = 0
+        return previous, state
+
+    def __notify(self, service, region, transition):
+        for listener in self.__listeners:
+            listener(service, region, transition[0], transition[1])
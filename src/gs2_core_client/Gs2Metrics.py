@@ -0,0 +1,207 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import threading
+from bisect import bisect_left
+
+
+class _Histogram(object):
+
+    __slots__ = ('counts', 'sum')
+
+    def __init__(self, size):
+        """
+        レイテンシのヒストグラム
+        :param size: バケット数(+Inf を含む)
+        :type size: int
+        """
+        self.counts = [0] * size
+        self.sum = 0.0
+
+
+class Gs2Metrics(object):
+
+    PHASE_RESOLVE = 'resolve'
+    PHASE_SIGN = 'sign'
+    PHASE_CONNECT = 'connect'
+    PHASE_TLS = 'tls'
+    PHASE_SEND = 'send'
+    PHASE_TTFB = 'ttfb'
+    PHASE_READ = 'read'
+    PHASE_BACKOFF = 'backoff'
+    PHASE_PARSE = 'parse'
+    PHASE_TOTAL = 'total'
+
+    STATUS_ERROR = 'error'
+
+    DEFAULT_BUCKETS = (
+        0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+    )
+
+    def __init__(self, buckets=None):
+        """
+        リクエストのフェーズごとの所要時間を サービス/モジュール/ファンクション/ステータスコード 単位のヒストグラムに集計する
+        フェーズは resolve(URL の組み立て) / sign(署名) / connect(TCP 接続) / tls(TLS ハンドシェイク) / send(送信) /
+        ttfb(送信完了から最初の応答まで) / read(ボディの受信) / backoff(リトライの待機) / parse(JSON のパース) /
+        total(全体)
+        connect と tls は新しく接続した場合のみ、backoff はリトライした場合のみ記録される
+        asyncio 版のクライアントでは TLS ハンドシェイクの時間は connect に含まれる
+        通信エラーで終了したリクエストのステータスは 'error' として集計する
+        :param buckets: ヒストグラムのバケットの上限値(秒)の昇順リスト。None の場合は DEFAULT_BUCKETS
+        :type buckets: list[float] or None
+        """
+        self.__buckets = tuple(sorted(buckets if buckets is not None else self.DEFAULT_BUCKETS))
+        self.__lock = threading.Lock()
+        self.__series = {}
+
+    def get_buckets(self):
+        """
+        ヒストグラムのバケットの上限値を取得
+        :return: バケットの上限値(秒)
+        :rtype: tuple[float]
+        """
+        return self.__buckets
+
+    def record(self, service, component, target_function, status, timings):
+        """
+        リクエストの所要時間を記録する
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param status: ステータスコード。通信エラーの場合は None
+        :type status: int or None
+        :param timings: フェーズ名をキーとした所要時間(秒)
+        :type timings: dict[str, float]
+        """
+        key = (service, component, target_function, self.STATUS_ERROR if status is None else str(status))
+        buckets = self.__buckets
+        with self.__lock:
+            series = self.__series.get(key)
+            if series is None:
+                series = self.__series[key] = {}
+            for phase, duration in timings.items():
+                histogram = series.get(phase)
+                if histogram is None:
+                    histogram = series[phase] = _Histogram(len(buckets) + 1)
+                histogram.counts[bisect_left(buckets, duration)] += 1
+                histogram.sum += duration
+
+    def __estimate(self, counts, total, quantile):
+        """
+        バケットの上限値から分位点を推定する
+        :return: 分位点(秒)。+Inf のバケットに含まれる場合は None
+        :rtype: float or None
+        """
+        threshold = total * quantile
+        cumulative = 0
+        for i, count in enumerate(counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return self.__buckets[i] if i < len(self.__buckets) else None
+        return None
+
+    def get_stats(self):
+        """
+        集計結果を取得する
+        分位点はバケットの上限値による推定値
+        :return: (service, component, function, status) をキー、フェーズ名を2段目のキーとした
+                 count, sum, mean, p50, p90, p99, buckets(上限値と累積件数の組のリスト)
+        :rtype: dict[tuple, dict[str, dict]]
+        """
+        with self.__lock:
+            snapshot = [
+                (key, [(phase, list(histogram.counts), histogram.sum) for phase, histogram in series.items()])
+                for key, series in self.__series.items()
+            ]
+
+        stats = {}
+        for key, phases in snapshot:
+            stats[key] = {}
+            for phase, counts, total_duration in phases:
+                count = sum(counts)
+                cumulative = []
+                running = 0
+                for i, bucket in enumerate(self.__buckets):
+                    running += counts[i]
+                    cumulative.append((bucket, running))
+                stats[key][phase] = {
+                    'count': count,
+                    'sum': total_duration,
+                    'mean': total_duration / count if count else 0.0,
+                    'p50': self.__estimate(counts, count, 0.5),
+                    'p90': self.__estimate(counts, count, 0.9),
+                    'p99': self.__estimate(counts, count, 0.99),
+                    'buckets': cumulative,
+                }
+        return stats
+
+    def to_prometheus(self, namespace='gs2_client'):
+        """
+        集計結果を Prometheus のテキストフォーマットで出力する
+        :param namespace: メトリクス名の接頭辞
+        :type namespace: str
+        :return: Prometheus テキストフォーマット
+        :rtype: str
+        """
+        name = '{namespace}_request_duration_seconds'.format(namespace=namespace)
+        lines = [
+            '# HELP {name} Time spent in each phase of GS2 API requests.'.format(name=name),
+            '# TYPE {name} histogram'.format(name=name),
+        ]
+        stats = self.get_stats()
+        for key in sorted(stats.keys()):
+            service, component, target_function, status = key
+            for phase in sorted(stats[key].keys()):
+                phase_stats = stats[key][phase]
+                labels = 'service="{service}",component="{component}",function="{function}",' \
+                         'status="{status}",phase="{phase}"'.format(
+                             service=_escape_label(service),
+                             component=_escape_label(component),
+                             function=_escape_label(target_function),
+                             status=_escape_label(status),
+                             phase=_escape_label(phase),
+                         )
+                for bucket, count in phase_stats['buckets']:
+                    lines.append('{name}_bucket{{{labels},le="{le}"}} {count}'.format(
+                        name=name, labels=labels, le=repr(float(bucket)), count=count))
+                lines.append('{name}_bucket{{{labels},le="+Inf"}} {count}'.format(
+                    name=name, labels=labels, count=phase_stats['count']))
+                lines.append('{name}_sum{{{labels}}} {sum}'.format(
+                    name=name, labels=labels, sum=repr(phase_stats['sum'])))
+                lines.append('{name}_count{{{labels}}} {count}'.format(
+                    name=name, labels=labels, count=phase_stats['count']))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """
+        集計結果を破棄する
+        """
+        with self.__lock:
+            self.__series = {}
+
+
+def _escape_label(value):
+    """
+    Prometheus のラベル値をエスケープする
+    :param value: ラベル値
+    :type value: str
+    :return: エスケープしたラベル値
+    :rtype: str
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,119 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import threading
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
+
+class Gs2Paginator(object):
+
+    def __init__(self, fetch, query_strings=None, items_key='items', next_page_token_key='nextPageToken',
+                 page_token_param='pageToken', max_buffered_pages=1):
+        """
+        ページトークンで続きを取得する Describe 系 API の結果を、1件ずつ遅延して返すイテレータ
+        呼び出し元が現在のページを処理している間に、次のページをバックグラウンドのスレッドで先読みする
+        走査を途中で打ち切った場合、先読みは次のページを取得した時点で停止する
+        走査するたびに最初のページから取得し直す
+        :param fetch: クエリストリングを受け取り、1ページ分のレスポンスを返す関数
+        :type fetch: (dict) -> dict
+        :param query_strings: 最初のページを取得する際のクエリストリング
+        :type query_strings: dict or None
+        :param items_key: レスポンスのうち要素のリストを保持するキー
+        :type items_key: str
+        :param next_page_token_key: レスポンスのうち次のページのトークンを保持するキー
+        :type next_page_token_key: str
+        :param page_token_param: ページトークンを指定するクエリストリングの名前
+        :type page_token_param: str
+        :param max_buffered_pages: 先読みしてバッファに保持するページ数の上限。0 の場合は先読みしない
+        :type max_buffered_pages: int
+        """
+        self.__fetch = fetch
+        self.__query_strings = dict(query_strings) if query_strings else {}
+        self.__items_key = items_key
+        self.__next_page_token_key = next_page_token_key
+        self.__page_token_param = page_token_param
+        self.__max_buffered_pages = max_buffered_pages
+
+    def __iter__(self):
+        for page in self.iter_pages():
+            for item in page:
+                yield item
+
+    def __fetch_pages(self):
+        """
+        ページを順に取得する
+        :return: ページごとの要素のリストを返すジェネレータ
+        """
+        query_strings = self.__query_strings
+        while True:
+            response = self.__fetch(dict(query_strings))
+            yield response.get(self.__items_key) or []
+            page_token = response.get(self.__next_page_token_key)
+            if not page_token:
+                return
+            query_strings = dict(query_strings)
+            query_strings[self.__page_token_param] = page_token
+
+    def iter_pages(self):
+        """
+        ページ単位で走査する
+        :return: ページごとの要素のリストを返すジェネレータ
+        """
+        if self.__max_buffered_pages <= 0:
+            for page in self.__fetch_pages():
+                yield page
+            return
+
+        pages = self.__fetch_pages()
+        # 取り出されていないページの数を max_buffered_pages 以下に保つため、ページを取得する前に枠を確保する
+        slots = threading.Semaphore(self.__max_buffered_pages)
+        buffer = Queue()
+        stopped = threading.Event()
+
+        def prefetch():
+            try:
+                while True:
+                    slots.acquire()
+                    if stopped.is_set():
+                        return
+                    page = next(pages, None)
+                    if page is None:
+                        break
+                    buffer.put((page, None))
+                buffer.put((None, None))
+            except Exception as e:
+                buffer.put((None, e))
+
+        thread = threading.Thread(target=prefetch)
+        thread.daemon = True
+        thread.start()
+        try:
+            while True:
+                page, error = buffer.get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    return
+                slots.release()
+                yield page
+        finally:
+            stopped.set()
+            # 先読みのスレッドが枠の確保で待機していれば、起こして終了させる
+            slots.release()
@@ -0,0 +1,184 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+from gs2_core_client.fast_requests import json_codec
+
+
+class Gs2PreparedRequest(object):
+
+    def __init__(self, client, method, url, endpoint, service, component, target_function, query_strings=None,
+                 body=None, headers=None):
+        """
+        準備済みリクエスト。AbstractGs2Client.prepare() で生成する
+        同じファンクションを繰り返し呼び出す場合に、毎回変化しない部分の処理を省略する
+        署名は認証情報が同じ時刻(秒)のものを再利用する
+        :param client: リクエストを発行するクライアント
+        :type client: gs2_core_client.AbstractGs2Client.AbstractGs2Client
+        :param method: HTTPメソッド
+        :type method: str
+        :param url: エンドポイントを解決済みの URL
+        :type url: unicode
+        :param endpoint: エンドポイント
+        :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint
+        :param service: サービス名
+        :type service: str
+        :param component: モジュール名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param query_strings: 固定のクエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body の固定部分
+        :type body: dict or None
+        :param headers: 固定のリクエストヘッダ
+        :type headers: dict or None
+        :raises ValueError: POST / PUT 以外のメソッドで body を指定した場合
+        """
+        if body and method not in ('POST', 'PUT'):
+            raise ValueError('body is not allowed for {method} requests'.format(method=method))
+        self.__client = client
+        self.__method = method
+        self.__url = url
+        self.__endpoint = endpoint
+        self.__service = service
+        self.__component = component
+        self.__target_function = target_function
+        self.__query_strings = dict(query_strings) if query_strings else {}
+        self.__headers = dict(headers) if headers else {}
+        self.__body = dict(body) if body else {}
+        self.__encoded_body = json_codec.dumps(self.__body) if method in ('POST', 'PUT') else None
+        # 固定部分の JSON から前後の {} を除いたもの。可変部分の JSON と連結して POST Body を組み立てる
+        self.__encoded_members = self.__encoded_body[1:-1].strip() if self.__encoded_body is not None else None
+
+    def get_method(self):
+        """
+        HTTPメソッドを取得
+        :return: HTTPメソッド
+        :rtype: str
+        """
+        return self.__method
+
+    def get_url(self):
+        """
+        URLを取得
+        :return: URL
+        :rtype: unicode
+        """
+        return self.__url
+
+    def get_endpoint(self):
+        """
+        エンドポイントを取得
+        :return: エンドポイント
+        :rtype: gs2_core_client.fast_requests.endpoint.Endpoint
+        """
+        return self.__endpoint
+
+    def get_service(self):
+        """
+        サービス名を取得
+        :return: サービス名
+        :rtype: str
+        """
+        return self.__service
+
+    def get_component(self):
+        """
+        モジュール名を取得
+        :return: モジュール名
+        :rtype: str
+        """
+        return self.__component
+
+    def get_target_function(self):
+        """
+        ファンクション名を取得
+        :return: ファンクション名
+        :rtype: str
+        """
+        return self.__target_function
+
+    def build(self, query_strings=None, body=None, headers=None):
+        """
+        呼び出しごとに変化する部分を埋めて、リクエストの各要素を組み立てる
+        :param query_strings: 固定のクエリストリングに追加・上書きするクエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body の固定部分に追加・上書きする値
+        :type body: dict or None
+        :param headers: 固定のリクエストヘッダに追加・上書きするリクエストヘッダ
+        :type headers: dict or None
+        :return: (クエリストリング, POST Body(エンコード済みの JSON), リクエストヘッダ)
+        :rtype: (dict, bytes or None, dict)
+        :raises ValueError: POST / PUT 以外のメソッドで body を指定した場合
+        """
+        if body and self.__encoded_body is None:
+            raise ValueError('body is not allowed for {method} requests'.format(method=self.__method))
+
+        request_headers = dict(self.__headers)
+        if headers:
+            request_headers.update(headers)
+
+        request_query_strings = dict(self.__query_strings)
+        if query_strings:
+            request_query_strings.update(query_strings)
+
+        encoded_body = self.__encoded_body
+        if body:
+            if not self.__encoded_members:
+                encoded_body = json_codec.dumps(body)
+            elif any(key in self.__body for key in body):
+                merged = dict(self.__body)
+                merged.update(body)
+                encoded_body = json_codec.dumps(merged)
+            else:
+                encoded_body = json_codec.dumps(body)[:-1] + b',' + self.__encoded_members + b'}'
+
+        return request_query_strings, encoded_body, request_headers
+
+    def execute(self, query_strings=None, body=None, headers=None, timeout=None):
+        """
+        リクエストを発行する
+        :param query_strings: 固定のクエリストリングに追加・上書きするクエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body の固定部分に追加・上書きする値
+        :type body: dict or None
+        :param headers: 固定のリクエストヘッダに追加・上書きするリクエストヘッダ
+        :type headers: dict or None
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンス
+        :rtype: dict
+        """
+        request_query_strings, encoded_body, request_headers = self.build(query_strings, body, headers)
+        return self.__client._do_prepared_request(
+            self, request_query_strings, encoded_body, request_headers, timeout)
+
+    def execute_async(self, query_strings=None, body=None, headers=None, timeout=None):
+        """
+        リクエストを非同期に発行する。クライアントが AbstractGs2AsyncClient の場合のみ利用できる
+        :param query_strings: 固定のクエリストリングに追加・上書きするクエリストリング
+        :type query_strings: dict or None
+        :param body: POST Body の固定部分に追加・上書きする値
+        :type body: dict or None
+        :param headers: 固定のリクエストヘッダに追加・上書きするリクエストヘッダ
+        :type headers: dict or None
+        :param timeout: リトライを含めたリクエスト全体のタイムアウト時間(秒)。None の場合はクライアントに設定したもの
+        :type timeout: float or None
+        :return: レスポンスを返すコルーチン
+        """
+        request_query_strings, encoded_body, request_headers = self.build(query_strings, body, headers)
+        return self.__client._do_prepared_request_async(
+            self, request_query_strings, encoded_body, request_headers, timeout)
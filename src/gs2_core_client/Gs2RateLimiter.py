@@ -0,0 +1,251 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import threading
+import time
+
+
+class _TokenBucket(object):
+
+    def __init__(self, rate, burst, min_rate, max_rate):
+        """
+        トークンバケット
+        :param rate: 1秒あたりに補充するトークン数
+        :type rate: float
+        :param burst: バケットの容量
+        :type burst: float
+        :param min_rate: 減速時の下限
+        :type min_rate: float
+        :param max_rate: 加速時の上限
+        :type max_rate: float
+        """
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.tokens = float(burst)
+        self.updated_at = time.time()
+        self.decreased_at = 0.0
+        self.increased_at = self.updated_at
+        self.granted = 0
+        self.rejected = 0
+
+    def refill(self, now):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+
+class Gs2RateLimiter(object):
+
+    MODE_BLOCK = 'block'
+    MODE_DEADLINE = 'deadline'
+    MODE_FAIL_FAST = 'fail_fast'
+
+    THROTTLED_STATUSES = (402, 503)
+
+    def __init__(
+            self,
+            mode=MODE_BLOCK,
+            timeout=None,
+            increase_step=1.0,
+            decrease_factor=0.5,
+            decrease_interval=1.0,
+    ):
+        """
+        クライアント側のレート制限
+        サービス/コンポーネント/ファンクション単位のトークンバケットで送信を制御し、
+        402/503 を受け取ると送信レートを乗算的に下げ、成功が続くと加算的に戻す(AIMD)
+        :param mode: トークンが不足している場合の動作(block: 取得できるまで待つ, deadline: timeout まで待つ, fail_fast: 待たずに失敗する)
+        :type mode: str
+        :param timeout: deadline モードで待つ最大時間(秒)
+        :type timeout: float or None
+        :param increase_step: 成功が続いた場合に1秒あたりに引き上げるレート
+        :type increase_step: float
+        :param decrease_factor: 402/503 を受け取った場合にレートに乗じる係数
+        :type decrease_factor: float
+        :param decrease_interval: 連続した 402/503 でレートを下げる最小間隔(秒)
+        :type decrease_interval: float
+        """
+        self.__mode = mode
+        self.__timeout = timeout
+        self.__increase_step = increase_step
+        self.__decrease_factor = decrease_factor
+        self.__decrease_interval = decrease_interval
+        self.__lock = threading.Lock()
+        self.__buckets = {}
+
+    def set_limit(self, service, rate, burst=None, component=None, target_function=None, min_rate=None,
+                  max_rate=None):
+        """
+        レート制限を設定する。ファンクション、コンポーネント、サービスの順に最も詳細な設定が適用される
+        :param service: サービス名
+        :type service: str
+        :param rate: 1秒あたりのリクエスト数
+        :type rate: float
+        :param burst: 瞬間的に許容するリクエスト数。None の場合は rate と同じ
+        :type burst: float or None
+        :param component: コンポーネント名。None の場合はサービス全体に適用する
+        :type component: str or None
+        :param target_function: ファンクション名。None の場合はコンポーネント全体に適用する
+        :type target_function: str or None
+        :param min_rate: 減速時の下限。None の場合は rate の 1/10
+        :type min_rate: float or None
+        :param max_rate: 加速時の上限。None の場合は rate
+        :type max_rate: float or None
+        """
+        key = (service, component, target_function if component is not None else None)
+        with self.__lock:
+            self.__buckets[key] = _TokenBucket(
+                rate=rate,
+                burst=burst if burst is not None else max(1.0, rate),
+                min_rate=min_rate if min_rate is not None else rate / 10.0,
+                max_rate=max_rate if max_rate is not None else rate,
+            )
+
+    def __find_bucket(self, service, component, target_function):
+        buckets = self.__buckets
+        bucket = buckets.get((service, component, target_function))
+        if bucket is None:
+            bucket = buckets.get((service, component, None))
+            if bucket is None:
+                bucket = buckets.get((service, None, None))
+        return bucket
+
+    def reserve(self, service, component, target_function, max_wait=None):
+        """
+        トークンを予約する
+        :param service: サービス名
+        :type service: str
+        :param component: コンポーネント名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param max_wait: 待つことのできる最大時間(秒)。None の場合は無制限
+        :type max_wait: float or None
+        :return: 送信までに待つ必要がある時間(秒)
+        :rtype: float
+        :raises ThrottledException: max_wait 以内にトークンを取得できない場合
+        """
+        bucket = self.__find_bucket(service, component, target_function)
+        if bucket is None:
+            return 0.0
+
+        with self.__lock:
+            bucket.refill(time.time())
+            wait = 0.0 if bucket.tokens >= 1.0 else (1.0 - bucket.tokens) / bucket.rate
+            if max_wait is not None and wait > max_wait:
+                bucket.rejected += 1
+                rate = bucket.rate
+            else:
+                bucket.tokens -= 1.0
+                bucket.granted += 1
+                return wait
+
+        from gs2_core_client.exception.ThrottledException import ThrottledException
+        raise ThrottledException(
+            'client side rate limit exceeded: {service}.{component}.{function} ({rate:.2f} req/s)'.format(
+                service=service,
+                component=component,
+                function=target_function,
+                rate=rate,
+            ))
+
+    def get_max_wait(self, mode=None, timeout=None):
+        """
+        動作モードに応じた最大待ち時間を取得する
+        :param mode: 動作モード。None の場合はコンストラクタで指定したもの
+        :type mode: str or None
+        :param timeout: deadline モードで待つ最大時間(秒)。None の場合はコンストラクタで指定したもの
+        :type timeout: float or None
+        :return: 最大待ち時間(秒)。None の場合は無制限
+        :rtype: float or None
+        """
+        mode = mode if mode is not None else self.__mode
+        if mode == self.MODE_FAIL_FAST:
+            return 0.0
+        if mode == self.MODE_DEADLINE:
+            return timeout if timeout is not None else self.__timeout
+        return None
+
+    def acquire(self, service, component, target_function, mode=None, timeout=None):
+        """
+        トークンを取得する。必要であれば取得できるまで待つ
+        :param service: サービス名
+        :type service: str
+        :param component: コンポーネント名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param mode: 動作モード。None の場合はコンストラクタで指定したもの
+        :type mode: str or None
+        :param timeout: deadline モードで待つ最大時間(秒)
+        :type timeout: float or None
+        :raises ThrottledException: トークンを取得できない場合
+        """
+        wait = self.reserve(service, component, target_function, self.get_max_wait(mode, timeout))
+        if wait > 0:
+            time.sleep(wait)
+
+    def feedback(self, service, component, target_function, status_code):
+        """
+        レスポンスのステータスコードをもとに送信レートを調整する
+        :param service: サービス名
+        :type service: str
+        :param component: コンポーネント名
+        :type component: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :param status_code: ステータスコード
+        :type status_code: int
+        """
+        bucket = self.__find_bucket(service, component, target_function)
+        if bucket is None:
+            return
+
+        now = time.time()
+        with self.__lock:
+            if status_code in self.THROTTLED_STATUSES:
+                if now - bucket.decreased_at >= self.__decrease_interval:
+                    bucket.refill(now)
+                    bucket.rate = max(bucket.min_rate, bucket.rate * self.__decrease_factor)
+                    bucket.tokens = min(bucket.tokens, 0.0)
+                    bucket.decreased_at = bucket.increased_at = now
+            elif status_code < 400:
+                if bucket.rate < bucket.max_rate:
+                    # 前回レートを調整してからの経過時間に比例して引き上げる。成功の回数には依存しない
+                    bucket.refill(now)
+                    elapsed = max(0.0, now - bucket.increased_at)
+                    bucket.rate = min(bucket.max_rate, bucket.rate + self.__increase_step * elapsed)
+                bucket.increased_at = now
+
+    def get_stats(self):
+        """
+        統計情報を取得する
+        :return: (service, component, function) をキーとした現在のレート、残りトークン数、許可数、拒否数
+        :rtype: dict[tuple, dict]
+        """
+        with self.__lock:
+            return dict(
+                (key, {
+                    'rate': bucket.rate,
+                    'tokens': bucket.tokens,
+                    'granted': bucket.granted,
+                    'rejected': bucket.rejected,
+                })
+                for key, bucket in self.__buckets.items()
+            )
@@ -0,0 +1,211 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class Gs2ResponseCache(object):
+
+    def __init__(self, max_entries=1024, max_bytes=16 * 1024 * 1024, default_ttl=None,
+                 vary_headers=('X-GS2-ACCESS-TOKEN',)):
+        """
+        GETリクエストのレスポンスキャッシュ
+        TTL が設定されたサービス/ファンクションのレスポンスだけを保持し、エントリ数とバイト数の上限を超えると
+        最も長く参照されていないものから破棄する
+        :param max_entries: 保持するエントリ数の上限
+        :type max_entries: int
+        :param max_bytes: 保持するレスポンスボディの合計バイト数の上限
+        :type max_bytes: int
+        :param default_ttl: TTL が設定されていないサービス/ファンクションに適用する有効期間(秒)。None の場合はキャッシュしない
+        :type default_ttl: float or None
+        :param vary_headers: キャッシュキーに含めるリクエストヘッダ
+        :type vary_headers: tuple[str]
+        """
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__default_ttl = default_ttl
+        self.__vary_headers = tuple(vary_headers)
+        self.__ttls = {}
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        self.__keys_by_url = {}
+        self.__bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+        self.__invalidations = 0
+
+    def set_ttl(self, service, ttl, target_function=None):
+        """
+        有効期間を設定する
+        :param service: サービス名
+        :type service: str
+        :param ttl: 有効期間(秒)。None の場合は設定を削除する
+        :type ttl: float or None
+        :param target_function: ファンクション名。None の場合はサービス全体に適用する
+        :type target_function: str or None
+        """
+        with self.__lock:
+            if ttl is None:
+                self.__ttls.pop((service, target_function), None)
+            else:
+                self.__ttls[(service, target_function)] = ttl
+
+    def get_ttl(self, service, target_function):
+        """
+        有効期間を取得する。ファンクション単位の設定、サービス単位の設定、default_ttl の順に参照する
+        :param service: サービス名
+        :type service: str
+        :param target_function: ファンクション名
+        :type target_function: str
+        :return: 有効期間(秒)。キャッシュしない場合は None
+        :rtype: float or None
+        """
+        ttls = self.__ttls
+        ttl = ttls.get((service, target_function))
+        if ttl is None:
+            ttl = ttls.get((service, None), self.__default_ttl)
+        return ttl
+
+    def make_key(self, credential, url, query_strings, headers):
+        """
+        キャッシュキーを生成する
+        :param credential: 認証情報
+        :type credential: gs2_core_client.model.IGs2Credential.IGs2Credential
+        :param url: URL
+        :type url: str
+        :param query_strings: クエリストリング
+        :type query_strings: dict or None
+        :param headers: リクエストヘッダ
+        :type headers: dict or None
+        :return: キャッシュキー
+        :rtype: tuple
+        """
+        return (
+            credential.get_identity(),
+            url,
+            tuple(sorted(
+                (name, tuple(value) if isinstance(value, list) else value)
+                for name, value in query_strings.items()
+            )) if query_strings else (),
+            tuple(headers.get(name) for name in self.__vary_headers) if headers else (),
+        )
+
+    def get(self, key):
+        """
+        キャッシュされたレスポンスボディを取得する
+        :param key: キャッシュキー
+        :type key: tuple
+        :return: レスポンスボディ。キャッシュされていないか期限切れの場合は None
+        :rtype: bytes or None
+        """
+        now = time.time()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return None
+            expire_at, url, content = entry
+            if expire_at <= now:
+                self.__remove(key)
+                self.__expirations += 1
+                self.__misses += 1
+                return None
+            self.__entries[key] = self.__entries.pop(key)
+            self.__hits += 1
+            return content
+
+    def put(self, key, url, content, ttl):
+        """
+        レスポンスボディをキャッシュする
+        :param key: キャッシュキー
+        :type key: tuple
+        :param url: URL(クエリストリングを含まない)
+        :type url: str
+        :param content: レスポンスボディ
+        :type content: bytes
+        :param ttl: 有効期間(秒)
+        :type ttl: float
+        """
+        if len(content) > self.__max_bytes:
+            return
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = (time.time() + ttl, url, content)
+            self.__keys_by_url.setdefault(url, set()).add(key)
+            self.__bytes += len(content)
+            while len(self.__entries) > self.__max_entries or self.__bytes > self.__max_bytes:
+                self.__remove(next(iter(self.__entries)))
+                self.__evictions += 1
+
+    def invalidate(self, url):
+        """
+        リソースに対するキャッシュを破棄する
+        URL が一致するものに加えて、パスの上位または下位にあたるリソースのキャッシュも破棄する
+        :param url: 更新したリソースの URL(クエリストリングを含まない)
+        :type url: str
+        """
+        url = url.rstrip('/')
+        with self.__lock:
+            targets = [
+                cached_url for cached_url in self.__keys_by_url
+                if cached_url == url
+                or cached_url.startswith(url + '/')
+                or url.startswith(cached_url.rstrip('/') + '/')
+            ]
+            for cached_url in targets:
+                for key in list(self.__keys_by_url.get(cached_url, ())):
+                    self.__remove(key)
+                    self.__invalidations += 1
+
+    def clear(self):
+        """
+        すべてのキャッシュを破棄する
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__keys_by_url.clear()
+            self.__bytes = 0
+
+    def get_stats(self):
+        """
+        統計情報を取得する
+        :return: 統計情報 (hits, misses, evictions, expirations, invalidations, entries, bytes)
+        :rtype: dict
+        """
+        with self.__lock:
+            return {
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'evictions': self.__evictions,
+                'expirations': self.__expirations,
+                'invalidations': self.__invalidations,
+                'entries': len(self.__entries),
+                'bytes': self.__bytes,
+            }
+
+    def __remove(self, key):
+        expire_at, url, content = self.__entries.pop(key)
+        self.__bytes -= len(content)
+        keys = self.__keys_by_url.get(url)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.__keys_by_url[url]
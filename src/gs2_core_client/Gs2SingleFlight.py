@@ -0,0 +1,131 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import threading
+
+from gs2_core_client.fast_requests.deadline import DeadlineExceededError, get_remaining
+
+
+class _Call(object):
+
+    def __init__(self):
+        """
+        実行中の呼び出し
+        """
+        self.event = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class Gs2SingleFlight(object):
+
+    def __init__(self):
+        """
+        同じキーに対する同時実行中の呼び出しを1回にまとめる
+        後から来た呼び出しは先行する呼び出しの完了を待ち、その結果または例外を受け取る
+        """
+        self.__lock = threading.Lock()
+        self.__calls = {}
+        # asyncio 版のクライアントが実行中の呼び出し。キーをイベントループとの組にして Future を保持する
+        self.__futures = {}
+        self.__executed = 0
+        self.__shared = 0
+
+    def do(self, key, func, deadline=None):
+        """
+        呼び出しを実行する。同じキーの呼び出しが実行中の場合はその完了を待って結果を共有する
+        :param key: キー
+        :type key: tuple
+        :param func: 実行する関数
+        :type func: () -> object
+        :param deadline: 実行中の呼び出しの完了を待つ期限(エポック秒)。None の場合は期限なし
+        :type deadline: float or None
+        :return: 関数の戻り値
+        :rtype: object
+        :raises DeadlineExceededError: 実行中の呼び出しが期限までに完了しなかった場合
+        """
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.__calls[key] = call
+                self.__executed += 1
+            else:
+                self.__shared += 1
+
+        if not leader:
+            if deadline is None:
+                call.event.wait()
+            elif not call.event.wait(get_remaining(deadline)):
+                # 先行する呼び出しのリトライを待ち続けず、自身の期限で打ち切る
+                raise DeadlineExceededError('deadline exceeded')
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.event.set()
+
+    def join(self, key, create_future):
+        """
+        asyncio 版のクライアントが呼び出す。同じキーで実行中の Future を取得し、なければ新しく登録する
+        新しく登録した場合は呼び出し元が実行し、完了後に leave() を呼び出すこと
+        :param key: キー。Future は作成したイベントループでしか待てないため、イベントループを含めること
+        :type key: tuple
+        :param create_future: Future を生成する関数
+        :type create_future: () -> asyncio.Future
+        :return: (Future, 呼び出し元が実行するか)
+        :rtype: (asyncio.Future, bool)
+        """
+        with self.__lock:
+            future = self.__futures.get(key)
+            if future is not None:
+                self.__shared += 1
+                return future, False
+            future = self.__futures[key] = create_future()
+            self.__executed += 1
+            return future, True
+
+    def leave(self, key):
+        """
+        join() で登録した Future の実行を終える
+        :param key: キー
+        :type key: tuple
+        """
+        with self.__lock:
+            del self.__futures[key]
+
+    def get_stats(self):
+        """
+        統計情報を取得する
+        :return: 統計情報 (executed: 実際に実行した回数, shared: 結果を共有した回数, in_flight: 実行中の呼び出し数)
+        :rtype: dict
+        """
+        with self.__lock:
+            return {
+                'executed': self.__executed,
+                'shared': self.__shared,
+                'in_flight': len(self.__calls) + len(self.__futures),
+            }
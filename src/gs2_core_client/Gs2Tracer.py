@@ -0,0 +1,282 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import random
+import threading
+import time
+
+
+class Gs2Span(object):
+
+    def __init__(self, tracer, name, trace_id, span_id, parent_span_id=None):
+        """
+        GS2 API 呼び出し1回分のスパン
+        :param tracer: スパンを生成したトレーサー
+        :type tracer: Gs2Tracer
+        :param name: スパン名
+        :type name: str
+        :param trace_id: トレースID(32桁の16進数)
+        :type trace_id: str
+        :param span_id: スパンID(16桁の16進数)
+        :type span_id: str
+        :param parent_span_id: 親スパンのID
+        :type parent_span_id: str or None
+        """
+        self.__tracer = tracer
+        self.__name = name
+        self.__trace_id = trace_id
+        self.__span_id = span_id
+        self.__parent_span_id = parent_span_id
+        self.__start_time = time.time()
+        self.__end_time = None
+        self.__attributes = {}
+        self.__error = None
+
+    def get_name(self):
+        """
+        スパン名を取得
+        :return: スパン名
+        :rtype: str
+        """
+        return self.__name
+
+    def get_trace_id(self):
+        """
+        トレースIDを取得
+        :return: トレースID
+        :rtype: str
+        """
+        return self.__trace_id
+
+    def get_span_id(self):
+        """
+        スパンIDを取得
+        :return: スパンID
+        :rtype: str
+        """
+        return self.__span_id
+
+    def get_parent_span_id(self):
+        """
+        親スパンのIDを取得
+        :return: 親スパンのID
+        :rtype: str or None
+        """
+        return self.__parent_span_id
+
+    def get_start_time(self):
+        """
+        開始時刻を取得
+        :return: 開始時刻(UNIX時間)
+        :rtype: float
+        """
+        return self.__start_time
+
+    def get_end_time(self):
+        """
+        終了時刻を取得
+        :return: 終了時刻(UNIX時間)。終了していない場合は None
+        :rtype: float or None
+        """
+        return self.__end_time
+
+    def get_duration(self):
+        """
+        所要時間を取得
+        :return: 所要時間(秒)。終了していない場合は None
+        :rtype: float or None
+        """
+        if self.__end_time is None:
+            return None
+        return self.__end_time - self.__start_time
+
+    def get_attributes(self):
+        """
+        属性を取得
+        :return: 属性
+        :rtype: dict
+        """
+        return self.__attributes
+
+    def set_attribute(self, key, value):
+        """
+        属性を設定
+        :param key: 属性名
+        :type key: str
+        :param value: 値
+        :type value: str or int or float or bool
+        """
+        self.__attributes[key] = value
+
+    def get_error(self):
+        """
+        呼び出しを失敗させた例外を取得
+        :return: 例外。成功した場合は None
+        :rtype: BaseException or None
+        """
+        return self.__error
+
+    def record_exception(self, exception):
+        """
+        呼び出しを失敗させた例外を記録する
+        :param exception: 例外
+        :type exception: BaseException
+        """
+        self.__error = exception
+        self.__attributes['error.type'] = type(exception).__name__
+
+    def get_traceparent(self):
+        """
+        W3C Trace Context の traceparent ヘッダの値を取得
+        :return: traceparent
+        :rtype: str
+        """
+        return '00-{trace_id}-{span_id}-01'.format(trace_id=self.__trace_id, span_id=self.__span_id)
+
+    def end(self):
+        """
+        スパンを終了し、トレーサーに登録されたエクスポーターに渡す。2回目以降の呼び出しは無視する
+        """
+        if self.__end_time is not None:
+            return
+        self.__end_time = time.time()
+        self.__tracer._export(self)
+
+
+def _parse_traceparent(traceparent):
+    """
+    traceparent ヘッダの値をパースする
+    :param traceparent: traceparent
+    :type traceparent: str
+    :return: (トレースID, 親スパンのID, サンプリング対象か)。不正な値の場合は None
+    :rtype: (str, str, bool) or None
+    """
+    parts = traceparent.strip().split('-')
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == '0' * 32 or parts[2] == '0' * 16:
+        return None
+    return parts[1].lower(), parts[2].lower(), bool(flags & 0x01)
+
+
+class Gs2Tracer(object):
+
+    TRACEPARENT_HEADER = 'traceparent'
+
+    def __init__(self, sample_rate=1.0, context_provider=None):
+        """
+        GS2 API 呼び出しのトレーサー
+        サンプリング対象の呼び出しごとにスパンを生成し、traceparent ヘッダでトレースコンテキストを伝搬する
+        終了したスパンは add_exporter で登録したエクスポーターに渡される
+        サンプリング対象外の呼び出しではスパンを生成しないため、ほとんどオーバーヘッドがない
+        :param sample_rate: 親スパンがない場合にサンプリングする割合(0.0 - 1.0)
+        :type sample_rate: float
+        :param context_provider: 呼び出し元の処理中のスパンの traceparent を返す関数
+                                 親スパンがある場合はそのサンプリング判定に従い、親スパンの子としてスパンを生成する
+        :type context_provider: (() -> str or None) or None
+        """
+        self.__sample_rate = sample_rate
+        self.__context_provider = context_provider
+        self.__exporters = []
+        self.__lock = threading.Lock()
+        self.__started = 0
+        self.__dropped = 0
+        self.__export_errors = 0
+
+    def add_exporter(self, exporter):
+        """
+        終了したスパンを受け取るエクスポーターを登録する
+        エクスポーターは API を呼び出したスレッドで実行されるため、時間のかかる処理は別スレッドに委ねること
+        :param exporter: エクスポーター
+        :type exporter: (Gs2Span) -> None
+        """
+        with self.__lock:
+            self.__exporters = self.__exporters + [exporter]
+
+    def start_span(self, name, headers=None):
+        """
+        スパンを開始する。サンプリング対象外の場合は None を返す
+        headers を指定すると traceparent ヘッダを設定する
+        :param name: スパン名
+        :type name: str
+        :param headers: リクエストヘッダ
+        :type headers: dict or None
+        :return: スパン
+        :rtype: Gs2Span or None
+        """
+        parent = None
+        if self.__context_provider is not None:
+            traceparent = self.__context_provider()
+            if traceparent:
+                parent = _parse_traceparent(traceparent)
+
+        if parent is None:
+            sampled = self.__sample_rate >= 1.0 or random.random() < self.__sample_rate
+        else:
+            sampled = parent[2]
+
+        if not sampled:
+            with self.__lock:
+                self.__dropped += 1
+            if parent is not None and headers is not None:
+                headers[self.TRACEPARENT_HEADER] = '00-{trace_id}-{span_id}-00'.format(
+                    trace_id=parent[0], span_id=parent[1])
+            return None
+
+        with self.__lock:
+            self.__started += 1
+        span = Gs2Span(
+            tracer=self,
+            name=name,
+            trace_id=parent[0] if parent is not None else '%032x' % random.getrandbits(128),
+            span_id='%016x' % random.getrandbits(64),
+            parent_span_id=parent[1] if parent is not None else None,
+        )
+        if headers is not None:
+            headers[self.TRACEPARENT_HEADER] = span.get_traceparent()
+        return span
+
+    def _export(self, span):
+        """
+        終了したスパンをエクスポーターに渡す
+        :param span: スパン
+        :type span: Gs2Span
+        """
+        for exporter in self.__exporters:
+            try:
+                exporter(span)
+            except Exception:
+                with self.__lock:
+                    self.__export_errors += 1
+
+    def get_stats(self):
+        """
+        統計情報を取得する
+        :return: 統計情報 (started, dropped, export_errors)
+        :rtype: dict
+        """
+        with self.__lock:
+            return {
+                'started': self.__started,
+                'dropped': self.__dropped,
+                'export_errors': self.__export_errors,
+            }
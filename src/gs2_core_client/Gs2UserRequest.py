@@ -14,11 +14,13 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
-from gs2_core_client.Gs2BasicRequest import Gs2BasicRequest
+from gs2_core_client.Gs2BasicRequest import Gs2BasicRequest, _text_types
 
 
 class Gs2UserRequest(Gs2BasicRequest):
 
+    __slots__ = ('__access_token',)
+
     def __init__(self, params=None):
         """
         コンストラクタ
@@ -26,10 +28,26 @@ class Gs2UserRequest(Gs2BasicRequest):
         :type params: dict|None
         """
         super(Gs2UserRequest, self).__init__(params)
-        if params is None:
-            self.__access_token = None
-        else:
-            self.set_access_token(params['X-GS2-ACCESS-TOKEN'] if 'X-GS2-ACCESS-TOKEN' in params.keys() else None)
+        self.__access_token = None
+        if params:
+            access_token = params.get('X-GS2-ACCESS-TOKEN')
+            if access_token is not None:
+                if not isinstance(access_token, _text_types):
+                    raise TypeError()
+                self.__access_token = access_token
+
+    def to_headers(self, headers=None):
+        """
+        設定されている値をリクエストヘッダに書き込む。値が設定されていない項目は書き込まない
+        :param headers: 書き込み先のリクエストヘッダ。None の場合は新しく生成する
+        :type headers: dict or None
+        :return: リクエストヘッダ
+        :rtype: dict
+        """
+        headers = super(Gs2UserRequest, self).to_headers(headers)
+        if self.__access_token is not None:
+            headers['X-GS2-ACCESS-TOKEN'] = self.__access_token
+        return headers
 
     def get_access_token(self):
         """
@@ -45,7 +63,7 @@ class Gs2UserRequest(Gs2BasicRequest):
         :param access_token: GS2クライアントID
         :type access_token: unicode
         """
-        if not isinstance(access_token, str) and not isinstance(access_token, unicode) and access_token is not None:
+        if access_token is not None and not isinstance(access_token, _text_types):
             raise TypeError()
         self.__access_token = access_token
 
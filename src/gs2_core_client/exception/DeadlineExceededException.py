@@ -0,0 +1,22 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+from gs2_core_client.exception.RequestTimeoutException import RequestTimeoutException
+
+
+class DeadlineExceededException(RequestTimeoutException):
+
+    def __init__(self, message, status_code=None, headers=None, request_id=None):
+        super(DeadlineExceededException, self).__init__(message, status_code, headers, request_id)
@@ -17,30 +17,62 @@
 from gs2_core_client.model.RequestError import RequestError
 
 
-class Gs2Exception(IOError):
+def _parse_errors(message):
+    """
+    レスポンスボディからエラー一覧を取り出す
+    :param message: レスポンスボディ
+    :type message: unicode
+    :return: エラー一覧
+    :rtype: list[RequestError]
+    """
+    result = []
+    if not message:
+        return result
+    if message[0].isspace():
+        message = message.lstrip()
+    if message[:1] != '{':
+        return result
 
-    def __init__(self, message):
-        super(Gs2Exception, self).__init__(message)
+    from gs2_core_client.fast_requests import json_codec
 
-        self.__errors = []
+    try:
+        body = json_codec.loads(message)
+        errors = json_codec.loads(body['message']) if isinstance(body, dict) else None
+    except (ValueError, KeyError, TypeError):
+        return result
 
-        errors = None
+    if isinstance(errors, list):
+        for error in errors:
+            if isinstance(error, dict):
+                try:
+                    result.append(RequestError(component=error['component'], message=error['message']))
+                except (ValueError, KeyError):
+                    pass
+    return result
 
-        try:
-            import json
-            _ = json.loads(message)
-            if isinstance(_, dict):
-                errors = json.loads(_['message'])
-        except ValueError:
-            pass
 
-        if isinstance(errors, list):
-            for error in errors:
-                if isinstance(error, dict):
-                    try:
-                        self.__errors.append(RequestError(component=error['component'], message=error['message']))
-                    except ValueError:
-                        pass
+class Gs2Exception(IOError):
+
+    def __init__(self, message, status_code=None, headers=None, request_id=None):
+        """
+        コンストラクタ
+        エラー一覧はレスポンスボディのまま保持し、get_errors() を最初に呼び出した時点で解析する
+        :param message: メッセージ(レスポンスボディ)
+        :type message: unicode
+        :param status_code: ステータスコード
+        :type status_code: int or None
+        :param headers: レスポンスヘッダ
+        :type headers: dict or None
+        :param request_id: リクエストID
+        :type request_id: str or None
+        """
+        super(Gs2Exception, self).__init__(message)
+
+        self.__message = message
+        self.__errors = None
+        self.__status_code = status_code
+        self.__headers = headers
+        self.__request_id = request_id
 
     def get_errors(self):
         """
@@ -48,8 +80,36 @@ class Gs2Exception(IOError):
         :return: エラー一覧
         :rtype: list[RequestError]
         """
+        if self.__errors is None:
+            self.__errors = _parse_errors(self.__message)
         return self.__errors
 
+    def get_status_code(self):
+        """
+        ステータスコードを取得する
+        :return: ステータスコード。HTTP レスポンスによらない例外の場合は None
+        :rtype: int or None
+        """
+        return self.__status_code
+
+    def get_headers(self):
+        """
+        レスポンスヘッダを取得する
+        :return: レスポンスヘッダ。HTTP レスポンスによらない例外の場合は None
+        :rtype: dict or None
+        """
+        return self.__headers
+
+    def get_request_id(self):
+        """
+        リクエストIDを取得する
+        :return: リクエストID
+        :rtype: str or None
+        """
+        if self.__request_id is None and self.__headers:
+            return self.__headers.get('x-gs2-request-id')
+        return self.__request_id
+
     def __getitem__(self, key):
         if key == 'errors':
             return self.get_errors()
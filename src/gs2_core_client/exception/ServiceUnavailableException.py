@@ -18,5 +18,5 @@ from gs2_core_client.exception.Gs2Exception import Gs2Exception
 
 class ServiceUnavailableException(Gs2Exception):
 
-    def __init__(self, message):
-        super(ServiceUnavailableException, self).__init__(message)
+    def __init__(self, message, status_code=None, headers=None, request_id=None):
+        super(ServiceUnavailableException, self).__init__(message, status_code, headers, request_id)
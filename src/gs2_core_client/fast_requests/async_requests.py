@@ -0,0 +1,936 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# asyncio 版の HTTP クライアント (Python 3.5 以降でのみ利用可能)
+
+import asyncio
+import collections
+import os
+import ssl
+import time
+import weakref
+
+from gs2_core_client.fast_requests.requests import HttpResponse, ResponseTooLargeError, _to_query_string, _add_timing, \
+    _get_decompress_limit, _get_attempt_delay
+from gs2_core_client.fast_requests.headers import ResponseHeaders
+from gs2_core_client.fast_requests.endpoint import split_url
+from gs2_core_client.fast_requests import json_codec
+from gs2_core_client.fast_requests.compression import create_decoder
+from gs2_core_client.fast_requests.retry import DEFAULT_RETRY_POLICY
+from gs2_core_client.fast_requests.tls import TlsStats, create_session_resuming_context
+from gs2_core_client.fast_requests.deadline import DeadlineExceededError, get_remaining, is_expired, fits
+from gs2_core_client.fast_requests.pool import PoolExhaustedError
+
+
+class _Connection(object):
+
+    def __init__(self, reader, writer, connect_time=0.0):
+        """
+        asyncio のストリームで張った HTTP コネクション
+        :param reader: 受信ストリーム
+        :type reader: asyncio.StreamReader
+        :param writer: 送信ストリーム
+        :type writer: asyncio.StreamWriter
+        :param connect_time: 接続に要した時間(秒)。HTTPS の場合は TLS ハンドシェイクを含む
+        :type connect_time: float
+        """
+        self.reader = reader
+        self.writer = writer
+        self.connect_time = connect_time
+        self.session_saved = False
+        # 送信中のリクエストに対するステータス行を受信したか。受信後の失敗はリクエストが処理された可能性がある
+        self.response_started = False
+
+    def is_reusable(self):
+        """
+        キープアライブで再利用可能か
+        :return: 再利用可能か
+        :rtype: bool
+        """
+        return not self.reader.at_eof() and not self.writer.transport.is_closing()
+
+    def close(self):
+        """
+        コネクションを閉じる
+        """
+        try:
+            self.writer.close()
+        except RuntimeError:
+            # イベントループが既に閉じられている
+            pass
+
+
+class _AsyncConnectionPool(object):
+
+    def __init__(self, loop, factory, max_size=100, block=True, block_timeout=None):
+        """
+        イベントループ・ホスト単位のコネクションプール
+        pool.ConnectionPool の asyncio 版。プールの操作はすべて作成したイベントループ上で行う
+        :param loop: プールを作成したイベントループ
+        :type loop: asyncio.AbstractEventLoop
+        :param factory: コネクションを接続するコルーチン関数
+        :type factory: () -> _Connection
+        :param max_size: プールが保持するコネクションの最大数
+        :type max_size: int
+        :param block: プールに空きがない場合に返却を待つか。False の場合は即座に PoolExhaustedError を送出する
+        :type block: bool
+        :param block_timeout: 返却を待つ最大時間(秒)。None の場合は無制限に待つ
+        :type block_timeout: float or None
+        """
+        self.__loop = loop
+        self.__factory = factory
+        self.__max_size = max_size
+        self.__block = block
+        self.__block_timeout = block_timeout
+        self.__waiters = collections.deque()
+        self.__idle = []
+        self.__in_use = 0
+        self.__created = 0
+        self.__reused = 0
+
+    def __notify(self):
+        """
+        返却を待っているコルーチンをひとつ起こす
+        """
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def __notify_all(self):
+        """
+        返却を待っているコルーチンをすべて起こす
+        """
+        waiters, self.__waiters = self.__waiters, collections.deque()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def configure(self, max_size=None, block=None, block_timeout=None):
+        """
+        プールの設定を変更する。他のスレッドから呼び出してもよい
+        :param max_size: プールが保持するコネクションの最大数
+        :type max_size: int or None
+        :param block: プールに空きがない場合に返却を待つか
+        :type block: bool or None
+        :param block_timeout: 返却を待つ最大時間(秒)
+        :type block_timeout: float or None
+        """
+        if max_size is not None:
+            self.__max_size = max_size
+        if block is not None:
+            self.__block = block
+        self.__block_timeout = block_timeout
+        if not self.__loop.is_closed():
+            self.__loop.call_soon_threadsafe(self.__notify_all)
+
+    async def checkout(self, timeout=None, connect_timeout=None):
+        """
+        コネクションを借り受ける
+        :param timeout: 返却を待つ最大時間(秒)。block_timeout より短い場合はこちらを優先する
+        :type timeout: float or None
+        :param connect_timeout: 新しく接続する場合のタイムアウト時間(秒)
+        :type connect_timeout: float or None
+        :return: (コネクション, 再利用したコネクションか)
+        :rtype: (_Connection, bool)
+        """
+        deadline = None
+        block_timeout = self.__block_timeout
+        if timeout is not None and (block_timeout is None or timeout < block_timeout):
+            block_timeout = timeout
+        while True:
+            while self.__idle:
+                connection = self.__idle.pop()
+                if connection.is_reusable():
+                    self.__in_use += 1
+                    self.__reused += 1
+                    return connection, True
+                connection.close()
+            if self.__in_use < self.__max_size:
+                self.__in_use += 1
+                self.__created += 1
+                break
+            if not self.__block:
+                raise PoolExhaustedError('connection pool is exhausted')
+            remaining = None
+            if block_timeout is not None:
+                if deadline is None:
+                    deadline = time.time() + block_timeout
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise PoolExhaustedError('timed out waiting for a pooled connection')
+            waiter = self.__loop.create_future()
+            self.__waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except BaseException as e:
+                # 起こされた直後にタイムアウトまたはキャンセルされた場合は、空きを他の待機者に譲る
+                if waiter.done() and not waiter.cancelled():
+                    self.__notify()
+                if isinstance(e, asyncio.TimeoutError):
+                    raise PoolExhaustedError('timed out waiting for a pooled connection')
+                raise
+            finally:
+                if waiter in self.__waiters:
+                    self.__waiters.remove(waiter)
+
+        try:
+            return await asyncio.wait_for(self.__factory(), connect_timeout), False
+        except BaseException:
+            self.__in_use -= 1
+            self.__created -= 1
+            self.__notify()
+            raise
+
+    def checkin(self, connection):
+        """
+        借り受けたコネクションを再利用可能な状態で返却する
+        :param connection: コネクション
+        :type connection: _Connection
+        """
+        self.__in_use -= 1
+        if len(self.__idle) + self.__in_use < self.__max_size and connection.is_reusable():
+            self.__idle.append(connection)
+        else:
+            connection.close()
+        self.__notify()
+
+    def discard(self, connection):
+        """
+        借り受けたコネクションを破棄する
+        :param connection: コネクション
+        :type connection: _Connection
+        """
+        self.__in_use -= 1
+        connection.close()
+        self.__notify()
+
+    def clear(self):
+        """
+        待機中のコネクションをすべて閉じる。貸出中のコネクションは返却時に通常通り扱われる
+        """
+        idle, self.__idle = self.__idle, []
+        for connection in idle:
+            connection.close()
+
+    def get_stats(self):
+        """
+        プールの統計情報を取得する
+        :return: 統計情報 (in_use, idle, created, reused, max_size)
+        :rtype: dict
+        """
+        return {
+            'in_use': self.__in_use,
+            'idle': len(self.__idle),
+            'created': self.__created,
+            'reused': self.__reused,
+            'max_size': self.__max_size,
+        }
+
+
+# イベントループごとのコネクションプール。コネクションは作成したイベントループでしか使えないため、
+# asyncio.run() を繰り返す場合などに閉じたイベントループのコネクションを再利用しないようにする
+_connection_pools = weakref.WeakKeyDictionary()
+
+_pool_options = {
+    'max_size': 100,
+    'block': True,
+    'block_timeout': None,
+}
+
+_ssl_context = None
+
+_tls_stats = TlsStats()
+
+# コネクションプールを作成したプロセスの ID。fork した子プロセスでは親プロセスのコネクションを使わない
+_pid = os.getpid()
+
+
+def _get_ssl_context():
+    """
+    HTTPS 接続に使用する SSLContext を取得する。すべてのコネクションで同じ SSLContext を共有し、
+    ホストごとに TLS セッションを保持して再接続時のハンドシェイクを省略する
+    :return: SSLContext
+    :rtype: gs2_core_client.fast_requests.tls.SessionResumingContext
+    """
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = create_session_resuming_context()
+    return _ssl_context
+
+
+def get_tls_stats():
+    """
+    TLS ハンドシェイクの統計情報を取得する
+    :return: 統計情報 (handshakes, full, resumed)
+    :rtype: dict
+    """
+    return _tls_stats.get_stats()
+
+
+def _reset_after_fork():
+    """
+    fork した子プロセスで、親プロセスから引き継いだコネクションプールを破棄する
+    親プロセスのイベントループに属するコネクションは子プロセスでは使えないため、閉じずに参照を手放す
+    """
+    global _pid, _connection_pools
+
+    _pid = os.getpid()
+    _connection_pools = weakref.WeakKeyDictionary()
+    _tls_stats.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def reset_pool():
+    """
+    コネクションプールを作り直す。プリフォーク型のサーバーでは fork 後のワーカーの初期化処理で呼び出す
+    fork はプロセス ID の変化と os.register_at_fork でも自動的に検出する
+    fork した子プロセスでは親プロセスのコネクションを閉じずに破棄し、同じプロセスでは待機中のコネクションを閉じる
+    """
+    global _connection_pools
+
+    if _pid != os.getpid():
+        _reset_after_fork()
+        return
+
+    pools, _connection_pools = list(_connection_pools.values()), weakref.WeakKeyDictionary()
+    for pool in pools:
+        for host_pool in pool.values():
+            host_pool.clear()
+
+
+def _get_pool(endpoint):
+    """
+    実行中のイベントループのエンドポイントに対応するコネクションプールを取得する
+    :param endpoint: エンドポイント
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint
+    :return: コネクションプール
+    :rtype: _AsyncConnectionPool
+    """
+    if _pid != os.getpid():
+        _reset_after_fork()
+    loop = asyncio.get_event_loop()
+    pools = _connection_pools.get(loop)
+    if pools is None:
+        # 閉じたイベントループが参照され続けている場合に備え、そのコネクションもここで手放す
+        for closed in [other for other in _connection_pools.keys() if other.is_closed()]:
+            del _connection_pools[closed]
+        pools = _connection_pools[loop] = {}
+    pool = pools.get(endpoint.pool_key)
+    if pool is None:
+        pool = pools[endpoint.pool_key] = _AsyncConnectionPool(
+            loop,
+            factory=lambda: _open_connection(endpoint),
+            **_pool_options
+        )
+    return pool
+
+
+async def _open_connection(endpoint):
+    """
+    エンドポイントに新しく接続する
+    :param endpoint: エンドポイント
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint
+    :return: コネクション
+    :rtype: _Connection
+    """
+    started_at = time.time()
+    reader, writer = await asyncio.open_connection(
+        endpoint.host,
+        endpoint.port,
+        ssl=_get_ssl_context() if endpoint.secure else None,
+    )
+    connection = _Connection(reader, writer, time.time() - started_at)
+    if endpoint.secure:
+        ssl_object = writer.get_extra_info('ssl_object')
+        _tls_stats.record(ssl_object is not None and ssl_object.session_reused)
+    return connection
+
+
+def _checkin_connection(pool, endpoint, connection):
+    """
+    コネクションをプールに返却する
+    :param pool: コネクションを借り受けたプール
+    :type pool: _AsyncConnectionPool
+    :param endpoint: エンドポイント
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint
+    :param connection: コネクション
+    :type connection: _Connection
+    """
+    if endpoint.secure and not connection.session_saved:
+        # TLS 1.3 のセッションチケットはハンドシェイク後に届くため、レスポンスを受信した後に保持する
+        context = _get_ssl_context()
+        ssl_object = connection.writer.get_extra_info('ssl_object')
+        if ssl_object is not None and hasattr(context, 'remember_session'):
+            context.remember_session(endpoint.host, ssl_object)
+        connection.session_saved = True
+
+    pool.checkin(connection)
+
+
+def _purge_connection_cache(url):
+    key = split_url(url)[0].pool_key
+    for pools in list(_connection_pools.values()):
+        pool = pools.get(key)
+        if pool is not None:
+            pool.clear()
+
+
+def configure_pool(max_size=100, block=True, block_timeout=None):
+    """
+    コネクションプールの設定を変更する。作成済みのプールにも反映される
+    :param max_size: イベントループ・ホストごとに保持するコネクションの最大数
+    :type max_size: int
+    :param block: プールに空きがない場合に返却を待つか。False の場合は即座に PoolExhaustedError を送出する
+    :type block: bool
+    :param block_timeout: 返却を待つ最大時間(秒)。None の場合は無制限に待つ
+    :type block_timeout: float or None
+    """
+    _pool_options['max_size'] = max_size
+    _pool_options['block'] = block
+    _pool_options['block_timeout'] = block_timeout
+    for pools in list(_connection_pools.values()):
+        for pool in list(pools.values()):
+            pool.configure(max_size=max_size, block=block, block_timeout=block_timeout)
+
+
+def get_pool_stats():
+    """
+    ホストごとのコネクションプールの統計情報を取得する。複数のイベントループのプールは合算する
+    :return: protocol://host:port をキーとした統計情報
+    :rtype: dict[str, dict]
+    """
+    result = {}
+    for pools in list(_connection_pools.values()):
+        for key, pool in list(pools.items()):
+            stats = pool.get_stats()
+            total = result.get(key)
+            if total is None:
+                result[key] = stats
+                continue
+            for name in ('in_use', 'idle', 'created', 'reused'):
+                total[name] += stats[name]
+    return result
+
+
+async def warm_up(endpoints, connections=1):
+    """
+    エンドポイントへのコネクションをあらかじめ張り、プールに入れておく
+    名前解決・TCP 接続・TLS ハンドシェイクはすべてのコネクションについて並行して行う
+    :param endpoints: エンドポイントのリスト
+    :type endpoints: list[gs2_core_client.fast_requests.endpoint.Endpoint]
+    :param connections: エンドポイントごとに用意するコネクション数。プールの空きを超える分は待たずに無視する
+    :type connections: int
+    :return: protocol://host:port をキーとした、用意できたコネクション数
+    :rtype: dict[str, int]
+    """
+    unique = dict((endpoint.pool_key, endpoint) for endpoint in endpoints)
+    targets = [
+        (endpoint, _get_pool(endpoint))
+        for endpoint in unique.values()
+        for _ in range(min(connections, _pool_options['max_size']))
+    ]
+    # 他のコルーチンが使用中のコネクションの返却は待たない
+    results = await asyncio.gather(
+        *[pool.checkout(0) for endpoint, pool in targets],
+        return_exceptions=True
+    )
+
+    warmed = dict((key, 0) for key in unique)
+    for (endpoint, pool), result in zip(targets, results):
+        if isinstance(result, Exception):
+            continue
+        # レスポンスを受信するまでセッションチケットが届かないため、_checkin_connection を通さずにプールへ入れる
+        pool.checkin(result[0])
+        warmed[endpoint.pool_key] += 1
+    return warmed
+
+
+def _check_body_size(size, max_body_size):
+    """
+    レスポンスボディが最大サイズを超えていないか確認する
+    :raises ResponseTooLargeError: 最大サイズを超えている場合
+    """
+    if max_body_size is not None and size > max_body_size:
+        raise ResponseTooLargeError('response body exceeds {size} bytes'.format(size=max_body_size))
+
+
+async def _read_chunked_body(reader, max_body_size=None):
+    """
+    chunked エンコーディングされたレスポンスボディを読み込む
+    :param reader: 受信ストリーム
+    :type reader: asyncio.StreamReader
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :return: レスポンスボディ
+    :rtype: bytes
+    """
+    chunks = []
+    received = 0
+    while True:
+        size_line = await reader.readline()
+        size = int(size_line.split(b';', 1)[0].strip(), 16)
+        if size == 0:
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            return b''.join(chunks)
+        received += size
+        _check_body_size(received, max_body_size)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+async def _read_until_eof(reader, max_body_size=None):
+    """
+    コネクションが閉じられるまでレスポンスボディを読み込む
+    """
+    if max_body_size is None:
+        return await reader.read()
+    chunks = []
+    received = 0
+    while True:
+        chunk = await reader.read(65536)
+        if not chunk:
+            return b''.join(chunks)
+        received += len(chunk)
+        _check_body_size(received, max_body_size)
+        chunks.append(chunk)
+
+
+async def _exchange(connection, method, path, headers, data, compression=None, timings=None, attempt=1,
+                    max_body_size=None):
+    """
+    HTTPリクエストを送信してレスポンスを受信する
+    :param connection: コネクション
+    :type connection: _Connection
+    :param method: HTTPメソッド
+    :type method: str
+    :param path: リクエストパス
+    :type path: str
+    :param headers: リクエストヘッダ
+    :type headers: dict
+    :param data: リクエストボディ
+    :type data: bytes or None
+    :param compression: HTTP 圧縮の設定
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param timings: フェーズ名をキーとした所要時間(秒)。send / ttfb / read を加算する
+    :type timings: dict[str, float] or None
+    :param attempt: 試行回数
+    :type attempt: int
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。展開後のサイズで判定する。None の場合は無制限
+    :type max_body_size: int or None
+    :return: (レスポンス, キープアライブ可能か)
+    :rtype: (HttpResponse, bool)
+    """
+    if timings is None:
+        timings = {}
+    connection.response_started = False
+
+    sent_at = time.time()
+    lines = ['{method} {path} HTTP/1.1'.format(method=method, path=path)]
+    for key, value in headers.items():
+        lines.append('{key}: {value}'.format(key=key, value=value))
+    if data is not None:
+        lines.append('Content-Length: {length}'.format(length=len(data)))
+    connection.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8'))
+    if data:
+        connection.writer.write(data)
+    await connection.writer.drain()
+
+    waited_at = time.time()
+    status_line = await connection.reader.readline()
+    if not status_line:
+        raise ConnectionResetError('connection closed by peer')
+    connection.response_started = True
+    status_code = int(status_line.split(None, 2)[1])
+
+    response_headers = {}
+    while True:
+        line = await connection.reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        response_headers[key.strip().lower()] = value.strip()
+
+    read_at = time.time()
+    keep_alive = response_headers.get('connection', '').lower() != 'close'
+    if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+        body = await _read_chunked_body(connection.reader, max_body_size)
+    elif 'content-length' in response_headers:
+        content_length = int(response_headers['content-length'])
+        _check_body_size(content_length, max_body_size)
+        body = await connection.reader.readexactly(content_length)
+    elif method == 'HEAD' or status_code in (204, 304):
+        body = b''
+    else:
+        body = await _read_until_eof(connection.reader, max_body_size)
+        keep_alive = False
+
+    if compression is not None:
+        wire_bytes = len(body)
+        decoder = create_decoder(response_headers.get('content-encoding'))
+        if decoder is not None:
+            if max_body_size is not None:
+                body = decoder.decompress(body, _get_decompress_limit(max_body_size, 0))
+                _check_body_size(len(body), max_body_size)
+                body += decoder.flush()
+                _check_body_size(len(body), max_body_size)
+            else:
+                body = decoder.decompress(body) + decoder.flush()
+        compression.stats.record_response(wire_bytes, len(body), decoder is not None)
+
+    _add_timing(timings, 'send', waited_at - sent_at)
+    _add_timing(timings, 'ttfb', read_at - waited_at)
+    _add_timing(timings, 'read', time.time() - read_at)
+
+    return HttpResponse(
+        status_code=status_code,
+        headers=ResponseHeaders(response_headers),
+        body=body,
+        timings=timings,
+        attempts=attempt,
+    ), keep_alive
+
+
+async def _request(method, url, params, headers, data, timeout, retry_policy=None, compression=None, endpoint=None,
+                   deadline=None, max_body_size=None, on_attempt=None):
+    """
+    HTTPリクエストを発行する
+    :param method: HTTPメソッド
+    :type method: str
+    :param url: URL
+    :type url: str
+    :param params: クエリストリング
+    :type params: dict
+    :param headers: リクエストヘッダ
+    :type headers: dict
+    :param data: リクエストボディ
+    :type data: bytes or None
+    :param timeout: タイムアウト時間(秒)
+    :type timeout: float
+    :param retry_policy: リトライポリシー。None の場合は DEFAULT_RETRY_POLICY
+    :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+    :param compression: HTTP 圧縮の設定。None の場合は圧縮しない
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param endpoint: 解析済みのエンドポイント。None の場合は url を解析する
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint or None
+    :param deadline: リトライを含めたリクエスト全体の期限(エポック秒)。各試行のタイムアウト時間は期限までの残り時間に縮める
+    :type deadline: float or None
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :param on_attempt: リトライする前に、失敗した試行のステータスコード(通信エラーの場合は None)を渡して呼び出す関数
+                       次の試行までに待つ必要のある時間(秒)を返す。None を返した場合はリトライしない
+    :type on_attempt: (int or None) -> float or None
+    :return: レスポンス
+    :rtype: HttpResponse
+    :raises DeadlineExceededError: 期限までにレスポンスを受信できなかった場合
+    :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
+    """
+    if retry_policy is None:
+        retry_policy = DEFAULT_RETRY_POLICY
+    if params is None:
+        params = {}
+    if headers is None:
+        headers = {}
+
+    if endpoint is None:
+        endpoint, path = split_url(url)
+    else:
+        path = endpoint.get_path(url)
+
+    headers['Host'] = endpoint.host_header
+    headers['Connection'] = 'Keep-Alive'
+
+    if params:
+        path = '{path}?{query_strings}'.format(
+            path=path,
+            query_strings=_to_query_string(params),
+        )
+
+    if compression is not None:
+        data = compression.prepare_request(headers, data)
+
+    pool = _get_pool(endpoint)
+
+    started_at = time.time()
+    timings = {}
+    attempt = 0
+    while True:
+        attempt += 1
+        connection = None
+        connected = False
+        reused = False
+        response = None
+        try:
+            try:
+                connection, reused = await pool.checkout(get_remaining(deadline), get_remaining(deadline, timeout))
+            except PoolExhaustedError:
+                if is_expired(deadline):
+                    raise DeadlineExceededError('deadline exceeded while waiting for a pooled connection')
+                raise
+            connected = True
+            if not reused:
+                _add_timing(timings, 'connect', connection.connect_time)
+            response, keep_alive = await asyncio.wait_for(
+                _exchange(connection, method, path, headers, data, compression, timings, attempt, max_body_size),
+                get_remaining(deadline, timeout),
+            )
+            if keep_alive:
+                _checkin_connection(pool, endpoint, connection)
+            else:
+                pool.discard(connection)
+        except DeadlineExceededError:
+            if connection is not None:
+                pool.discard(connection)
+            raise
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+            if connection is not None:
+                pool.discard(connection)
+            if isinstance(e, asyncio.TimeoutError) and is_expired(deadline):
+                raise DeadlineExceededError('deadline exceeded')
+            # ステータス行を受信する前に切断された場合のみ、再利用したコネクションが切れていたとみなす
+            stale = reused and not connection.response_started and \
+                isinstance(e, (ConnectionError, asyncio.IncompleteReadError))
+            if not retry_policy.is_retryable_error(method, connected, stale):
+                raise
+            delay = _get_attempt_delay(retry_policy.get_retry_delay(attempt, started_at), on_attempt, None)
+            if delay is None or not fits(deadline, delay):
+                raise
+            await asyncio.sleep(delay)
+            _add_timing(timings, 'backoff', delay)
+            continue
+        except BaseException:
+            # 途中まで受信したコネクションは再利用できない
+            if connection is not None:
+                pool.discard(connection)
+            raise
+
+        if not retry_policy.is_retryable_status(method, response.status_code):
+            return response
+        delay = _get_attempt_delay(
+            retry_policy.get_retry_delay(attempt, started_at, response.headers), on_attempt, response.status_code)
+        if delay is None or not fits(deadline, delay):
+            return response
+        await asyncio.sleep(delay)
+        _add_timing(timings, 'backoff', delay)
+
+
+def _encode_body(data, json):
+    if json is not None:
+        data = json_codec.dumps(json)
+    if data is None:
+        data = b''
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return data
+
+
+async def get(
+        url,
+        params=None,
+        headers=None,
+        timeout=60,
+        retry_policy=None,
+        compression=None,
+        endpoint=None,
+        deadline=None,
+        max_body_size=None,
+        on_attempt=None,
+):
+    """
+    GETリクエストを発行する
+    :param url: URL
+    :type url: str
+    :param params: クエリストリング
+    :type params: dict
+    :param headers: リクエストヘッダ
+    :type headers: dict
+    :param timeout: タイムアウト時間(秒)
+    :type timeout: float
+    :param retry_policy: リトライポリシー。None の場合は DEFAULT_RETRY_POLICY
+    :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+    :param compression: HTTP 圧縮の設定。None の場合は圧縮しない
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param endpoint: 解析済みのエンドポイント。指定する場合 url は endpoint.base_url で始まること
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint or None
+    :param deadline: リトライを含めたリクエスト全体の期限(エポック秒)。None の場合は試行ごとに timeout まで待つ
+    :type deadline: float or None
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :param on_attempt: リトライする前に、失敗した試行のステータスコード(通信エラーの場合は None)を渡して呼び出す関数
+                       次の試行までに待つ必要のある時間(秒)を返す。None を返した場合はリトライしない
+    :type on_attempt: (int or None) -> float or None
+    :return: レスポンス
+    :rtype: HttpResponse
+    :raises DeadlineExceededError: 期限までにレスポンスを受信できなかった場合
+    :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
+    """
+    return await _request(
+        'GET', url, params, headers, None, timeout, retry_policy, compression, endpoint, deadline, max_body_size,
+        on_attempt)
+
+
+async def post(
+        url,
+        params=None,
+        headers=None,
+        data=None,
+        json=None,
+        timeout=60,
+        retry_policy=None,
+        compression=None,
+        endpoint=None,
+        deadline=None,
+        max_body_size=None,
+        on_attempt=None,
+):
+    """
+    POSTリクエストを発行する
+    :param url: URL
+    :type url: str
+    :param params: クエリストリング
+    :type params: dict
+    :param headers: リクエストヘッダ
+    :type headers: dict
+    :param data: リクエストボディ(バイナリ)
+    :type data: bytes
+    :param json: リクエストボディ(dict またはエンコード済みの JSON)
+    :type json: dict or bytes
+    :param timeout: タイムアウト時間(秒)
+    :type timeout: float
+    :param retry_policy: リトライポリシー。None の場合は DEFAULT_RETRY_POLICY
+    :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+    :param compression: HTTP 圧縮の設定。None の場合は圧縮しない
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param endpoint: 解析済みのエンドポイント。指定する場合 url は endpoint.base_url で始まること
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint or None
+    :param deadline: リトライを含めたリクエスト全体の期限(エポック秒)。None の場合は試行ごとに timeout まで待つ
+    :type deadline: float or None
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :param on_attempt: リトライする前に、失敗した試行のステータスコード(通信エラーの場合は None)を渡して呼び出す関数
+                       次の試行までに待つ必要のある時間(秒)を返す。None を返した場合はリトライしない
+    :type on_attempt: (int or None) -> float or None
+    :return: レスポンス
+    :rtype: HttpResponse
+    :raises DeadlineExceededError: 期限までにレスポンスを受信できなかった場合
+    :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
+    """
+    data = _encode_body(data, json)
+    return await _request(
+        'POST', url, params, headers, data, timeout, retry_policy, compression, endpoint, deadline, max_body_size,
+        on_attempt)
+
+
+async def put(
+        url,
+        params=None,
+        headers=None,
+        data=None,
+        json=None,
+        timeout=60,
+        retry_policy=None,
+        compression=None,
+        endpoint=None,
+        deadline=None,
+        max_body_size=None,
+        on_attempt=None,
+):
+    """
+    PUTリクエストを発行する
+    :param url: URL
+    :type url: str
+    :param params: クエリストリング
+    :type params: dict
+    :param headers: リクエストヘッダ
+    :type headers: dict
+    :param data: リクエストボディ(バイナリ)
+    :type data: bytes
+    :param json: リクエストボディ(dict またはエンコード済みの JSON)
+    :type json: dict or bytes
+    :param timeout: タイムアウト時間(秒)
+    :type timeout: float
+    :param retry_policy: リトライポリシー。None の場合は DEFAULT_RETRY_POLICY
+    :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+    :param compression: HTTP 圧縮の設定。None の場合は圧縮しない
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param endpoint: 解析済みのエンドポイント。指定する場合 url は endpoint.base_url で始まること
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint or None
+    :param deadline: リトライを含めたリクエスト全体の期限(エポック秒)。None の場合は試行ごとに timeout まで待つ
+    :type deadline: float or None
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :param on_attempt: リトライする前に、失敗した試行のステータスコード(通信エラーの場合は None)を渡して呼び出す関数
+                       次の試行までに待つ必要のある時間(秒)を返す。None を返した場合はリトライしない
+    :type on_attempt: (int or None) -> float or None
+    :return: レスポンス
+    :rtype: HttpResponse
+    :raises DeadlineExceededError: 期限までにレスポンスを受信できなかった場合
+    :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
+    """
+    data = _encode_body(data, json)
+    return await _request(
+        'PUT', url, params, headers, data, timeout, retry_policy, compression, endpoint, deadline, max_body_size,
+        on_attempt)
+
+
+async def delete(
+        url,
+        params=None,
+        headers=None,
+        timeout=60,
+        retry_policy=None,
+        compression=None,
+        endpoint=None,
+        deadline=None,
+        max_body_size=None,
+        on_attempt=None,
+):
+    """
+    DELETEリクエストを発行する
+    :param url: URL
+    :type url: str
+    :param params: クエリストリング
+    :type params: dict
+    :param headers: リクエストヘッダ
+    :type headers: dict
+    :param timeout: タイムアウト時間(秒)
+    :type timeout: float
+    :param retry_policy: リトライポリシー。None の場合は DEFAULT_RETRY_POLICY
+    :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+    :param compression: HTTP 圧縮の設定。None の場合は圧縮しない
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param endpoint: 解析済みのエンドポイント。指定する場合 url は endpoint.base_url で始まること
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint or None
+    :param deadline: リトライを含めたリクエスト全体の期限(エポック秒)。None の場合は試行ごとに timeout まで待つ
+    :type deadline: float or None
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :param on_attempt: リトライする前に、失敗した試行のステータスコード(通信エラーの場合は None)を渡して呼び出す関数
+                       次の試行までに待つ必要のある時間(秒)を返す。None を返した場合はリトライしない
+    :type on_attempt: (int or None) -> float or None
+    :return: レスポンス
+    :rtype: HttpResponse
+    :raises DeadlineExceededError: 期限までにレスポンスを受信できなかった場合
+    :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
+    """
+    return await _request(
+        'DELETE', url, params, headers, None, timeout, retry_policy, compression, endpoint, deadline, max_body_size,
+        on_attempt)
@@ -0,0 +1,224 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import threading
+import zlib
+
+
+class _Decoder(object):
+
+    def __init__(self, encoding):
+        """
+        Content-Encoding を逐次展開するデコーダ
+        :param encoding: gzip または deflate
+        :type encoding: str
+        """
+        self.__encoding = encoding
+        if encoding == 'gzip':
+            self.__decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        else:
+            self.__decompressor = None
+
+    def decompress(self, chunk, max_length=0):
+        """
+        受信したチャンクを展開する
+        :param chunk: 受信データ
+        :type chunk: bytes
+        :param max_length: 展開するデータの最大長。0 の場合は無制限。展開しきれなかった入力は保持し、次の呼び出しで先に展開する
+        :type max_length: int
+        :return: 展開したデータ
+        :rtype: bytes
+        """
+        if self.__decompressor is not None and self.__decompressor.unconsumed_tail:
+            chunk = self.__decompressor.unconsumed_tail + chunk
+        if self.__decompressor is None:
+            # deflate は zlib ヘッダ付きと生の deflate の両方が使われているため先頭で判別する
+            self.__decompressor = zlib.decompressobj()
+            try:
+                return self.__decompressor.decompress(chunk, max_length)
+            except zlib.error:
+                self.__decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self.__decompressor.decompress(chunk, max_length)
+
+    def flush(self):
+        """
+        残りのデータを展開する
+        :return: 展開したデータ
+        :rtype: bytes
+        """
+        if self.__decompressor is None:
+            return b''
+        if self.__decompressor.unconsumed_tail:
+            return self.decompress(b'') + self.__decompressor.flush()
+        return self.__decompressor.flush()
+
+
+def create_decoder(encoding):
+    """
+    Content-Encoding に対応したデコーダを生成する
+    :param encoding: Content-Encoding ヘッダの値
+    :type encoding: str or None
+    :return: デコーダ。展開不要な場合は None
+    :rtype: _Decoder or None
+    """
+    if not encoding:
+        return None
+    encoding = encoding.strip().lower()
+    if encoding in ('gzip', 'x-gzip'):
+        return _Decoder('gzip')
+    if encoding == 'deflate':
+        return _Decoder('deflate')
+    return None
+
+
+def compress(data, encoding='gzip', level=6):
+    """
+    リクエストボディを圧縮する
+    :param data: リクエストボディ
+    :type data: bytes
+    :param encoding: gzip または deflate
+    :type encoding: str
+    :param level: 圧縮レベル
+    :type level: int
+    :return: 圧縮したリクエストボディ
+    :rtype: bytes
+    """
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    elif encoding == 'deflate':
+        compressor = zlib.compressobj(level)
+    else:
+        raise ValueError('unsupported content encoding: {encoding}'.format(encoding=encoding))
+    return compressor.compress(data) + compressor.flush()
+
+
+class CompressionStats(object):
+
+    def __init__(self):
+        """
+        圧縮による通信量の削減を集計するカウンタ
+        """
+        self.__lock = threading.Lock()
+        self.__response_wire_bytes = 0
+        self.__response_decoded_bytes = 0
+        self.__compressed_responses = 0
+        self.__request_raw_bytes = 0
+        self.__request_wire_bytes = 0
+        self.__compressed_requests = 0
+
+    def record_response(self, wire_bytes, decoded_bytes, compressed):
+        """
+        レスポンスの受信量を記録する
+        :param wire_bytes: 受信したボディのバイト数
+        :type wire_bytes: int
+        :param decoded_bytes: 展開後のボディのバイト数
+        :type decoded_bytes: int
+        :param compressed: 圧縮されていたか
+        :type compressed: bool
+        """
+        with self.__lock:
+            self.__response_wire_bytes += wire_bytes
+            self.__response_decoded_bytes += decoded_bytes
+            if compressed:
+                self.__compressed_responses += 1
+
+    def record_request(self, raw_bytes, wire_bytes, compressed):
+        """
+        リクエストの送信量を記録する
+        :param raw_bytes: 圧縮前のボディのバイト数
+        :type raw_bytes: int
+        :param wire_bytes: 送信したボディのバイト数
+        :type wire_bytes: int
+        :param compressed: 圧縮したか
+        :type compressed: bool
+        """
+        with self.__lock:
+            self.__request_raw_bytes += raw_bytes
+            self.__request_wire_bytes += wire_bytes
+            if compressed:
+                self.__compressed_requests += 1
+
+    def get_stats(self):
+        """
+        集計結果を取得する
+        :return: 集計結果
+        :rtype: dict
+        """
+        with self.__lock:
+            return {
+                'response_wire_bytes': self.__response_wire_bytes,
+                'response_decoded_bytes': self.__response_decoded_bytes,
+                'compressed_responses': self.__compressed_responses,
+                'request_raw_bytes': self.__request_raw_bytes,
+                'request_wire_bytes': self.__request_wire_bytes,
+                'compressed_requests': self.__compressed_requests,
+            }
+
+
+class CompressionConfig(object):
+
+    def __init__(
+            self,
+            accept_encoding=True,
+            request_threshold=None,
+            request_encoding='gzip',
+            level=6,
+            chunk_size=16384,
+            stats=None,
+    ):
+        """
+        HTTP 圧縮の設定
+        :param accept_encoding: Accept-Encoding を送信して圧縮されたレスポンスを受け付けるか
+        :type accept_encoding: bool
+        :param request_threshold: リクエストボディを圧縮する最小サイズ(バイト)。None の場合は圧縮しない
+        :type request_threshold: int or None
+        :param request_encoding: リクエストボディの圧縮形式(gzip または deflate)
+        :type request_encoding: str
+        :param level: リクエストボディの圧縮レベル
+        :type level: int
+        :param chunk_size: レスポンスを展開する際の読み込み単位(バイト)
+        :type chunk_size: int
+        :param stats: 通信量の集計先。None の場合は新しく生成する
+        :type stats: CompressionStats or None
+        """
+        self.accept_encoding = accept_encoding
+        self.request_threshold = request_threshold
+        self.request_encoding = request_encoding
+        self.level = level
+        self.chunk_size = chunk_size
+        self.stats = stats if stats is not None else CompressionStats()
+
+    def prepare_request(self, headers, data):
+        """
+        リクエストヘッダとボディに圧縮の設定を反映する
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param data: リクエストボディ
+        :type data: bytes or None
+        :return: 送信するリクエストボディ
+        :rtype: bytes or None
+        """
+        if self.accept_encoding:
+            headers['Accept-Encoding'] = 'gzip, deflate'
+        if not data:
+            return data
+        raw_bytes = len(data)
+        compressed = self.request_threshold is not None and raw_bytes >= self.request_threshold
+        if compressed:
+            data = compress(data, self.request_encoding, self.level)
+            headers['Content-Encoding'] = self.request_encoding
+        self.stats.record_request(raw_bytes, len(data), compressed)
+        return data
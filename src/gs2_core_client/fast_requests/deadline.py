@@ -0,0 +1,84 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import socket
+import time
+
+
+class DeadlineExceededError(socket.timeout):
+    """
+    リクエストが期限までに完了しなかった
+    socket.timeout のサブクラスなので、タイムアウトとして扱う既存の処理でも捕捉できる
+    """
+    pass
+
+
+def get_deadline(timeout, started_at=None):
+    """
+    タイムアウト時間から期限を計算する
+    :param timeout: タイムアウト時間(秒)。None の場合は期限なし
+    :type timeout: float or None
+    :param started_at: 起点とする時刻。None の場合は現在時刻
+    :type started_at: float or None
+    :return: 期限(エポック秒)。期限なしの場合は None
+    :rtype: float or None
+    """
+    if timeout is None:
+        return None
+    return (started_at if started_at is not None else time.time()) + timeout
+
+
+def get_remaining(deadline, timeout=None):
+    """
+    期限までの残り時間を取得する。timeout が指定されている場合は短い方を返す
+    :param deadline: 期限(エポック秒)。None の場合は期限なし
+    :type deadline: float or None
+    :param timeout: 1回の操作のタイムアウト時間(秒)
+    :type timeout: float or None
+    :return: タイムアウト時間(秒)
+    :rtype: float or None
+    :raises DeadlineExceededError: 期限を過ぎている場合
+    """
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise DeadlineExceededError('deadline exceeded')
+    if timeout is not None and timeout < remaining:
+        return timeout
+    return remaining
+
+
+def is_expired(deadline):
+    """
+    期限を過ぎているか
+    :param deadline: 期限(エポック秒)。None の場合は期限なし
+    :type deadline: float or None
+    :rtype: bool
+    """
+    return deadline is not None and time.time() >= deadline
+
+
+def fits(deadline, delay):
+    """
+    delay 秒待っても期限を過ぎないか
+    :param deadline: 期限(エポック秒)。None の場合は期限なし
+    :type deadline: float or None
+    :param delay: 待機時間(秒)
+    :type delay: float
+    :rtype: bool
+    """
+    return deadline is None or time.time() + delay < deadline
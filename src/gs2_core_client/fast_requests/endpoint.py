@@ -0,0 +1,193 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import threading
+
+
+class Endpoint(object):
+
+    __slots__ = ('scheme', 'host', 'port', 'secure', 'host_header', 'pool_key', 'base_url', 'path_prefix')
+
+    def __init__(self, scheme, host, port=None, path_prefix='', base_url=None):
+        """
+        解析済みのエンドポイント
+        リクエストのたびに URL を解析しなくて済むように、接続先とヘッダの値をあらかじめ計算しておく
+        :param scheme: プロトコル(http / https)
+        :type scheme: str
+        :param host: ホスト名
+        :type host: str
+        :param port: ポート番号。None の場合はプロトコルの既定値
+        :type port: int or None
+        :param path_prefix: すべてのリクエストパスの前に付与するパス
+        :type path_prefix: str
+        :param base_url: このエンドポイントを指す URL の文字列。None の場合は各要素から組み立てる
+        :type base_url: str or None
+        """
+        if scheme == 'http':
+            default_port = 80
+        elif scheme == 'https':
+            default_port = 443
+        else:
+            raise AttributeError('invalid protocol')
+        if port is None:
+            port = default_port
+
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.secure = scheme == 'https'
+        self.host_header = host if port == default_port else '{host}:{port}'.format(host=host, port=port)
+        self.pool_key = '{scheme}://{host}:{port}'.format(scheme=scheme, host=host, port=port)
+        self.path_prefix = path_prefix.rstrip('/')
+        if base_url is None:
+            base_url = '{scheme}://{host}{path_prefix}'.format(
+                scheme=scheme,
+                host=self.host_header,
+                path_prefix=self.path_prefix,
+            )
+        self.base_url = base_url
+
+    def get_path(self, url):
+        """
+        このエンドポイントの URL からリクエストパスを取り出す
+        :param url: base_url で始まる URL
+        :type url: str
+        :return: リクエストパス
+        :rtype: str
+        """
+        path = self.path_prefix + url[len(self.base_url):]
+        if not path:
+            return '/'
+        if path[0] == '?':
+            return '/' + path
+        return path
+
+    def __repr__(self):
+        return 'Endpoint({base_url!r})'.format(base_url=self.base_url)
+
+
+_endpoints = {}
+
+_endpoints_lock = threading.Lock()
+
+_max_endpoints = 1024
+
+
+def split_base(url):
+    """
+    URL をエンドポイント部分とパス部分に分割する
+    :param url: URL
+    :type url: str
+    :return: (エンドポイント部分, パス部分)
+    :rtype: (str, str)
+    """
+    start = url.find('://')
+    if start == -1:
+        raise AttributeError('invalid protocol')
+    start += 3
+    end = len(url)
+    for delimiter in '/?':
+        position = url.find(delimiter, start, end)
+        if position != -1:
+            end = position
+    return url[:end], url[end:]
+
+
+def _parse(base_url):
+    """
+    エンドポイント部分の URL を解析する
+    :param base_url: URL
+    :type base_url: str
+    :return: エンドポイント
+    :rtype: Endpoint
+    """
+    from gs2_core_client.fast_requests.requests import _get_protocol, _get_host, _get_port
+
+    scheme = _get_protocol(base_url)
+    rest = base_url[len(scheme) + 3:]
+    slash_pos = rest.find('/')
+    return Endpoint(
+        scheme=scheme,
+        host=_get_host(base_url),
+        port=_get_port(base_url),
+        path_prefix=rest[slash_pos:] if slash_pos != -1 else '',
+        base_url=base_url,
+    )
+
+
+def _remember(key, endpoint):
+    """
+    エンドポイントをキャッシュする
+    :param key: キー
+    :param endpoint: エンドポイント
+    :type endpoint: Endpoint
+    :return: エンドポイント
+    :rtype: Endpoint
+    """
+    with _endpoints_lock:
+        if len(_endpoints) >= _max_endpoints:
+            _endpoints.clear()
+        return _endpoints.setdefault(key, endpoint)
+
+
+def get_endpoint(base_url):
+    """
+    URL に対応するエンドポイントを取得する。一度解析したエンドポイントはキャッシュされる
+    :param base_url: プロトコル・ホスト名・ポート番号・パスの接頭辞からなる URL
+    :type base_url: str
+    :return: エンドポイント
+    :rtype: Endpoint
+    """
+    endpoint = _endpoints.get(base_url)
+    if endpoint is None:
+        endpoint = _remember(base_url, _parse(base_url))
+    return endpoint
+
+
+def split_url(url):
+    """
+    URL をエンドポイントとリクエストパスに分割する
+    :param url: URL
+    :type url: str
+    :return: (エンドポイント, リクエストパス)
+    :rtype: (Endpoint, str)
+    """
+    base_url, path = split_base(url)
+    endpoint = get_endpoint(base_url)
+    if not path:
+        return endpoint, '/'
+    if path[0] == '?':
+        return endpoint, '/' + path
+    return endpoint, path
+
+
+def get_service_endpoint(url_template, service, region):
+    """
+    {service} と {region} を含む URL テンプレートからエンドポイントを取得する。一度解決したエンドポイントはキャッシュされる
+    :param url_template: URL テンプレートのエンドポイント部分 (例: Gs2Constant.ENDPOINT_HOST)
+    :type url_template: str
+    :param service: サービス名
+    :type service: str
+    :param region: リージョン
+    :type region: str
+    :return: エンドポイント
+    :rtype: Endpoint
+    """
+    key = (url_template, service, region)
+    endpoint = _endpoints.get(key)
+    if endpoint is None:
+        endpoint = _remember(key, _parse(url_template.replace('{service}', service).replace('{region}', region)))
+    return endpoint
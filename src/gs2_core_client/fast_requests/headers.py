@@ -0,0 +1,75 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+class ResponseHeaders(Mapping):
+    """
+    名前の大文字・小文字を区別しないレスポンスヘッダ
+    HTTP レスポンスから (名前, 値) のリストを取り出して辞書にするのは、最初に参照されたときまで遅らせる
+    同じ名前のヘッダが複数ある場合は ', ' で連結する
+    """
+
+    __slots__ = ('__source', '__headers')
+
+    def __init__(self, source):
+        """
+        コンストラクタ
+        :param source: (名前, 値) のリストを返す関数、またはキーが小文字の辞書
+        :type source: (() -> list[(str, str)]) or dict[str, str]
+        """
+        if isinstance(source, dict):
+            self.__source = None
+            self.__headers = source
+        else:
+            self.__source = source
+            self.__headers = None
+
+    def __parse(self):
+        headers = self.__headers
+        if headers is None:
+            headers = {}
+            for name, value in self.__source():
+                name = name.lower()
+                if name in headers:
+                    headers[name] = headers[name] + ', ' + value
+                else:
+                    headers[name] = value
+            self.__headers = headers
+            self.__source = None
+        return headers
+
+    def __getitem__(self, name):
+        return self.__parse()[name.lower()]
+
+    def __contains__(self, name):
+        return name.lower() in self.__parse()
+
+    def __iter__(self):
+        return iter(self.__parse())
+
+    def __len__(self):
+        return len(self.__parse())
+
+    def __repr__(self):
+        return repr(self.__parse())
+
+    def get(self, name, default=None):
+        return self.__parse().get(name.lower(), default)
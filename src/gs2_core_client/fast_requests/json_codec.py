@@ -0,0 +1,124 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+#
+# JSON のエンコード/デコードを行うバックエンドを切り替えるモジュール
+# import 時に orjson / ujson / simplejson / json の順で利用可能なものを選択する
+
+BACKENDS = ('orjson', 'ujson', 'simplejson', 'json')
+
+_backend = None
+_loads = None
+_dumps = None
+
+
+def _create_codec(name):
+    """
+    バックエンドの loads/dumps を生成する
+    :param name: バックエンド名
+    :type name: str
+    :return: (loads, dumps)
+    :rtype: (callable, callable)
+    """
+    if name == 'orjson':
+        import orjson
+
+        def dumps(obj):
+            return orjson.dumps(obj)
+
+        return orjson.loads, dumps
+
+    if name == 'ujson':
+        import ujson
+        module = ujson
+    elif name == 'simplejson':
+        import simplejson
+        module = simplejson
+    elif name == 'json':
+        import json
+        module = json
+    else:
+        raise ValueError('unknown json backend: {name}'.format(name=name))
+
+    module_dumps = module.dumps
+
+    def dumps(obj):
+        data = module_dumps(obj)
+        if not isinstance(data, bytes):
+            data = data.encode('utf-8')
+        return data
+
+    return module.loads, dumps
+
+
+def set_backend(name=None):
+    """
+    JSON バックエンドを選択する
+    :param name: バックエンド名(orjson, ujson, simplejson, json)。None の場合は利用可能なものから最速のものを選ぶ
+    :type name: str or None
+    :return: 選択したバックエンド名
+    :rtype: str
+    """
+    global _backend, _loads, _dumps
+
+    candidates = BACKENDS if name is None else (name,)
+    for candidate in candidates:
+        try:
+            _loads, _dumps = _create_codec(candidate)
+        except ImportError:
+            if name is not None:
+                raise
+            continue
+        _backend = candidate
+        return _backend
+    raise ImportError('no json backend is available')
+
+
+def get_backend():
+    """
+    選択中の JSON バックエンド名を取得する
+    :return: バックエンド名
+    :rtype: str
+    """
+    return _backend
+
+
+def loads(data):
+    """
+    JSON をデコードする
+    :param data: JSON(UTF-8 のバイト列 または 文字列)
+    :type data: bytes or unicode
+    :return: デコード結果
+    :rtype: dict
+    :raises ValueError: JSON として不正な場合
+    """
+    return _loads(data)
+
+
+def dumps(obj):
+    """
+    JSON にエンコードする。bytes を渡した場合はエンコード済みとみなしてそのまま返す
+    :param obj: エンコード対象
+    :type obj: dict or bytes
+    :return: JSON(UTF-8 のバイト列)
+    :rtype: bytes
+    """
+    if isinstance(obj, bytes):
+        return obj
+    return _dumps(obj)
+
+
+set_backend()
@@ -0,0 +1,163 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import threading
+
+
+class PoolExhaustedError(Exception):
+    """
+    コネクションプールに空きがない
+    """
+    pass
+
+
+class ConnectionPool(object):
+
+    def __init__(self, factory, max_size=10, block=True, block_timeout=None):
+        """
+        ホスト単位のコネクションプール
+        :param factory: コネクションを生成する関数
+        :type factory: () -> httplib.HTTPConnection
+        :param max_size: プールが保持するコネクションの最大数
+        :type max_size: int
+        :param block: プールに空きがない場合に返却を待つか。False の場合は即座に PoolExhaustedError を送出する
+        :type block: bool
+        :param block_timeout: 返却を待つ最大時間(秒)。None の場合は無制限に待つ
+        :type block_timeout: float or None
+        """
+        self.__factory = factory
+        self.__max_size = max_size
+        self.__block = block
+        self.__block_timeout = block_timeout
+        self.__condition = threading.Condition(threading.Lock())
+        self.__idle = []
+        self.__in_use = 0
+        self.__created = 0
+        self.__reused = 0
+
+    def configure(self, max_size=None, block=None, block_timeout=None):
+        """
+        プールの設定を変更する
+        :param max_size: プールが保持するコネクションの最大数
+        :type max_size: int or None
+        :param block: プールに空きがない場合に返却を待つか
+        :type block: bool or None
+        :param block_timeout: 返却を待つ最大時間(秒)
+        :type block_timeout: float or None
+        """
+        with self.__condition:
+            if max_size is not None:
+                self.__max_size = max_size
+            if block is not None:
+                self.__block = block
+            self.__block_timeout = block_timeout
+            self.__condition.notify_all()
+
+    def checkout(self, timeout=None):
+        """
+        コネクションを借り受ける
+        :param timeout: 返却を待つ最大時間(秒)。block_timeout より短い場合はこちらを優先する
+        :type timeout: float or None
+        :return: (コネクション, 再利用したコネクションか)
+        :rtype: (httplib.HTTPConnection, bool)
+        """
+        import time
+
+        deadline = None
+        with self.__condition:
+            block_timeout = self.__block_timeout
+            if timeout is not None and (block_timeout is None or timeout < block_timeout):
+                block_timeout = timeout
+            while True:
+                if self.__idle:
+                    connection = self.__idle.pop()
+                    self.__in_use += 1
+                    self.__reused += 1
+                    return connection, True
+                if self.__in_use < self.__max_size:
+                    self.__in_use += 1
+                    self.__created += 1
+                    break
+                if not self.__block:
+                    raise PoolExhaustedError('connection pool is exhausted')
+                if block_timeout is None:
+                    self.__condition.wait()
+                else:
+                    if deadline is None:
+                        deadline = time.time() + block_timeout
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise PoolExhaustedError('timed out waiting for a pooled connection')
+                    self.__condition.wait(remaining)
+
+        try:
+            return self.__factory(), False
+        except Exception:
+            with self.__condition:
+                self.__in_use -= 1
+                self.__created -= 1
+                self.__condition.notify()
+            raise
+
+    def checkin(self, connection):
+        """
+        借り受けたコネクションを再利用可能な状態で返却する
+        :param connection: コネクション
+        :type connection: httplib.HTTPConnection
+        """
+        with self.__condition:
+            self.__in_use -= 1
+            if len(self.__idle) + self.__in_use < self.__max_size:
+                self.__idle.append(connection)
+                connection = None
+            self.__condition.notify()
+        if connection is not None:
+            connection.close()
+
+    def discard(self, connection):
+        """
+        借り受けたコネクションを破棄する
+        :param connection: コネクション
+        :type connection: httplib.HTTPConnection
+        """
+        with self.__condition:
+            self.__in_use -= 1
+            self.__condition.notify()
+        connection.close()
+
+    def clear(self):
+        """
+        待機中のコネクションをすべて閉じる。貸出中のコネクションは返却時に通常通り扱われる
+        """
+        with self.__condition:
+            idle, self.__idle = self.__idle, []
+        for connection in idle:
+            connection.close()
+
+    def get_stats(self):
+        """
+        プールの統計情報を取得する
+        :return: 統計情報 (in_use, idle, created, reused, max_size)
+        :rtype: dict
+        """
+        with self.__condition:
+            return {
+                'in_use': self.__in_use,
+                'idle': len(self.__idle),
+                'created': self.__created,
+                'reused': self.__reused,
+                'max_size': self.__max_size,
+            }
@@ -14,21 +14,46 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+import os
+import sys
+import threading
+import time
+
+from gs2_core_client.fast_requests.url_encoder import to_query_string
+from gs2_core_client.fast_requests.resolver import CachingResolver, AddressBalancer, interleave, connect
+from gs2_core_client.fast_requests.tls import TlsStats
+from gs2_core_client.fast_requests.headers import ResponseHeaders
+from gs2_core_client.fast_requests.deadline import DeadlineExceededError, get_remaining, is_expired, fits
+
+
+class ResponseTooLargeError(Exception):
+    """
+    レスポンスボディが上限のサイズを超えた
+    """
+    pass
+
 
 class HttpResponse(object):
-    def __init__(self, status_code, headers, body):
+    def __init__(self, status_code, headers, body, timings=None, attempts=1):
         """
         HTTPレスポンス
         :param status_code: ステータスコード
         :type status_code: int
         :param headers: レスポンスヘッダ
-        :type headers: dict
+        :type headers: gs2_core_client.fast_requests.headers.ResponseHeaders or dict
         :param body: レスポンスボディ
-        :type body: unicode
+        :type body: bytes
+        :param timings: フェーズ名をキーとした所要時間(秒)
+        :type timings: dict[str, float] or None
+        :param attempts: 送信を試行した回数
+        :type attempts: int
         """
         self.__status_code = status_code
         self.__headers = headers
         self.__body = body
+        self.__timings = timings if timings is not None else {}
+        self.__attempts = attempts
+        self.__position = 0
 
     @property
     def status_code(self):
@@ -44,19 +69,261 @@ class HttpResponse(object):
         """
         レスポンスヘッダを取得
         :return: レスポンスヘッダ
-        :rtype: dict
+        :rtype: gs2_core_client.fast_requests.headers.ResponseHeaders or dict
         """
         return self.__headers
 
+    @property
+    def timings(self):
+        """
+        フェーズ名(connect / tls / send / ttfb / read / backoff)をキーとした所要時間を取得
+        リトライした場合は各試行の合計
+        :return: 所要時間(秒)
+        :rtype: dict[str, float]
+        """
+        return self.__timings
+
+    @property
+    def attempts(self):
+        """
+        送信を試行した回数を取得
+        :return: 試行回数
+        :rtype: int
+        """
+        return self.__attempts
+
+    def _get_body(self):
+        """
+        レスポンスボディを取得する
+        :return: レスポンスボディ
+        :rtype: bytes or str
+        """
+        return self.__body
+
+    @property
+    def content(self):
+        """
+        レスポンスボディをバイト列のまま取得
+        :return: レスポンスボディ
+        :rtype: bytes
+        """
+        body = self._get_body()
+        if isinstance(body, bytes):
+            return body
+        return body.encode('utf-8')
+
     @property
     def text(self):
         """
         レスポンスボディを取得
         :return: レスポンスボディ
-        :rtype: unicode
+        :rtype: str
+        """
+        body = self._get_body()
+        if isinstance(body, str):
+            return body
+        return body.decode('utf-8')
+
+    def iter_content(self, chunk_size=8192):
+        """
+        レスポンスボディの未読の部分を chunk_size バイトずつ返す
+        :param chunk_size: 1回に返す最大のバイト数
+        :type chunk_size: int
+        :return: バイト列を返すジェネレータ
+        """
+        body = self.content
+        while self.__position < len(body):
+            chunk = body[self.__position:self.__position + chunk_size]
+            self.__position += len(chunk)
+            yield chunk
+
+    def readinto(self, buffer):
         """
+        レスポンスボディの未読の部分を buffer に読み込む
+        :param buffer: 書き込み先のバッファ
+        :type buffer: bytearray or memoryview
+        :return: 読み込んだバイト数。すべて読み終えている場合は 0
+        :rtype: int
+        """
+        body = self.content
+        size = min(len(buffer), len(body) - self.__position)
+        if size > 0:
+            memoryview(buffer)[:size] = body[self.__position:self.__position + size]
+            self.__position += size
+        return max(size, 0)
+
+    def close(self):
+        """
+        レスポンスを閉じる。レスポンスボディを読み込み済みのため何もしない
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class StreamingHttpResponse(HttpResponse):
+
+    def __init__(self, status_code, headers, response, connection, pool, compression=None, max_body_size=None,
+                 timings=None, attempts=1):
+        """
+        レスポンスボディを読み込まずに返す HTTPレスポンス
+        iter_content / readinto で少しずつ読み込む。content / text を参照すると残りをすべて読み込む
+        読み終えるか close() を呼び出すまでコネクションを占有するため、with 文で使うこと
+        :param status_code: ステータスコード
+        :type status_code: int
+        :param headers: レスポンスヘッダ
+        :type headers: gs2_core_client.fast_requests.headers.ResponseHeaders
+        :param response: レスポンスボディを読み込む前の HTTPレスポンス
+        :type response: httplib.HTTPResponse
+        :param connection: レスポンスを受信したコネクション
+        :type connection: httplib.HTTPConnection
+        :param pool: コネクションを返却するプール
+        :type pool: gs2_core_client.fast_requests.pool.ConnectionPool
+        :param compression: HTTP 圧縮の設定。None の場合は展開しない
+        :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+        :param max_body_size: レスポンスボディの最大サイズ(バイト)。展開後のサイズで判定する。None の場合は無制限
+        :type max_body_size: int or None
+        :param timings: フェーズ名をキーとした所要時間(秒)
+        :type timings: dict[str, float] or None
+        :param attempts: 送信を試行した回数
+        :type attempts: int
+        """
+        super(StreamingHttpResponse, self).__init__(status_code, headers, None, timings, attempts)
+        self.__response = response
+        self.__connection = connection
+        self.__pool = pool
+        self.__compression = compression
+        self.__decoder = None
+        if compression is not None:
+            from gs2_core_client.fast_requests.compression import create_decoder
+            self.__decoder = create_decoder(response.getheader('content-encoding'))
+        self.__max_body_size = max_body_size
+        self.__wire_bytes = 0
+        self.__body_bytes = 0
+        self.__pending = b''
+        self.__finished = False
+        self.__body = None
+
+    def __release(self, reusable):
+        pool, self.__pool = self.__pool, None
+        if pool is None:
+            return
+        if reusable and not self.__response.will_close:
+            pool.checkin(self.__connection)
+        else:
+            pool.discard(self.__connection)
+        self.__connection = None
+
+    def __read_chunk(self, size):
+        """
+        レスポンスボディを最大 size バイト受信し、展開して返す
+        :return: 展開したバイト列。読み終えている場合は None
+        :rtype: bytes or None
+        """
+        if self.__finished:
+            return None
+        try:
+            chunk = self.__response.read(size)
+        except BaseException:
+            self.__finished = True
+            self.__release(False)
+            raise
+        if not chunk:
+            self.__finished = True
+            tail = self.__decoder.flush() if self.__decoder is not None else b''
+            self.__body_bytes += len(tail)
+            self.__release(True)
+            if self.__compression is not None:
+                self.__compression.stats.record_response(
+                    self.__wire_bytes, self.__body_bytes, self.__decoder is not None)
+            self.__check_size()
+            return tail
+        self.__wire_bytes += len(chunk)
+        if self.__decoder is not None:
+            chunk = self.__decoder.decompress(chunk, _get_decompress_limit(self.__max_body_size, self.__body_bytes))
+        self.__body_bytes += len(chunk)
+        self.__check_size()
+        return chunk
+
+    def __check_size(self):
+        if self.__max_body_size is not None and self.__body_bytes > self.__max_body_size:
+            self.close()
+            raise ResponseTooLargeError('response body exceeds {size} bytes'.format(size=self.__max_body_size))
+
+    def _get_body(self):
+        if self.__body is None:
+            chunks = [self.__pending]
+            self.__pending = b''
+            while True:
+                chunk = self.__read_chunk(65536)
+                if chunk is None:
+                    break
+                chunks.append(chunk)
+            self.__body = b''.join(chunks)
         return self.__body
 
+    def iter_content(self, chunk_size=8192):
+        """
+        レスポンスボディの未読の部分を受信しながら返す
+        圧縮されている場合は受信した chunk_size バイトごとに展開して返すため、返すバイト数は chunk_size と一致しない
+        :param chunk_size: 1回に受信する最大のバイト数
+        :type chunk_size: int
+        :return: バイト列を返すジェネレータ
+        :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
+        """
+        if self.__body is not None:
+            for chunk in super(StreamingHttpResponse, self).iter_content(chunk_size):
+                yield chunk
+            return
+        if self.__pending:
+            pending, self.__pending = self.__pending, b''
+            yield pending
+        while True:
+            chunk = self.__read_chunk(chunk_size)
+            if chunk is None:
+                return
+            if chunk:
+                yield chunk
+
+    def readinto(self, buffer):
+        """
+        レスポンスボディの未読の部分を受信して buffer に読み込む
+        :param buffer: 書き込み先のバッファ
+        :type buffer: bytearray or memoryview
+        :return: 読み込んだバイト数。すべて読み終えている場合は 0
+        :rtype: int
+        :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
+        """
+        if self.__body is not None:
+            return super(StreamingHttpResponse, self).readinto(buffer)
+        view = memoryview(buffer)
+        if not view:
+            return 0
+        while not self.__pending:
+            chunk = self.__read_chunk(len(view))
+            if chunk is None:
+                return 0
+            self.__pending = chunk
+        size = min(len(view), len(self.__pending))
+        view[:size] = self.__pending[:size]
+        self.__pending = self.__pending[size:]
+        return size
+
+    def close(self):
+        """
+        レスポンスを閉じる。読み終えていない場合、残りは読み込まずにコネクションを破棄する
+        """
+        if not self.__finished:
+            self.__finished = True
+            self.__release(False)
+
+    def __del__(self):
+        self.close()
+
 
 def _get_protocol(url):
     """
@@ -128,146 +395,705 @@ def _to_query_string(query_strings):
     :param query_strings: クエリストリング(辞書配列)
     :type query_strings: dict
     :return: クエリストリング(文字列)
-    :rtype: unicode
+    :rtype: str
     """
-    from aws_sdk_for_serverless.common import url_encoder
-    return '&'.join(
-        map(lambda key: '{key}={value}'.format(
-            key=key,
-            value=url_encoder.encode(query_strings[key]),
-        ), query_strings.keys())
-    )
+    return to_query_string(query_strings)
 
 
 _connection_pool = {}
 
+_connection_pool_lock = threading.Lock()
 
-def _get_cache_key(url):
-    protocol = _get_protocol(url)
-    host = _get_host(url)
-    port = _get_port(url)
+_pool_options = {
+    'max_size': 10,
+    'block': True,
+    'block_timeout': None,
+}
+
+
+_resolver = CachingResolver()
 
-    key = '{protocol}://{host}:{port}'.format(
-        protocol=protocol,
-        host=host,
-        port=port,
-    )
+_address_balancer = AddressBalancer()
 
-    return key
+_connect_options = {
+    'attempt_delay': 0.25,
+}
 
+_ssl_context = None
 
-def _create_connection(url, timeout):
+_tls_stats = TlsStats()
+
+# コネクションプールを作成したプロセスの ID。fork した子プロセスでは親プロセスのコネクションを使わない
+_pid = os.getpid()
+
+
+def _get_ssl_context():
+    """
+    HTTPS 接続に使用する SSLContext を取得する。すべてのコネクションで同じ SSLContext を共有する
+    :return: SSLContext
+    :rtype: ssl.SSLContext
+    """
+    global _ssl_context
+    if _ssl_context is None:
+        import ssl
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+def _create_connection(endpoint, timeout):
     """
     HTTPコネクションを作成する
-    :param url: URL
-    :type url: str
+    :param endpoint: エンドポイント
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint
     :param timeout: タイムアウト時間(秒)
     :type timeout: float
-    :return: (str, str, int)
+    :return: HTTPコネクション
+    :rtype: httplib.HTTPConnection
     """
     import httplib
 
-    protocol = _get_protocol(url)
-    host = _get_host(url)
-    port = _get_port(url)
-
-    key = _get_cache_key(url)
-    if key in _connection_pool.keys():
-        return _connection_pool[key]
-
-    if protocol == 'http':
-        _connection_pool[key] = httplib.HTTPConnection(
-            host,
-            port=port,
+    if endpoint.secure:
+        connection = httplib.HTTPSConnection(
+            endpoint.host,
+            port=endpoint.port,
             timeout=timeout,
+            context=_get_ssl_context(),
         )
-        return _connection_pool[key]
-    elif protocol == 'https':
-        _connection_pool[key] = httplib.HTTPSConnection(
-            host,
-            port=port,
+    else:
+        connection = httplib.HTTPConnection(
+            endpoint.host,
+            port=endpoint.port,
             timeout=timeout,
         )
-        return _connection_pool[key]
+
+    _use_resolver(connection)
+    _measure_tcp_connect(connection)
+    return connection
+
+
+def _use_resolver(connection):
+    """
+    TCP 接続時の名前解決をキャッシュ付きのリゾルバで行い、接続先をアドレス間で分散させるようにする
+    接続先のアドレスは connection.peer_address に記録し、コネクションを閉じる際に解放する
+    :param connection: HTTPコネクション
+    :type connection: httplib.HTTPConnection
+    """
+    close = connection.close
+
+    def resolving_create_connection(address, timeout=None, source_address=None):
+        host, port = address
+        addresses = interleave(_address_balancer.order(_resolver.resolve(host, port)))
+        (_, sockaddr), sock = connect(addresses, timeout, source_address, _connect_options['attempt_delay'])
+        connection.peer_address = sockaddr[0]
+        _address_balancer.acquire(sockaddr[0])
+        return sock
+
+    def releasing_close():
+        peer_address, connection.peer_address = connection.peer_address, None
+        if peer_address is not None:
+            _address_balancer.release(peer_address)
+        close()
+
+    connection.peer_address = None
+    connection._create_connection = resolving_create_connection
+    connection.close = releasing_close
+
+
+def _measure_tcp_connect(connection):
+    """
+    TCP 接続に要した時間を connection.tcp_connect_time に記録するようにする
+    HTTPS の場合 connect() の所要時間からこれを引いた残りが TLS ハンドシェイクの時間になる
+    :param connection: HTTPコネクション
+    :type connection: httplib.HTTPConnection
+    """
+    create_connection = connection._create_connection
+
+    def timed_create_connection(*args, **kwargs):
+        started_at = time.time()
+        try:
+            return create_connection(*args, **kwargs)
+        finally:
+            connection.tcp_connect_time = time.time() - started_at
+
+    connection.tcp_connect_time = 0.0
+    connection._create_connection = timed_create_connection
+
+
+def configure_resolver(resolver=None, ttl=30.0, negative_ttl=5.0, strategy=AddressBalancer.LEAST_LOADED,
+                       attempt_delay=0.25):
+    """
+    新しいコネクションを張る際の名前解決と接続先の選択方法を変更する。キャッシュ済みの名前解決の結果は破棄される
+    :param resolver: 名前解決に使用するリゾルバ。None の場合は OS のリゾルバ
+    :type resolver: gs2_core_client.fast_requests.resolver.SystemResolver or
+                    gs2_core_client.fast_requests.resolver.FakeResolver or None
+    :param ttl: リゾルバが TTL を返さない場合に名前解決の結果をキャッシュする時間(秒)
+    :type ttl: float
+    :param negative_ttl: 名前解決に失敗した結果をキャッシュする時間(秒)
+    :type negative_ttl: float
+    :param strategy: 複数のアドレスに解決された場合の分散方法 (least_loaded / round_robin)
+    :type strategy: str
+    :param attempt_delay: 接続が確立しない場合に次のアドレスへの接続を並行して開始するまでの待ち時間(秒)
+    :type attempt_delay: float
+    """
+    global _resolver, _address_balancer
+
+    _resolver = CachingResolver(resolver=resolver, ttl=ttl, negative_ttl=negative_ttl)
+    _address_balancer = AddressBalancer(strategy=strategy)
+    _connect_options['attempt_delay'] = attempt_delay
+
+
+def get_resolver_stats():
+    """
+    名前解決のキャッシュとアドレスごとのコネクション数の統計情報を取得する
+    :return: 統計情報 (entries, hits, misses, negative_hits, connections)
+    :rtype: dict
+    """
+    stats = _resolver.get_stats()
+    stats['connections'] = _address_balancer.get_stats()
+    return stats
+
+
+def get_tls_stats():
+    """
+    TLS ハンドシェイクの統計情報を取得する
+    :return: 統計情報 (handshakes, full, resumed)
+    :rtype: dict
+    """
+    return _tls_stats.get_stats()
+
+
+def _record_handshake(connection):
+    """
+    HTTPS コネクションのハンドシェイクを統計情報に記録する
+    :param connection: 接続済みの HTTPS コネクション
+    :type connection: httplib.HTTPSConnection
+    """
+    _tls_stats.record(bool(getattr(connection.sock, 'session_reused', False)))
+
+
+def _reset_after_fork():
+    """
+    fork した子プロセスで、親プロセスから引き継いだコネクションプールを破棄する
+    コネクションは閉じずに参照を手放すだけなので、子プロセス側のファイルディスクリプタが解放されるのみで
+    親プロセスの通信には影響しない
+    """
+    global _pid, _connection_pool, _connection_pool_lock
+
+    _pid = os.getpid()
+    # 親プロセスのスレッドがロックを保持したまま fork された可能性があるため作り直す
+    _connection_pool_lock = threading.Lock()
+    _connection_pool = {}
+    _resolver.reset_after_fork()
+    _address_balancer.reset_after_fork()
+    _tls_stats.reset_after_fork()
+
+
+def _check_fork():
+    """
+    プロセス ID が変わっていれば fork された子プロセスとみなし、コネクションプールを作り直す
+    os.register_at_fork が使えない環境や、それを経由しない fork に備えたもの
+    """
+    if _pid != os.getpid():
+        _reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def reset_pool():
+    """
+    コネクションプールを作り直す。プリフォーク型のサーバーでは fork 後のワーカーの初期化処理で呼び出す
+    fork はプロセス ID の変化と os.register_at_fork でも自動的に検出する
+    fork した子プロセスでは親プロセスのコネクションを閉じずに破棄し、同じプロセスでは待機中のコネクションを閉じる
+    asyncio 版のコネクションプールも読み込まれていれば作り直す
+    """
+    global _connection_pool
+
+    if _pid != os.getpid():
+        _reset_after_fork()
     else:
-        raise AttributeError('invalid protocol')
+        with _connection_pool_lock:
+            pools = list(_connection_pool.values())
+            _connection_pool = {}
+        for pool in pools:
+            pool.clear()
+
+    async_requests = sys.modules.get('gs2_core_client.fast_requests.async_requests')
+    if async_requests is not None:
+        async_requests.reset_pool()
+
+
+def _get_pool(endpoint, timeout):
+    """
+    エンドポイントに対応するコネクションプールを取得する
+    :param endpoint: エンドポイント
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint
+    :param timeout: タイムアウト時間(秒)
+    :type timeout: float
+    :return: コネクションプール
+    :rtype: gs2_core_client.fast_requests.pool.ConnectionPool
+    """
+    _check_fork()
+    pool = _connection_pool.get(endpoint.pool_key)
+    if pool is None:
+        from gs2_core_client.fast_requests.pool import ConnectionPool
+
+        with _connection_pool_lock:
+            pool = _connection_pool.get(endpoint.pool_key)
+            if pool is None:
+                pool = ConnectionPool(
+                    factory=lambda: _create_connection(endpoint, timeout),
+                    **_pool_options
+                )
+                _connection_pool[endpoint.pool_key] = pool
+    return pool
 
 
 def _purge_connection_cache(url):
-    key = _get_cache_key(url)
-    if key in _connection_pool.keys():
-        del _connection_pool[key]
+    from gs2_core_client.fast_requests.endpoint import split_url
 
+    _check_fork()
+    pool = _connection_pool.get(split_url(url)[0].pool_key)
+    if pool is not None:
+        pool.clear()
 
-def get(
-        url,
-        params=None,
-        headers=None,
-        timeout=60,
-):
+
+def configure_pool(max_size=10, block=True, block_timeout=None):
     """
-    GETリクエストを発行する
+    コネクションプールの設定を変更する。作成済みのプールにも反映される
+    :param max_size: ホストごとに保持するコネクションの最大数
+    :type max_size: int
+    :param block: プールに空きがない場合に返却を待つか。False の場合は即座に PoolExhaustedError を送出する
+    :type block: bool
+    :param block_timeout: 返却を待つ最大時間(秒)。None の場合は無制限に待つ
+    :type block_timeout: float or None
+    """
+    _check_fork()
+    with _connection_pool_lock:
+        _pool_options['max_size'] = max_size
+        _pool_options['block'] = block
+        _pool_options['block_timeout'] = block_timeout
+        pools = list(_connection_pool.values())
+    for pool in pools:
+        pool.configure(max_size=max_size, block=block, block_timeout=block_timeout)
+
+
+def get_pool_stats():
+    """
+    ホストごとのコネクションプールの統計情報を取得する
+    :return: protocol://host:port をキーとした統計情報
+    :rtype: dict[str, dict]
+    """
+    _check_fork()
+    with _connection_pool_lock:
+        pools = list(_connection_pool.items())
+    return dict((key, pool.get_stats()) for key, pool in pools)
+
+
+def warm_up(endpoints, connections=1, timeout=60):
+    """
+    エンドポイントへのコネクションをあらかじめ張り、プールに入れておく
+    名前解決・TCP 接続・TLS ハンドシェイクはすべてのコネクションについて並行して行う
+    :param endpoints: エンドポイントのリスト
+    :type endpoints: list[gs2_core_client.fast_requests.endpoint.Endpoint]
+    :param connections: エンドポイントごとに用意するコネクション数。プールの空きを超える分は待たずに無視する
+    :type connections: int
+    :param timeout: タイムアウト時間(秒)
+    :type timeout: float
+    :return: protocol://host:port をキーとした、用意できたコネクション数
+    :rtype: dict[str, int]
+    """
+    from gs2_core_client.fast_requests.pool import PoolExhaustedError
+
+    checked_out = []
+    warmed = set()
+    for endpoint in endpoints:
+        if endpoint.pool_key in warmed:
+            continue
+        warmed.add(endpoint.pool_key)
+        pool = _get_pool(endpoint, timeout)
+        for _ in range(min(connections, _pool_options['max_size'])):
+            try:
+                # 他のスレッドが使用中のコネクションの返却は待たない
+                connection, reused = pool.checkout(0)
+            except PoolExhaustedError:
+                break
+            checked_out.append((endpoint, pool, connection, reused))
+
+    failed = set()
+
+    def open_connection(index, endpoint, connection):
+        try:
+            connection.connect()
+            if endpoint.secure:
+                _record_handshake(connection)
+        except Exception:
+            failed.add(index)
+
+    threads = []
+    for index, (endpoint, pool, connection, reused) in enumerate(checked_out):
+        if not reused:
+            thread = threading.Thread(target=open_connection, args=(index, endpoint, connection))
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+    result = dict((key, 0) for key in warmed)
+    for index, (endpoint, pool, connection, reused) in enumerate(checked_out):
+        if index in failed:
+            pool.discard(connection)
+        else:
+            pool.checkin(connection)
+            result[endpoint.pool_key] = result.get(endpoint.pool_key, 0) + 1
+    return result
+
+
+def _check_content_length(response, max_body_size):
+    """
+    Content-Length がレスポンスボディの最大サイズを超えていないか確認する
+    :param response: HTTPレスポンス
+    :type response: httplib.HTTPResponse
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :raises ResponseTooLargeError: 最大サイズを超えている場合
+    """
+    if max_body_size is not None and response.length is not None and response.length > max_body_size:
+        raise ResponseTooLargeError('response body exceeds {size} bytes'.format(size=max_body_size))
+
+
+def _get_decompress_limit(max_body_size, body_bytes):
+    """
+    展開するデータの最大長を取得する
+    最大サイズを1バイト超えるところで展開を止めるため、圧縮率の高いデータでも最大サイズを大きく超えて展開しない
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :param body_bytes: 展開済みのバイト数
+    :type body_bytes: int
+    :return: 展開するデータの最大長。0 の場合は無制限
+    :rtype: int
+    """
+    if max_body_size is None:
+        return 0
+    return max(max_body_size - body_bytes, 0) + 1
+
+
+def _read_body(response, compression, max_body_size=None):
+    """
+    レスポンスボディを読み込む。圧縮されている場合は逐次展開する
+    :param response: HTTPレスポンス
+    :type response: httplib.HTTPResponse
+    :param compression: HTTP 圧縮の設定。None の場合は展開しない
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。展開後のサイズで判定する。None の場合は無制限
+    :type max_body_size: int or None
+    :return: レスポンスボディ
+    :rtype: bytes
+    :raises ResponseTooLargeError: レスポンスボディが最大サイズを超えた場合
+    """
+    from gs2_core_client.fast_requests.compression import create_decoder
+
+    _check_content_length(response, max_body_size)
+    decoder = create_decoder(response.getheader('content-encoding')) if compression is not None else None
+    if decoder is None:
+        if max_body_size is None:
+            result = response.read()
+        else:
+            result = response.read(max_body_size + 1)
+            if len(result) > max_body_size:
+                raise ResponseTooLargeError('response body exceeds {size} bytes'.format(size=max_body_size))
+        if compression is not None:
+            compression.stats.record_response(len(result), len(result), False)
+        return result
+
+    chunks = []
+    wire_bytes = 0
+    body_bytes = 0
+    while True:
+        chunk = response.read(compression.chunk_size)
+        if not chunk:
+            break
+        wire_bytes += len(chunk)
+        chunk = decoder.decompress(chunk, _get_decompress_limit(max_body_size, body_bytes))
+        body_bytes += len(chunk)
+        if max_body_size is not None and body_bytes > max_body_size:
+            raise ResponseTooLargeError('response body exceeds {size} bytes'.format(size=max_body_size))
+        chunks.append(chunk)
+    chunks.append(decoder.flush())
+    result = b''.join(chunks)
+    if max_body_size is not None and len(result) > max_body_size:
+        raise ResponseTooLargeError('response body exceeds {size} bytes'.format(size=max_body_size))
+    compression.stats.record_response(wire_bytes, len(result), True)
+    return result
+
+
+def _add_timing(timings, phase, duration):
+    """
+    フェーズの所要時間を加算する
+    :param timings: フェーズ名をキーとした所要時間(秒)
+    :type timings: dict[str, float]
+    :param phase: フェーズ名
+    :type phase: str
+    :param duration: 所要時間(秒)
+    :type duration: float
+    """
+    timings[phase] = timings.get(phase, 0.0) + duration
+
+
+def _get_attempt_delay(delay, on_attempt, status_code):
+    """
+    次の試行までの待ち時間を決める
+    :param delay: リトライポリシーが決めたバックオフ時間(秒)。None の場合はリトライしない
+    :type delay: float or None
+    :param on_attempt: 試行ごとに呼び出す関数。None の場合は呼び出さない
+    :type on_attempt: (int or None) -> float or None
+    :param status_code: 失敗した試行のステータスコード。通信エラーの場合は None
+    :type status_code: int or None
+    :return: 待ち時間(秒)。None の場合はリトライしない
+    :rtype: float or None
+    """
+    if delay is None or on_attempt is None:
+        return delay
+    wait = on_attempt(status_code)
+    if wait is None:
+        return None
+    # バックオフの間にも待ち時間は経過するため、長い方だけ待つ
+    return max(delay, wait)
+
+
+def _set_timeout(connection, timeout):
+    """
+    コネクションのタイムアウト時間を変更する。接続済みの場合はソケットにも反映する
+    :param connection: HTTPコネクション
+    :type connection: httplib.HTTPConnection
+    :param timeout: タイムアウト時間(秒)
+    :type timeout: float
+    """
+    connection.timeout = timeout
+    if connection.sock is not None:
+        connection.sock.settimeout(timeout)
+
+
+def _request(method, url, params, headers, data, timeout, retry_policy=None, compression=None, endpoint=None,
+             deadline=None, stream=False, max_body_size=None, on_attempt=None):
+    """
+    HTTPリクエストを発行する
+    :param method: HTTPメソッド
+    :type method: str
     :param url: URL
     :type url: str or unicode
     :param params: クエリストリング
     :type params: dict
     :param headers: リクエストヘッダ
     :type headers: dict
+    :param data: リクエストボディ
+    :type data: str or None
     :param timeout: タイムアウト時間(秒)
     :type timeout: float
+    :param retry_policy: リトライポリシー。None の場合は DEFAULT_RETRY_POLICY
+    :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+    :param compression: HTTP 圧縮の設定。None の場合は圧縮しない
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param endpoint: 解析済みのエンドポイント。None の場合は url を解析する
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint or None
+    :param deadline: リトライを含めたリクエスト全体の期限(エポック秒)。各試行のタイムアウト時間は期限までの残り時間に縮める
+    :type deadline: float or None
+    :param stream: レスポンスボディを読み込まずに StreamingHttpResponse を返すか
+                   リトライ対象のステータスコードの場合は、リトライに備えてレスポンスボディを読み込む
+    :type stream: bool
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :param on_attempt: リトライする前に、失敗した試行のステータスコード(通信エラーの場合は None)を渡して呼び出す関数
+                       次の試行までに待つ必要のある時間(秒)を返す。None を返した場合はリトライしない
+    :type on_attempt: (int or None) -> float or None
     :return: レスポンス
     :rtype: HttpResponse
+    :raises DeadlineExceededError: 期限までにレスポンスを受信できなかった場合
+    :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
     """
     import socket
-    from httplib import HTTPException
+    from httplib import HTTPException, BadStatusLine
+    from gs2_core_client.fast_requests.retry import DEFAULT_RETRY_POLICY
+    from gs2_core_client.fast_requests.pool import PoolExhaustedError
 
+    if retry_policy is None:
+        retry_policy = DEFAULT_RETRY_POLICY
     if params is None:
         params = {}
     if headers is None:
         headers = {}
 
-    if url.count('/') < 3:
-        url += '/'
-    host = _get_host(url)
+    if endpoint is None:
+        from gs2_core_client.fast_requests.endpoint import split_url
+        endpoint, path = split_url(url)
+    else:
+        path = endpoint.get_path(url)
 
-    headers['Host'] = host
+    headers['Host'] = endpoint.host_header
     headers['Connection'] = 'Keep-Alive'
 
     if params:
-        url = '{url}?{query_strings}'.format(
-            url=url,
+        path = '{path}?{query_strings}'.format(
+            path=path,
             query_strings=_to_query_string(params),
         )
 
-    exception = None
-    for _ in range(3):
-        connection = _create_connection(
-            url=url,
-            timeout=timeout,
-        )
+    if compression is not None:
+        data = compression.prepare_request(headers, data)
+
+    pool = _get_pool(endpoint, timeout)
+
+    started_at = time.time()
+    timings = {}
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            connection, reused = pool.checkout(get_remaining(deadline))
+        except PoolExhaustedError:
+            if is_expired(deadline):
+                raise DeadlineExceededError('deadline exceeded while waiting for a pooled connection')
+            raise
+        connected = reused
+        response = None
         try:
+            if reused:
+                _set_timeout(connection, get_remaining(deadline, timeout))
+                sent_at = time.time()
+            else:
+                connect_started_at = time.time()
+                connection.timeout = get_remaining(deadline, timeout)
+                connection.connect()
+                connected = True
+                sent_at = time.time()
+                _add_timing(timings, 'connect', connection.tcp_connect_time)
+                if endpoint.secure:
+                    _add_timing(timings, 'tls', sent_at - connect_started_at - connection.tcp_connect_time)
+                    _record_handshake(connection)
+            if deadline is not None:
+                _set_timeout(connection, get_remaining(deadline, timeout))
             connection.request(
-                method='GET',
-                url=url,
+                method=method,
+                url=path,
                 headers=headers,
+                body=data,
             )
+            waited_at = time.time()
+            if deadline is not None:
+                _set_timeout(connection, get_remaining(deadline, timeout))
             response = connection.getresponse()
-            result = response.read()
-            try:
-                result = result.encode('utf-8')
-            except UnicodeDecodeError:
-                pass
-            return HttpResponse(
-                status_code=response.status,
-                headers=dict(response.getheaders()),
-                body=result
-            )
+            read_at = time.time()
+            _add_timing(timings, 'send', waited_at - sent_at)
+            _add_timing(timings, 'ttfb', read_at - waited_at)
+            if stream and not retry_policy.is_retryable_status(method, response.status):
+                _check_content_length(response, max_body_size)
+                return StreamingHttpResponse(
+                    status_code=response.status,
+                    headers=ResponseHeaders(response.getheaders),
+                    response=response,
+                    connection=connection,
+                    pool=pool,
+                    compression=compression,
+                    max_body_size=max_body_size,
+                    timings=timings,
+                    attempts=attempt,
+                )
+            if compression is None and max_body_size is None:
+                result = response.read()
+            else:
+                result = _read_body(response, compression, max_body_size)
+            _add_timing(timings, 'read', time.time() - read_at)
+            if response.will_close:
+                pool.discard(connection)
+            else:
+                pool.checkin(connection)
+        except DeadlineExceededError:
+            pool.discard(connection)
+            raise
         except (HTTPException, socket.error) as e:
-            _purge_connection_cache(url)
-            exception = e
+            pool.discard(connection)
+            if isinstance(e, socket.timeout) and is_expired(deadline):
+                raise DeadlineExceededError('deadline exceeded')
+            stale = reused and response is None and not isinstance(e, socket.timeout) and \
+                isinstance(e, (BadStatusLine, socket.error))
+            if not retry_policy.is_retryable_error(method, connected, stale):
+                raise
+            delay = _get_attempt_delay(retry_policy.get_retry_delay(attempt, started_at), on_attempt, None)
+            if delay is None or not fits(deadline, delay):
+                raise
+            time.sleep(delay)
+            _add_timing(timings, 'backoff', delay)
+            continue
+        except BaseException:
+            pool.discard(connection)
+            raise
+
+        http_response = HttpResponse(
+            status_code=response.status,
+            headers=ResponseHeaders(response.getheaders),
+            body=result,
+            timings=timings,
+            attempts=attempt,
+        )
+        if not retry_policy.is_retryable_status(method, http_response.status_code):
+            return http_response
+        delay = _get_attempt_delay(
+            retry_policy.get_retry_delay(attempt, started_at, http_response.headers), on_attempt,
+            http_response.status_code)
+        if delay is None or not fits(deadline, delay):
+            return http_response
+        time.sleep(delay)
+        _add_timing(timings, 'backoff', delay)
+
 
-    if exception is not None:
-        raise exception
+def get(
+        url,
+        params=None,
+        headers=None,
+        timeout=60,
+        retry_policy=None,
+        compression=None,
+        endpoint=None,
+        deadline=None,
+        stream=False,
+        max_body_size=None,
+        on_attempt=None,
+):
+    """
+    GETリクエストを発行する
+    :param url: URL
+    :type url: str or unicode
+    :param params: クエリストリング
+    :type params: dict
+    :param headers: リクエストヘッダ
+    :type headers: dict
+    :param timeout: タイムアウト時間(秒)
+    :type timeout: float
+    :param retry_policy: リトライポリシー。None の場合は DEFAULT_RETRY_POLICY
+    :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+    :param compression: HTTP 圧縮の設定。None の場合は圧縮しない
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param endpoint: 解析済みのエンドポイント。指定する場合 url は endpoint.base_url で始まること
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint or None
+    :param deadline: リトライを含めたリクエスト全体の期限(エポック秒)。None の場合は試行ごとに timeout まで待つ
+    :type deadline: float or None
+    :param stream: レスポンスボディを読み込まずに StreamingHttpResponse を返すか
+    :type stream: bool
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :param on_attempt: リトライする前に、失敗した試行のステータスコード(通信エラーの場合は None)を渡して呼び出す関数
+                       次の試行までに待つ必要のある時間(秒)を返す。None を返した場合はリトライしない
+    :type on_attempt: (int or None) -> float or None
+    :return: レスポンス
+    :rtype: HttpResponse
+    :raises DeadlineExceededError: 期限までにレスポンスを受信できなかった場合
+    :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
+    """
+    return _request(
+        'GET', url, params, headers, None, timeout, retry_policy, compression, endpoint, deadline, stream,
+        max_body_size, on_attempt)
 
 
 def post(
@@ -277,6 +1103,13 @@ def post(
         data=None,
         json=None,
         timeout=60,
+        retry_policy=None,
+        compression=None,
+        endpoint=None,
+        deadline=None,
+        stream=False,
+        max_body_size=None,
+        on_attempt=None,
 ):
     """
     POSTリクエストを発行する
@@ -288,69 +1121,40 @@ def post(
     :type headers: dict
     :param data: リクエストボディ(バイナリ)
     :type data: bytes
-    :param json: リクエストボディ(dict)
-    :type json: dict
+    :param json: リクエストボディ(dict またはエンコード済みの JSON)
+    :type json: dict or bytes
     :param timeout: タイムアウト時間(秒)
     :type timeout: float
+    :param retry_policy: リトライポリシー。None の場合は DEFAULT_RETRY_POLICY
+    :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+    :param compression: HTTP 圧縮の設定。None の場合は圧縮しない
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param endpoint: 解析済みのエンドポイント。指定する場合 url は endpoint.base_url で始まること
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint or None
+    :param deadline: リトライを含めたリクエスト全体の期限(エポック秒)。None の場合は試行ごとに timeout まで待つ
+    :type deadline: float or None
+    :param stream: レスポンスボディを読み込まずに StreamingHttpResponse を返すか
+    :type stream: bool
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :param on_attempt: リトライする前に、失敗した試行のステータスコード(通信エラーの場合は None)を渡して呼び出す関数
+                       次の試行までに待つ必要のある時間(秒)を返す。None を返した場合はリトライしない
+    :type on_attempt: (int or None) -> float or None
     :return: レスポンス
     :rtype: HttpResponse
+    :raises DeadlineExceededError: 期限までにレスポンスを受信できなかった場合
+    :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
     """
-    import socket
-    from httplib import HTTPException
-    import simplejson
+    from gs2_core_client.fast_requests import json_codec
 
-    if params is None:
-        params = {}
-    if headers is None:
-        headers = {}
     if json is not None:
-        data = simplejson.dumps(json)
+        data = json_codec.dumps(json)
     if data is None:
-        data = ''
-
-    if url.count('/') < 3:
-        url += '/'
-    host = _get_host(url)
-
-    headers['Host'] = host
-    headers['Connection'] = 'Keep-Alive'
-
-    if params:
-        url = '{url}?{query_strings}'.format(
-            url=url,
-            query_strings=_to_query_string(params),
-        )
-
-    exception = None
-    for _ in range(3):
-        connection = _create_connection(
-            url=url,
-            timeout=timeout,
-        )
-        try:
-            connection.request(
-                method='POST',
-                url=url,
-                headers=headers,
-                body=data,
-            )
-            response = connection.getresponse()
-            result = response.read()
-            try:
-                result = result.encode('utf-8')
-            except UnicodeDecodeError:
-                pass
-            return HttpResponse(
-                status_code=response.status,
-                headers=dict(response.getheaders()),
-                body=result
-            )
-        except (HTTPException, socket.error) as e:
-            _purge_connection_cache(url)
-            exception = e
+        data = b''
 
-    if exception is not None:
-        raise exception
+    return _request(
+        'POST', url, params, headers, data, timeout, retry_policy, compression, endpoint, deadline, stream,
+        max_body_size, on_attempt)
 
 
 def put(
@@ -360,6 +1164,13 @@ def put(
         data=None,
         json=None,
         timeout=60,
+        retry_policy=None,
+        compression=None,
+        endpoint=None,
+        deadline=None,
+        stream=False,
+        max_body_size=None,
+        on_attempt=None,
 ):
     """
     POSTリクエストを発行する
@@ -371,69 +1182,40 @@ def put(
     :type headers: dict
     :param data: リクエストボディ(バイナリ)
     :type data: bytes
-    :param json: リクエストボディ(dict)
-    :type json: dict
+    :param json: リクエストボディ(dict またはエンコード済みの JSON)
+    :type json: dict or bytes
     :param timeout: タイムアウト時間(秒)
     :type timeout: float
+    :param retry_policy: リトライポリシー。None の場合は DEFAULT_RETRY_POLICY
+    :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+    :param compression: HTTP 圧縮の設定。None の場合は圧縮しない
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param endpoint: 解析済みのエンドポイント。指定する場合 url は endpoint.base_url で始まること
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint or None
+    :param deadline: リトライを含めたリクエスト全体の期限(エポック秒)。None の場合は試行ごとに timeout まで待つ
+    :type deadline: float or None
+    :param stream: レスポンスボディを読み込まずに StreamingHttpResponse を返すか
+    :type stream: bool
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :param on_attempt: リトライする前に、失敗した試行のステータスコード(通信エラーの場合は None)を渡して呼び出す関数
+                       次の試行までに待つ必要のある時間(秒)を返す。None を返した場合はリトライしない
+    :type on_attempt: (int or None) -> float or None
     :return: レスポンス
     :rtype: HttpResponse
+    :raises DeadlineExceededError: 期限までにレスポンスを受信できなかった場合
+    :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
     """
-    import socket
-    from httplib import HTTPException
-    import simplejson
+    from gs2_core_client.fast_requests import json_codec
 
-    if params is None:
-        params = {}
-    if headers is None:
-        headers = {}
     if json is not None:
-        data = simplejson.dumps(json)
+        data = json_codec.dumps(json)
     if data is None:
-        data = ''
-
-    if url.count('/') < 3:
-        url += '/'
-    host = _get_host(url)
-
-    headers['Host'] = host
-    headers['Connection'] = 'Keep-Alive'
-
-    if params:
-        url = '{url}?{query_strings}'.format(
-            url=url,
-            query_strings=_to_query_string(params),
-        )
-
-    exception = None
-    for _ in range(3):
-        connection = _create_connection(
-            url=url,
-            timeout=timeout,
-        )
-        try:
-            connection.request(
-                method='PUT',
-                url=url,
-                headers=headers,
-                body=data,
-            )
-            response = connection.getresponse()
-            result = response.read()
-            try:
-                result = result.encode('utf-8')
-            except UnicodeDecodeError:
-                pass
-            return HttpResponse(
-                status_code=response.status,
-                headers=dict(response.getheaders()),
-                body=result
-            )
-        except (HTTPException, socket.error) as e:
-            _purge_connection_cache(url)
-            exception = e
+        data = b''
 
-    if exception is not None:
-        raise exception
+    return _request(
+        'PUT', url, params, headers, data, timeout, retry_policy, compression, endpoint, deadline, stream,
+        max_body_size, on_attempt)
 
 
 def delete(
@@ -441,6 +1223,13 @@ def delete(
         params=None,
         headers=None,
         timeout=60,
+        retry_policy=None,
+        compression=None,
+        endpoint=None,
+        deadline=None,
+        stream=False,
+        max_body_size=None,
+        on_attempt=None,
 ):
     """
     DELETEリクエストを発行する
@@ -452,56 +1241,26 @@ def delete(
     :type headers: dict
     :param timeout: タイムアウト時間(秒)
     :type timeout: float
+    :param retry_policy: リトライポリシー。None の場合は DEFAULT_RETRY_POLICY
+    :type retry_policy: gs2_core_client.fast_requests.retry.RetryPolicy or None
+    :param compression: HTTP 圧縮の設定。None の場合は圧縮しない
+    :type compression: gs2_core_client.fast_requests.compression.CompressionConfig or None
+    :param endpoint: 解析済みのエンドポイント。指定する場合 url は endpoint.base_url で始まること
+    :type endpoint: gs2_core_client.fast_requests.endpoint.Endpoint or None
+    :param deadline: リトライを含めたリクエスト全体の期限(エポック秒)。None の場合は試行ごとに timeout まで待つ
+    :type deadline: float or None
+    :param stream: レスポンスボディを読み込まずに StreamingHttpResponse を返すか
+    :type stream: bool
+    :param max_body_size: レスポンスボディの最大サイズ(バイト)。None の場合は無制限
+    :type max_body_size: int or None
+    :param on_attempt: リトライする前に、失敗した試行のステータスコード(通信エラーの場合は None)を渡して呼び出す関数
+                       次の試行までに待つ必要のある時間(秒)を返す。None を返した場合はリトライしない
+    :type on_attempt: (int or None) -> float or None
     :return: レスポンス
     :rtype: HttpResponse
+    :raises DeadlineExceededError: 期限までにレスポンスを受信できなかった場合
+    :raises ResponseTooLargeError: レスポンスボディが max_body_size を超えた場合
     """
-    import socket
-    from httplib import HTTPException
-
-    if params is None:
-        params = {}
-    if headers is None:
-        headers = {}
-
-    if url.count('/') < 3:
-        url += '/'
-    host = _get_host(url)
-
-    headers['Host'] = host
-    headers['Connection'] = 'Keep-Alive'
-
-    if params:
-        url = '{url}?{query_strings}'.format(
-            url=url,
-            query_strings=_to_query_string(params),
-        )
-
-    exception = None
-    for _ in range(3):
-        connection = _create_connection(
-            url=url,
-            timeout=timeout,
-        )
-        try:
-            connection.request(
-                method='DELETE',
-                url=url,
-                headers=headers,
-            )
-            response = connection.getresponse()
-            result = response.read()
-            try:
-                result = result.encode('utf-8')
-            except UnicodeDecodeError:
-                pass
-            return HttpResponse(
-                status_code=response.status,
-                headers=dict(response.getheaders()),
-                body=result
-            )
-        except (HTTPException, socket.error) as e:
-            _purge_connection_cache(url)
-            exception = e
-
-    if exception is not None:
-        raise exception
+    return _request(
+        'DELETE', url, params, headers, None, timeout, retry_policy, compression, endpoint, deadline, stream,
+        max_body_size, on_attempt)
@@ -0,0 +1,416 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+#
+# fast_requests が新しいコネクションを張る際の名前解決と接続先アドレスの選択
+
+import socket
+import threading
+import time
+
+try:
+    from Queue import Queue, Empty
+except ImportError:
+    from queue import Queue, Empty
+
+
+class SystemResolver(object):
+    """
+    OS のリゾルバ(getaddrinfo)で名前解決する
+    getaddrinfo はレコードの TTL を返さないため、TTL は常に None になる
+    """
+
+    def resolve(self, host, port):
+        """
+        ホスト名を解決する
+        :param host: ホスト名
+        :type host: str
+        :param port: ポート番号
+        :type port: int
+        :return: ([(アドレスファミリー, ソケットアドレス)], TTL(秒)。不明な場合は None)
+        :rtype: (list[(int, tuple)], float or None)
+        """
+        addresses = []
+        for family, _, _, _, sockaddr in socket.getaddrinfo(host, port, socket.AF_UNSPEC, socket.SOCK_STREAM):
+            address = (family, sockaddr)
+            if address not in addresses:
+                addresses.append(address)
+        return addresses, None
+
+
+class FakeResolver(object):
+
+    def __init__(self, records=None, ttl=None):
+        """
+        あらかじめ登録したレコードを返すリゾルバ。テストやローカル環境での検証に使用する
+        :param records: ホスト名をキーとした IP アドレスのリスト
+        :type records: dict[str, list[str]] or None
+        :param ttl: 返却する TTL(秒)
+        :type ttl: float or None
+        """
+        self.records = dict(records) if records else {}
+        self.ttl = ttl
+        self.lookups = 0
+
+    def resolve(self, host, port):
+        """
+        ホスト名を解決する。登録されていないホスト名の場合は socket.gaierror を送出する
+        :param host: ホスト名
+        :type host: str
+        :param port: ポート番号
+        :type port: int
+        :return: ([(アドレスファミリー, ソケットアドレス)], TTL(秒))
+        :rtype: (list[(int, tuple)], float or None)
+        """
+        self.lookups += 1
+        records = self.records.get(host)
+        if not records:
+            raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known')
+        addresses = []
+        for address in records:
+            if ':' in address:
+                addresses.append((socket.AF_INET6, (address, port, 0, 0)))
+            else:
+                addresses.append((socket.AF_INET, (address, port)))
+        return addresses, self.ttl
+
+
+def _parse_ip_address(host, port):
+    """
+    ホスト名が IP アドレスの場合はそのままアドレスにする
+    :param host: ホスト名
+    :type host: str
+    :param port: ポート番号
+    :type port: int
+    :return: [(アドレスファミリー, ソケットアドレス)]。IP アドレスでない場合は None
+    :rtype: list[(int, tuple)] or None
+    """
+    try:
+        socket.inet_pton(socket.AF_INET, host)
+        return [(socket.AF_INET, (host, port))]
+    except (socket.error, ValueError):
+        pass
+    try:
+        socket.inet_pton(socket.AF_INET6, host)
+        return [(socket.AF_INET6, (host, port, 0, 0))]
+    except (socket.error, ValueError):
+        return None
+
+
+class CachingResolver(object):
+
+    def __init__(self, resolver=None, ttl=30.0, negative_ttl=5.0, max_entries=1024):
+        """
+        名前解決の結果をプロセス内にキャッシュするリゾルバ
+        解決に失敗した結果も negative_ttl の間キャッシュし、同じ例外を送出する
+        :param resolver: 実際に名前解決するリゾルバ。None の場合は SystemResolver
+        :type resolver: SystemResolver or FakeResolver or None
+        :param ttl: リゾルバが TTL を返さない場合のキャッシュ時間(秒)。リゾルバが返した TTL はこれより優先する
+        :type ttl: float
+        :param negative_ttl: 解決に失敗した結果のキャッシュ時間(秒)
+        :type negative_ttl: float
+        :param max_entries: キャッシュするホスト数の上限
+        :type max_entries: int
+        """
+        self.__resolver = resolver if resolver is not None else SystemResolver()
+        self.__ttl = ttl
+        self.__negative_ttl = negative_ttl
+        self.__max_entries = max_entries
+        self.__entries = {}
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__negative_hits = 0
+
+    def reset_after_fork(self):
+        """
+        fork した子プロセスで呼び出す。親プロセスのスレッドが保持していた可能性のあるロックを作り直す
+        名前解決の結果は子プロセスでもそのまま使えるため保持する
+        """
+        self.__lock = threading.Lock()
+
+    def resolve(self, host, port):
+        """
+        ホスト名を解決する
+        :param host: ホスト名
+        :type host: str
+        :param port: ポート番号
+        :type port: int
+        :return: [(アドレスファミリー, ソケットアドレス)]
+        :rtype: list[(int, tuple)]
+        """
+        key = (host, port)
+        entry = self.__entries.get(key)
+        if entry is None:
+            addresses = _parse_ip_address(host, port)
+            if addresses is not None:
+                return addresses
+
+        now = time.time()
+        if entry is not None and entry[0] > now:
+            expires_at, addresses, error = entry
+            with self.__lock:
+                if error is None:
+                    self.__hits += 1
+                else:
+                    self.__negative_hits += 1
+            if error is not None:
+                raise error
+            return addresses
+
+        with self.__lock:
+            self.__misses += 1
+        try:
+            addresses, ttl = self.__resolver.resolve(host, port)
+        except socket.gaierror as e:
+            self.__store(key, (now + self.__negative_ttl, None, e))
+            raise
+        self.__store(key, (now + (self.__ttl if ttl is None else ttl), addresses, None))
+        return addresses
+
+    def __store(self, key, entry):
+        with self.__lock:
+            if key not in self.__entries and len(self.__entries) >= self.__max_entries:
+                self.__entries.clear()
+            self.__entries[key] = entry
+
+    def invalidate(self, host=None):
+        """
+        キャッシュを破棄する
+        :param host: 破棄するホスト名。None の場合はすべて破棄する
+        :type host: str or None
+        """
+        with self.__lock:
+            if host is None:
+                self.__entries.clear()
+            else:
+                for key in [key for key in self.__entries if key[0] == host]:
+                    del self.__entries[key]
+
+    def get_stats(self):
+        """
+        キャッシュの統計情報を取得する
+        :return: 統計情報 (entries, hits, misses, negative_hits)
+        :rtype: dict
+        """
+        with self.__lock:
+            return {
+                'entries': len(self.__entries),
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'negative_hits': self.__negative_hits,
+            }
+
+
+class AddressBalancer(object):
+
+    ROUND_ROBIN = 'round_robin'
+    LEAST_LOADED = 'least_loaded'
+
+    def __init__(self, strategy=LEAST_LOADED):
+        """
+        ひとつのホスト名が複数のアドレスに解決される場合に、コネクションを各アドレスに分散させる
+        :param strategy: 分散方法。round_robin は順番に、least_loaded は開いているコネクションが最も少ないアドレスを優先する
+        :type strategy: str
+        """
+        if strategy not in (self.ROUND_ROBIN, self.LEAST_LOADED):
+            raise ValueError('invalid strategy: {strategy}'.format(strategy=strategy))
+        self.__strategy = strategy
+        self.__lock = threading.Lock()
+        self.__counter = 0
+        self.__active = {}
+
+    def reset_after_fork(self):
+        """
+        fork した子プロセスで呼び出す。ロックを作り直し、親プロセスのコネクションの集計を破棄する
+        """
+        self.__lock = threading.Lock()
+        self.__active = {}
+
+    def order(self, addresses):
+        """
+        接続を試みる順にアドレスを並べる
+        :param addresses: [(アドレスファミリー, ソケットアドレス)]
+        :type addresses: list[(int, tuple)]
+        :return: 並べ替えたアドレス
+        :rtype: list[(int, tuple)]
+        """
+        if len(addresses) < 2:
+            return list(addresses)
+        with self.__lock:
+            offset = self.__counter % len(addresses)
+            self.__counter += 1
+            rotated = addresses[offset:] + addresses[:offset]
+            if self.__strategy == self.ROUND_ROBIN:
+                return rotated
+            active = self.__active
+            # sorted は安定ソートなので、負荷が同じアドレスの間ではラウンドロビンの順序が保たれる
+            return sorted(rotated, key=lambda address: active.get(address[1][0], 0))
+
+    def acquire(self, ip):
+        """
+        アドレスへのコネクションが開かれたことを記録する
+        :param ip: IP アドレス
+        :type ip: str
+        """
+        with self.__lock:
+            self.__active[ip] = self.__active.get(ip, 0) + 1
+
+    def release(self, ip):
+        """
+        アドレスへのコネクションが閉じられたことを記録する
+        :param ip: IP アドレス
+        :type ip: str
+        """
+        with self.__lock:
+            count = self.__active.get(ip, 0) - 1
+            if count > 0:
+                self.__active[ip] = count
+            else:
+                self.__active.pop(ip, None)
+
+    def get_stats(self):
+        """
+        アドレスごとの開いているコネクション数を取得する
+        :return: IP アドレスをキーとしたコネクション数
+        :rtype: dict[str, int]
+        """
+        with self.__lock:
+            return dict(self.__active)
+
+
+def interleave(addresses):
+    """
+    アドレスファミリーが交互になるように並べ替える (RFC 8305 Happy Eyeballs)
+    最初のアドレスのファミリーを優先する
+    :param addresses: [(アドレスファミリー, ソケットアドレス)]
+    :type addresses: list[(int, tuple)]
+    :return: 並べ替えたアドレス
+    :rtype: list[(int, tuple)]
+    """
+    if len(addresses) < 2:
+        return list(addresses)
+    first_family = addresses[0][0]
+    preferred = [address for address in addresses if address[0] == first_family]
+    others = [address for address in addresses if address[0] != first_family]
+    result = []
+    for i in range(max(len(preferred), len(others))):
+        if i < len(preferred):
+            result.append(preferred[i])
+        if i < len(others):
+            result.append(others[i])
+    return result
+
+
+def _connect_address(address, timeout, source_address):
+    """
+    ひとつのアドレスに TCP 接続する
+    :return: ソケット
+    :rtype: socket.socket
+    """
+    family, sockaddr = address
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        if timeout is not None and timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+            sock.settimeout(timeout)
+        if source_address:
+            sock.bind(source_address)
+        sock.connect(sockaddr)
+        return sock
+    except BaseException:
+        sock.close()
+        raise
+
+
+def connect(addresses, timeout, source_address=None, attempt_delay=0.25):
+    """
+    アドレスのリストのいずれかに TCP 接続する
+    先に開始した接続が attempt_delay 秒以内に確立しなければ次のアドレスへの接続を並行して開始し、最初に確立した接続を使う
+    :param addresses: 接続を試みる順に並べた [(アドレスファミリー, ソケットアドレス)]
+    :type addresses: list[(int, tuple)]
+    :param timeout: タイムアウト時間(秒)
+    :type timeout: float or None
+    :param source_address: 接続元のアドレス
+    :type source_address: tuple or None
+    :param attempt_delay: 次のアドレスへの接続を開始するまでの待ち時間(秒)
+    :type attempt_delay: float
+    :return: (接続したアドレス, ソケット)
+    :rtype: ((int, tuple), socket.socket)
+    """
+    if not addresses:
+        raise socket.error('no address to connect')
+    if len(addresses) == 1:
+        return addresses[0], _connect_address(addresses[0], timeout, source_address)
+
+    results = Queue()
+    lock = threading.Lock()
+    state = {'done': False}
+
+    def attempt(address):
+        try:
+            sock = _connect_address(address, timeout, source_address)
+        except Exception as e:
+            results.put((address, None, e))
+            return
+        with lock:
+            won = not state['done']
+            state['done'] = True
+        if won:
+            results.put((address, sock, None))
+        else:
+            sock.close()
+
+    deadline = None
+    if timeout is not None and timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+        deadline = time.time() + timeout
+    started = 0
+    failed = 0
+    last_error = None
+    while failed < len(addresses):
+        if started < len(addresses) and started == failed:
+            wait = 0
+        elif started < len(addresses):
+            wait = attempt_delay
+        elif deadline is not None:
+            wait = max(0, deadline - time.time())
+        else:
+            wait = None
+        if wait != 0:
+            try:
+                address, sock, error = results.get(timeout=wait)
+            except Empty:
+                if started == len(addresses):
+                    break
+                address = None
+            if address is not None:
+                if sock is not None:
+                    return address, sock
+                failed += 1
+                last_error = error
+                continue
+        thread = threading.Thread(target=attempt, args=(addresses[started],))
+        thread.daemon = True
+        thread.start()
+        started += 1
+
+    with lock:
+        state['done'] = True
+    while not results.empty():
+        sock = results.get()[1]
+        if sock is not None:
+            sock.close()
+    if last_error is not None and failed == len(addresses):
+        raise last_error
+    raise socket.timeout('timed out')
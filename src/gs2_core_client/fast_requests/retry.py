@@ -0,0 +1,175 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import random
+import time
+
+
+def _parse_retry_after(value):
+    """
+    Retry-After ヘッダの値を秒数に変換する
+    :param value: Retry-After ヘッダの値(秒数 または HTTP-date)
+    :type value: str
+    :return: 待機時間(秒)。解釈できない場合は None
+    :rtype: float or None
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_tz, mktime_tz
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(0.0, mktime_tz(parsed) - time.time())
+
+
+class RetryPolicy(object):
+
+    def __init__(
+            self,
+            max_attempts=3,
+            backoff_base=0.05,
+            backoff_max=2.0,
+            jitter=True,
+            retry_statuses=(502, 503, 504),
+            non_idempotent_retry_statuses=(503,),
+            respect_retry_after=True,
+            max_retry_after=30.0,
+            idempotent_methods=('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'),
+            retry_stale_connections=True,
+            total_timeout=None,
+    ):
+        """
+        リトライポリシー
+        :param max_attempts: 最大試行回数(初回を含む)
+        :type max_attempts: int
+        :param backoff_base: 指数バックオフの基準時間(秒)
+        :type backoff_base: float
+        :param backoff_max: バックオフの上限(秒)
+        :type backoff_max: float
+        :param jitter: バックオフに Full Jitter を適用するか
+        :type jitter: bool
+        :param retry_statuses: 冪等なメソッドでリトライするステータスコード
+        :type retry_statuses: tuple[int]
+        :param non_idempotent_retry_statuses: 冪等でないメソッドでもリトライするステータスコード
+        :type non_idempotent_retry_statuses: tuple[int]
+        :param respect_retry_after: Retry-After ヘッダに従うか
+        :type respect_retry_after: bool
+        :param max_retry_after: Retry-After に従って待つ最大時間(秒)。これを超える場合はリトライしない
+        :type max_retry_after: float
+        :param idempotent_methods: 冪等とみなす HTTP メソッド
+        :type idempotent_methods: tuple[str]
+        :param retry_stale_connections: 再利用したキープアライブ接続がレスポンスを受け取る前に切断された場合に、冪等でないメソッドもリトライするか
+        :type retry_stale_connections: bool
+        :param total_timeout: 初回の試行開始からリトライを打ち切るまでの時間(秒)。None の場合は無制限
+        :type total_timeout: float or None
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.non_idempotent_retry_statuses = frozenset(non_idempotent_retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.idempotent_methods = frozenset(idempotent_methods)
+        self.retry_stale_connections = retry_stale_connections
+        self.total_timeout = total_timeout
+
+    def is_idempotent(self, method):
+        """
+        冪等なメソッドか
+        :param method: HTTPメソッド
+        :type method: str
+        :rtype: bool
+        """
+        return method in self.idempotent_methods
+
+    def is_retryable_status(self, method, status_code):
+        """
+        ステータスコードがリトライ対象か
+        :param method: HTTPメソッド
+        :type method: str
+        :param status_code: ステータスコード
+        :type status_code: int
+        :rtype: bool
+        """
+        if status_code in self.non_idempotent_retry_statuses:
+            return True
+        return status_code in self.retry_statuses and self.is_idempotent(method)
+
+    def is_retryable_error(self, method, connected, stale):
+        """
+        通信エラーがリトライ対象か
+        :param method: HTTPメソッド
+        :type method: str
+        :param connected: 接続が確立した後のエラーか。False の場合リクエストはサーバーに届いていない
+        :type connected: bool
+        :param stale: 再利用したキープアライブ接続がレスポンスを受け取る前に切断されたか
+        :type stale: bool
+        :rtype: bool
+        """
+        if not connected or self.is_idempotent(method):
+            return True
+        return stale and self.retry_stale_connections
+
+    def compute_backoff(self, attempt):
+        """
+        バックオフ時間を計算する
+        :param attempt: 失敗した試行の回数(1 から始まる)
+        :type attempt: int
+        :return: 待機時間(秒)
+        :rtype: float
+        """
+        backoff = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
+
+    def get_retry_delay(self, attempt, started_at, headers=None):
+        """
+        次の試行までの待機時間を取得する。試行回数や時間の上限に達している場合は None を返す
+        :param attempt: 失敗した試行の回数(1 から始まる)
+        :type attempt: int
+        :param started_at: 初回の試行を開始した時刻
+        :type started_at: float
+        :param headers: 直前のレスポンスヘッダ(キーは小文字)
+        :type headers: dict or None
+        :return: 待機時間(秒)
+        :rtype: float or None
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        delay = None
+        if self.respect_retry_after and headers:
+            delay = _parse_retry_after(headers.get('retry-after'))
+            if delay is not None and delay > self.max_retry_after:
+                return None
+        if delay is None:
+            delay = self.compute_backoff(attempt)
+
+        if self.total_timeout is not None and time.time() + delay - started_at > self.total_timeout:
+            return None
+        return delay
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+NO_RETRY_POLICY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,119 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import ssl
+import threading
+
+
+class TlsStats(object):
+
+    def __init__(self):
+        """
+        TLS ハンドシェイクの統計情報
+        """
+        self.__lock = threading.Lock()
+        self.__full = 0
+        self.__resumed = 0
+
+    def record(self, resumed):
+        """
+        ハンドシェイクを記録する
+        :param resumed: セッションを再開した(フルハンドシェイクを省略した)か
+        :type resumed: bool
+        """
+        with self.__lock:
+            if resumed:
+                self.__resumed += 1
+            else:
+                self.__full += 1
+
+    def reset_after_fork(self):
+        """
+        fork した子プロセスで呼び出す。親プロセスのスレッドが保持していた可能性のあるロックを作り直す
+        """
+        self.__lock = threading.Lock()
+
+    def get_stats(self):
+        """
+        統計情報を取得する
+        :return: 統計情報 (handshakes, full, resumed)
+        :rtype: dict
+        """
+        with self.__lock:
+            return {
+                'handshakes': self.__full + self.__resumed,
+                'full': self.__full,
+                'resumed': self.__resumed,
+            }
+
+
+class SessionResumingContext(ssl.SSLContext):
+    """
+    接続先のホスト名ごとに TLS セッションを保持し、次の接続でセッションの再開を試みる SSLContext
+    asyncio が内部で呼び出す wrap_bio にセッションを渡すため、Python 3.6 以降でのみ効果がある
+    """
+
+    max_sessions = 1024
+
+    # SSLContext は __new__ で生成されるため、セッションの辞書は最初に保持する際に作成する
+    _sessions = None
+
+    def remember_session(self, server_hostname, ssl_object):
+        """
+        ハンドシェイクを終えた接続のセッションを保持する
+        TLS 1.3 ではセッションチケットがハンドシェイク後に届くため、レスポンスを受信した後に呼び出すこと
+        :param server_hostname: 接続先のホスト名
+        :type server_hostname: str
+        :param ssl_object: 接続の SSLObject または SSLSocket
+        :type ssl_object: ssl.SSLObject or ssl.SSLSocket
+        """
+        session = getattr(ssl_object, 'session', None)
+        if session is None:
+            return
+        sessions = self._sessions
+        if sessions is None:
+            sessions = self._sessions = {}
+        if server_hostname not in sessions and len(sessions) >= self.max_sessions:
+            sessions.clear()
+        sessions[server_hostname] = session
+
+    def forget_sessions(self):
+        """
+        保持しているセッションをすべて破棄する
+        """
+        self._sessions = None
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        if session is None and not server_side and self._sessions:
+            session = self._sessions.get(server_hostname)
+        return ssl.SSLContext.wrap_bio(self, incoming, outgoing, server_side, server_hostname, session)
+
+
+def create_session_resuming_context(verify=True):
+    """
+    ssl.create_default_context() と同じ設定の SessionResumingContext を生成する
+    :param verify: サーバー証明書を検証するか
+    :type verify: bool
+    :return: SSLContext
+    :rtype: SessionResumingContext
+    """
+    context = SessionResumingContext(ssl.PROTOCOL_TLS_CLIENT)
+    if verify:
+        context.load_default_certs(ssl.Purpose.SERVER_AUTH)
+    else:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
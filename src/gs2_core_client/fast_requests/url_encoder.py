@@ -0,0 +1,97 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+try:
+    from urllib import quote
+except ImportError:
+    from urllib.parse import quote
+
+try:
+    _unicode = unicode
+    _text_types = (str, unicode)
+    _integer_types = (int, long)
+except NameError:
+    _unicode = None
+    _text_types = (str, bytes)
+    _integer_types = (int,)
+
+# RFC 3986 の非予約文字以外をエスケープする
+_SAFE = '-_.~'
+
+_memo = {}
+
+_max_memo_size = 4096
+
+
+def _quote(text):
+    """
+    文字列をパーセントエンコードする
+    :param text: 文字列
+    :type text: str or unicode or bytes
+    :return: エンコードした文字列
+    :rtype: str
+    """
+    if _unicode is not None and isinstance(text, _unicode):
+        text = text.encode('utf-8')
+    return quote(text, safe=_SAFE)
+
+
+def encode(value):
+    """
+    クエリストリングの値をパーセントエンコードする。同じ文字列のエンコード結果は再利用する
+    :param value: 値。文字列以外は str() で文字列にする
+    :type value: str or unicode or int or float or bool
+    :return: エンコードした値
+    :rtype: str
+    """
+    if not isinstance(value, _text_types):
+        if isinstance(value, _integer_types):
+            # 整数(bool を含む)の文字列表現はエスケープが必要な文字を含まない
+            return str(value)
+        return _quote(str(value))
+
+    encoded = _memo.get(value)
+    if encoded is None:
+        encoded = _quote(value)
+        if len(_memo) >= _max_memo_size:
+            _memo.clear()
+        _memo[value] = encoded
+    return encoded
+
+
+def to_query_string(query_strings):
+    """
+    辞書配列からクエリストリングに変換する
+    キーの昇順に並べるため、同じ内容の辞書配列からは常に同じ文字列が得られる
+    値が None のパラメータは出力せず、値がリストまたはタプルの場合は要素ごとに同じキーで出力する
+    :param query_strings: クエリストリング(辞書配列)
+    :type query_strings: dict
+    :return: クエリストリング(文字列)
+    :rtype: str
+    """
+    parts = []
+    for key in sorted(query_strings):
+        value = query_strings[key]
+        if value is None:
+            continue
+        encoded_key = encode(key)
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                if item is not None:
+                    parts.append(encoded_key + '=' + encode(item))
+        else:
+            parts.append(encoded_key + '=' + encode(value))
+    return '&'.join(parts)
@@ -15,6 +15,7 @@
 # permissions and limitations under the License.
 
 from gs2_core_client.model.IGs2Credential import IGs2Credential
+from gs2_core_client.model.RequestSigner import RequestSigner
 
 
 class BasicGs2Credential(IGs2Credential):
@@ -29,7 +30,7 @@ class BasicGs2Credential(IGs2Credential):
         """
         super(IGs2Credential, self).__init__()
         self.__client_id = client_id
-        self.__client_secret = client_secret
+        self.__signer = RequestSigner(client_secret)
 
     def authorized(self, module, function, headers, timestamp):
         """
@@ -43,15 +44,14 @@ class BasicGs2Credential(IGs2Credential):
         :param timestamp: リクエスト時間
         :type timestamp: int
         """
-        import base64
-        import hashlib
-        import hmac
-
         headers['X-GS2-CLIENT-ID'] = self.__client_id
         headers['X-GS2-REQUEST-TIMESTAMP'] = str(timestamp)
-        headers['X-GS2-REQUEST-SIGN'] = base64.b64encode(
-            hmac.new(
-                base64.b64decode(self.__client_secret),
-                module + ":" + function + ":" + str(timestamp),
-                hashlib.sha256
-            ).digest())
\ No newline at end of file
+        headers['X-GS2-REQUEST-SIGN'] = self.__signer.sign(module, function, timestamp)
+
+    def get_identity(self):
+        """
+        レスポンスキャッシュなどで認証情報を区別するための識別子を取得
+        :return: クライアントID
+        :rtype: str
+        """
+        return self.__client_id
@@ -32,4 +32,12 @@ class IGs2Credential(object):
         :param timestamp: リクエスト時間
         :type timestamp: int
         """
-        pass
\ No newline at end of file
+        pass
+
+    def get_identity(self):
+        """
+        レスポンスキャッシュなどで認証情報を区別するための識別子を取得
+        :return: 識別子
+        :rtype: str
+        """
+        return str(id(self))
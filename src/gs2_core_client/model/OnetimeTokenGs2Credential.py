@@ -42,3 +42,11 @@ class OnetimeTokenGs2Credential(IGs2Credential):
         """
         headers['X-GS2-ONETIME-TOKEN'] = self.__onetime_token
         headers['X-GS2-REQUEST-TIMESTAMP'] = str(timestamp)
+
+    def get_identity(self):
+        """
+        レスポンスキャッシュなどで認証情報を区別するための識別子を取得
+        :return: ワンタイムトークン
+        :rtype: str
+        """
+        return self.__onetime_token
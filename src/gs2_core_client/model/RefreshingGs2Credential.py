@@ -0,0 +1,185 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import threading
+import time
+
+from gs2_core_client.Gs2SingleFlight import Gs2SingleFlight
+from gs2_core_client.model.IGs2Credential import IGs2Credential
+
+
+class RefreshingGs2Credential(IGs2Credential):
+
+    def __init__(self, refresher, refresh_before=60.0, retry_interval=5.0, clock=None, timer_factory=None):
+        """
+        コンストラクタ
+        ワンタイムトークンを refresher で取得し、有効期限の refresh_before 秒前からバックグラウンドで更新する
+        同時に更新が必要になった呼び出しは実行中の1回の更新を共有する
+        リクエストが更新を待つのはトークンが失効している場合(最初のリクエストを含む)のみ
+        :param refresher: (ワンタイムトークン, 有効期限(エポック秒)) を返す関数
+        :type refresher: () -> (str, float)
+        :param refresh_before: 有効期限の何秒前から更新するか
+        :type refresh_before: float
+        :param retry_interval: バックグラウンドでの更新に失敗した場合に再試行するまでの時間(秒)。更新の間隔の下限も兼ねる
+        :type retry_interval: float
+        :param clock: 現在時刻(エポック秒)を返す関数。None の場合は time.time
+        :type clock: () -> float
+        :param timer_factory: (待ち時間(秒), 実行する関数) を受け取り、バックグラウンドでの更新を予約するタイマーを返す関数
+                              None の場合は threading.Timer
+        :type timer_factory: (float, () -> None) -> threading.Timer
+        """
+        super(IGs2Credential, self).__init__()
+        self.__refresher = refresher
+        self.__refresh_before = refresh_before
+        self.__retry_interval = retry_interval
+        self.__clock = clock if clock is not None else time.time
+        self.__timer_factory = timer_factory if timer_factory is not None else threading.Timer
+        self.__single_flight = Gs2SingleFlight()
+        self.__lock = threading.Lock()
+        # (ワンタイムトークン, 有効期限, 更新を始める時刻) の組。置き換えだけで更新するためロックなしで参照できる
+        self.__current = None
+        self.__background_after = 0.0
+        self.__timer = None
+        self.__closed = False
+        self.__refreshes = 0
+        self.__failures = 0
+        self.__last_error = None
+
+    def authorized(self, module, function, headers, timestamp):
+        """
+        認証処理
+        :param module: モジュール名
+        :type module: str
+        :param function: ファンクション名
+        :type function: str
+        :param headers: リクエストヘッダ
+        :type headers: dict
+        :param timestamp: リクエスト時間
+        :type timestamp: int
+        """
+        headers['X-GS2-ONETIME-TOKEN'] = self.get_token()
+        headers['X-GS2-REQUEST-TIMESTAMP'] = str(timestamp)
+
+    def get_token(self):
+        """
+        有効なワンタイムトークンを取得する
+        失効している場合は更新を待ち、有効期限が近い場合はバックグラウンドで更新を始めて現在のトークンを返す
+        :return: ワンタイムトークン
+        :rtype: str
+        """
+        current = self.__current
+        now = self.__clock()
+        if current is None or now >= current[1]:
+            return self.__single_flight.do('refresh', self.__refresh_if_expired)[0]
+        if now >= current[2]:
+            self.__refresh_in_background(now)
+        return current[0]
+
+    def refresh(self):
+        """
+        ワンタイムトークンをすぐに更新する。更新中の場合はその完了を待って結果を共有する
+        :return: ワンタイムトークン
+        :rtype: str
+        """
+        return self.__single_flight.do('refresh', self.__refresh)[0]
+
+    def close(self):
+        """
+        予約しているバックグラウンドでの更新を取り消す。以降は失効したときにだけ更新する
+        """
+        with self.__lock:
+            self.__closed = True
+            timer, self.__timer = self.__timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def get_stats(self):
+        """
+        統計情報を取得する
+        :return: 統計情報 (refreshes: 更新した回数, failures: 更新に失敗した回数, shared: 実行中の更新を共有した回数,
+                 expires_at: 現在のトークンの有効期限, last_error: 最後に発生した例外)
+        :rtype: dict
+        """
+        current = self.__current
+        with self.__lock:
+            return {
+                'refreshes': self.__refreshes,
+                'failures': self.__failures,
+                'shared': self.__single_flight.get_stats()['shared'],
+                'expires_at': current[1] if current is not None else None,
+                'last_error': self.__last_error,
+            }
+
+    def __refresh_if_expired(self):
+        # 更新を待っている間に、先行する呼び出しが更新を終えている場合がある
+        current = self.__current
+        if current is not None and self.__clock() < current[1]:
+            return current
+        return self.__refresh()
+
+    def __refresh(self):
+        try:
+            token, expires_at = self.__refresher()
+        except Exception as e:
+            with self.__lock:
+                self.__failures += 1
+                self.__last_error = e
+                # 再試行は予約したタイマーに任せ、get_token() からは retry_interval の間は重ねて更新しない
+                self.__background_after = self.__clock() + self.__retry_interval
+            current = self.__current
+            if current is not None and self.__clock() + self.__retry_interval < current[1]:
+                # まだ有効なトークンがあるうちは、失効する前に再試行する
+                self.__schedule(self.__retry_interval)
+            raise
+
+        now = self.__clock()
+        delay = self.__get_refresh_delay(expires_at - now)
+        current = self.__current = (token, expires_at, now + delay)
+        with self.__lock:
+            self.__refreshes += 1
+        self.__schedule(delay)
+        return current
+
+    def __get_refresh_delay(self, lifetime):
+        # 有効期間が refresh_before 以下のトークンは期間の半分で更新する
+        # retry_interval を下限とし、短命なトークンでも更新が連続しないようにする
+        return max(lifetime - self.__refresh_before, lifetime / 2.0, self.__retry_interval)
+
+    def __refresh_in_background(self, now):
+        with self.__lock:
+            if now < self.__background_after:
+                return
+            self.__background_after = now + self.__retry_interval
+        thread = threading.Thread(target=self.__background_refresh)
+        thread.daemon = True
+        thread.start()
+
+    def __background_refresh(self):
+        try:
+            self.__single_flight.do('refresh', self.__refresh)
+        except Exception:
+            # 失敗は get_stats() の last_error で確認できる。失効するまでは現在のトークンを使い続ける
+            pass
+
+    def __schedule(self, delay):
+        with self.__lock:
+            if self.__closed:
+                return
+            if self.__timer is not None:
+                self.__timer.cancel()
+            timer = self.__timer = self.__timer_factory(max(delay, 0.0), self.__background_refresh)
+            timer.daemon = True
+        timer.start()
@@ -17,6 +17,8 @@
 
 class RequestError(object):
 
+    __slots__ = ('__component', '__message')
+
     def __init__(self, component, message):
         """
         コンストラクタ
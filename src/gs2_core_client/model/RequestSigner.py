@@ -0,0 +1,61 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import base64
+import hashlib
+import hmac
+
+
+class RequestSigner(object):
+
+    def __init__(self, client_secret):
+        """
+        コンストラクタ
+        クライアントシークレットのデコードと HMAC の鍵スケジュールは生成時に一度だけ行い、
+        署名時は鍵を設定済みの HMAC を複製して使う
+        :param client_secret: クライアントシークレット(Base64)
+        :type client_secret: str
+        """
+        self.__hmac = hmac.new(base64.b64decode(client_secret), digestmod=hashlib.sha256)
+        self.__memo = (None, {})
+
+    def sign(self, module, function, timestamp):
+        """
+        リクエスト署名を計算する
+        同じタイムスタンプ(秒)内の同じファンクションへの署名は使い回す
+        :param module: モジュール名
+        :type module: str
+        :param function: ファンクション名
+        :type function: str
+        :param timestamp: リクエスト時間
+        :type timestamp: int
+        :return: 署名(Base64)
+        :rtype: str
+        """
+        memo_timestamp, memo = self.__memo
+        if memo_timestamp == timestamp:
+            sign = memo.get((module, function))
+            if sign is not None:
+                return sign
+        else:
+            memo = {}
+            self.__memo = (timestamp, memo)
+
+        mac = self.__hmac.copy()
+        mac.update((module + ":" + function + ":" + str(timestamp)).encode('utf-8'))
+        sign = str(base64.b64encode(mac.digest()).decode('ascii'))
+        memo[(module, function)] = sign
+        return sign
@@ -1,5 +1,7 @@
-from BasicGs2Credential import BasicGs2Credential
-from IGs2Credential import IGs2Credential
-from OnetimeTokenGs2Credential import OnetimeTokenGs2Credential
-from Region import Region
-from RequestError import RequestError
+from gs2_core_client.model.BasicGs2Credential import BasicGs2Credential
+from gs2_core_client.model.IGs2Credential import IGs2Credential
+from gs2_core_client.model.OnetimeTokenGs2Credential import OnetimeTokenGs2Credential
+from gs2_core_client.model.RefreshingGs2Credential import RefreshingGs2Credential
+from gs2_core_client.model.Region import Region
+from gs2_core_client.model.RequestError import RequestError
+from gs2_core_client.model.RequestSigner import RequestSigner
@@ -0,0 +1,132 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+import sys
+import unittest
+
+import tests  # noqa: F401  src を import パスに追加する
+
+
+class _Connection(object):
+
+    def __init__(self):
+        self.closed = False
+
+    def is_reusable(self):
+        return not self.closed
+
+    def close(self):
+        self.closed = True
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'the async client requires Python 3.5 or later')
+class AsyncConnectionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        import asyncio
+
+        self.loop = asyncio.new_event_loop()
+        self.error = None
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _factory(self):
+        future = self.loop.create_future()
+        if self.error is not None:
+            future.set_exception(self.error)
+        else:
+            future.set_result(_Connection())
+        return future
+
+    def _create_pool(self, **options):
+        from gs2_core_client.fast_requests.async_requests import _AsyncConnectionPool
+
+        return _AsyncConnectionPool(self.loop, self._factory, **options)
+
+    def _settle(self):
+        import asyncio
+
+        for _ in range(3):
+            self.loop.run_until_complete(asyncio.sleep(0))
+
+    def test_checkout_waits_for_checkin(self):
+        pool = self._create_pool(max_size=2)
+        first, _ = self.loop.run_until_complete(pool.checkout())
+        self.loop.run_until_complete(pool.checkout())
+        waiting = self.loop.create_task(pool.checkout())
+        self._settle()
+        self.assertFalse(waiting.done())
+
+        pool.checkin(first)
+        self.assertEqual((first, True), self.loop.run_until_complete(waiting))
+        self.assertEqual(2, pool.get_stats()['in_use'])
+        self.assertEqual(2, pool.get_stats()['created'])
+
+    def test_non_blocking_pool_raises(self):
+        from gs2_core_client.fast_requests.pool import PoolExhaustedError
+
+        pool = self._create_pool(max_size=1, block=False)
+        self.loop.run_until_complete(pool.checkout())
+        with self.assertRaises(PoolExhaustedError):
+            self.loop.run_until_complete(pool.checkout())
+
+    def test_block_timeout(self):
+        from gs2_core_client.fast_requests.pool import PoolExhaustedError
+
+        pool = self._create_pool(max_size=1, block_timeout=0.01)
+        self.loop.run_until_complete(pool.checkout())
+        with self.assertRaises(PoolExhaustedError):
+            self.loop.run_until_complete(pool.checkout())
+        self.assertEqual(1, pool.get_stats()['in_use'])
+
+    def test_cancelled_waiter_passes_slot_on(self):
+        pool = self._create_pool(max_size=1)
+        connection, _ = self.loop.run_until_complete(pool.checkout())
+        first = self.loop.create_task(pool.checkout())
+        second = self.loop.create_task(pool.checkout())
+        self._settle()
+
+        pool.discard(connection)
+        first.cancel()
+        self.assertFalse(self.loop.run_until_complete(second)[1])
+        self.assertTrue(first.cancelled())
+        self.assertEqual(1, pool.get_stats()['in_use'])
+
+    def test_failed_connect_releases_slot(self):
+        pool = self._create_pool(max_size=1)
+        self.error = OSError('connection refused')
+        with self.assertRaises(OSError):
+            self.loop.run_until_complete(pool.checkout())
+
+        self.error = None
+        self.loop.run_until_complete(pool.checkout())
+        self.assertEqual({'in_use': 1, 'idle': 0, 'created': 1, 'reused': 0, 'max_size': 1}, pool.get_stats())
+
+    def test_configure_wakes_waiters(self):
+        pool = self._create_pool(max_size=1)
+        self.loop.run_until_complete(pool.checkout())
+        waiting = self.loop.create_task(pool.checkout())
+        self._settle()
+
+        pool.configure(max_size=2)
+        self.assertFalse(self.loop.run_until_complete(waiting)[1])
+        self.assertEqual(2, pool.get_stats()['in_use'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+import json
+import unittest
+
+import tests  # noqa: F401  src を import パスに追加する
+
+from gs2_core_client.Gs2PreparedRequest import Gs2PreparedRequest
+
+
+def _prepare(method, query_strings=None, body=None):
+    return Gs2PreparedRequest(
+        None, method, 'https://example.com/', None, 'service', 'Component', 'Function',
+        query_strings=query_strings, body=body)
+
+
+class Gs2PreparedRequestTest(unittest.TestCase):
+
+    def test_build_merges_body(self):
+        prepared = _prepare('POST', body={'a': 1})
+        _, encoded_body, _ = prepared.build(body={'b': 2})
+        self.assertEqual({'a': 1, 'b': 2}, json.loads(encoded_body.decode('utf-8')))
+
+        _, encoded_body, _ = prepared.build(body={'a': 3})
+        self.assertEqual({'a': 3}, json.loads(encoded_body.decode('utf-8')))
+
+    def test_build_copies_query_strings(self):
+        prepared = _prepare('GET', query_strings={'a': '1'})
+        query_strings, encoded_body, _ = prepared.build(query_strings={'b': '2'})
+        self.assertEqual({'a': '1', 'b': '2'}, query_strings)
+        self.assertIsNone(encoded_body)
+
+        query_strings['c'] = '3'
+        self.assertEqual({'a': '1'}, prepared.build()[0])
+
+    def test_body_for_method_without_body(self):
+        with self.assertRaises(ValueError):
+            _prepare('GET', body={'a': 1})
+        with self.assertRaises(ValueError):
+            _prepare('DELETE').build(body={'a': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import base64
+import sys
+import threading
+import unittest
+
+try:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+
+import tests  # noqa: F401  src を import パスに追加する
+
+from gs2_core_client import Gs2RateLimiter as rate_limiter_module
+from gs2_core_client.AbstractGs2Client import AbstractGs2Client
+from gs2_core_client.Gs2RateLimiter import Gs2RateLimiter
+from gs2_core_client.exception.ThrottledException import ThrottledException
+from gs2_core_client.fast_requests.retry import RetryPolicy
+from gs2_core_client.model.BasicGs2Credential import BasicGs2Credential
+
+KEY = ('s', None, None)
+
+
+class _Clock(object):
+    """
+    Gs2RateLimiter モジュールの time の代わりに使う
+    """
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def _create_credential():
+    return BasicGs2Credential('GKIT-TEST', base64.b64encode(b'0123456789abcdef0123456789abcdef').decode('ascii'))
+
+
+def _create_client(rate_limiter, client_class=AbstractGs2Client):
+    return client_class(_create_credential(), 'local') \
+        .with_rate_limiter(rate_limiter) \
+        .with_retry_policy(RetryPolicy(backoff_base=0.001, jitter=False))
+
+
+class Gs2RateLimiterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.original_time = rate_limiter_module.time
+        self.clock = rate_limiter_module.time = _Clock()
+
+    def tearDown(self):
+        rate_limiter_module.time = self.original_time
+
+    def test_throttle_decreases_rate_multiplicatively(self):
+        limiter = Gs2RateLimiter()
+        limiter.set_limit('s', rate=10.0)
+        limiter.feedback('s', 'c', 'f', 503)
+        self.assertAlmostEqual(limiter.get_stats()[KEY]['rate'], 5.0)
+
+        # decrease_interval の間に受け取った 402/503 ではさらに下げない
+        limiter.feedback('s', 'c', 'f', 402)
+        self.assertAlmostEqual(limiter.get_stats()[KEY]['rate'], 5.0)
+        self.clock.now += 1.0
+        limiter.feedback('s', 'c', 'f', 402)
+        self.assertAlmostEqual(limiter.get_stats()[KEY]['rate'], 2.5)
+
+    def test_success_increases_rate_per_elapsed_second(self):
+        limiter = Gs2RateLimiter(increase_step=1.0)
+        limiter.set_limit('s', rate=1.0, max_rate=4.0)
+        limiter.feedback('s', 'c', 'f', 503)
+        limiter.feedback('s', 'c', 'f', 200)
+        self.assertAlmostEqual(limiter.get_stats()[KEY]['rate'], 0.5)
+
+        self.clock.now += 0.25
+        limiter.feedback('s', 'c', 'f', 200)
+        self.assertAlmostEqual(limiter.get_stats()[KEY]['rate'], 0.75)
+        self.clock.now += 10.0
+        limiter.feedback('s', 'c', 'f', 200)
+        self.assertAlmostEqual(limiter.get_stats()[KEY]['rate'], 4.0)
+
+    def test_reserve_returns_wait_or_raises_beyond_max_wait(self):
+        limiter = Gs2RateLimiter()
+        limiter.set_limit('s', rate=2.0, burst=1.0)
+        self.assertEqual(limiter.reserve('s', 'c', 'f'), 0.0)
+        self.assertAlmostEqual(limiter.reserve('s', 'c', 'f'), 0.5)
+        self.assertRaises(ThrottledException, limiter.reserve, 's', 'c', 'f', 0.1)
+        stats = limiter.get_stats()[KEY]
+        self.assertEqual((stats['granted'], stats['rejected']), (2, 1))
+
+    def test_unlimited_service(self):
+        limiter = Gs2RateLimiter()
+        self.assertEqual(limiter.reserve('other', 'c', 'f', 0.0), 0.0)
+
+
+class AttemptHookTest(unittest.TestCase):
+
+    def test_no_hook_without_rate_limiter(self):
+        client = _create_client(None)
+        self.assertIsNone(client._make_attempt_hook('s', 'c', 'f', None))
+
+    def test_hook_feeds_back_status_and_reserves_token(self):
+        limiter = Gs2RateLimiter()
+        limiter.set_limit('s', rate=10.0)
+        on_attempt = _create_client(limiter)._make_attempt_hook('s', 'c', 'f', None)
+
+        wait = on_attempt(503)
+        stats = limiter.get_stats()[KEY]
+        self.assertAlmostEqual(stats['rate'], 5.0)
+        self.assertEqual(stats['granted'], 1)
+        # 503 でトークンが空になるため、次のトークンが補充されるまで待つ
+        self.assertGreater(wait, 0.0)
+
+        on_attempt(None)
+        self.assertEqual(limiter.get_stats()[KEY]['granted'], 2)
+
+    def test_hook_stops_retry_when_no_token_is_available(self):
+        limiter = Gs2RateLimiter(mode=Gs2RateLimiter.MODE_FAIL_FAST)
+        limiter.set_limit('s', rate=1.0)
+        on_attempt = _create_client(limiter)._make_attempt_hook('s', 'c', 'f', None)
+        self.assertIsNone(on_attempt(503))
+
+
+class _FlappingHandler(BaseHTTPRequestHandler):
+    """
+    503 と 200 を交互に返す
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits += 1
+            status = 503 if server.hits % 2 else 200
+        body = b'{}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+    # キープアライブの接続を処理しているスレッドの終了を待たずに閉じる
+    block_on_close = False
+
+
+class TransportRetryTest(unittest.TestCase):
+    """
+    トランスポートのリトライもレート制限の対象になり、各試行のステータスコードが送信レートに反映されることを確認する
+    """
+
+    def setUp(self):
+        self.server = _Server(('127.0.0.1', 0), _FlappingHandler)
+        self.server.lock = threading.Lock()
+        self.server.hits = 0
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.url = 'http://127.0.0.1:{port}/'.format(port=self.server.server_address[1])
+        self.limiter = Gs2RateLimiter()
+        self.limiter.set_limit('s', rate=100.0, max_rate=200.0)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def assert_every_attempt_is_limited(self):
+        stats = self.limiter.get_stats()[KEY]
+        self.assertEqual(self.server.hits, 10)
+        self.assertEqual(stats['granted'], self.server.hits)
+        self.assertLess(stats['rate'], 100.0)
+
+    @unittest.skipIf(sys.version_info[0] >= 3, 'the sync transport uses httplib')
+    def test_sync_retries_reserve_tokens(self):
+        client = _create_client(self.limiter)
+        for _ in range(5):
+            client._do_get_request(self.url, 's', 'c', 'f', {}, {})
+        self.assert_every_attempt_is_limited()
+
+    @unittest.skipIf(sys.version_info < (3, 5), 'the async client requires Python 3.5 or later')
+    def test_async_retries_reserve_tokens(self):
+        import asyncio
+        from gs2_core_client.AbstractGs2AsyncClient import AbstractGs2AsyncClient
+
+        client = _create_client(self.limiter, AbstractGs2AsyncClient)
+        loop = asyncio.new_event_loop()
+        try:
+            for _ in range(5):
+                loop.run_until_complete(client._do_get_request_async(self.url, 's', 'c', 'f', {}, {}))
+        finally:
+            loop.close()
+        self.assert_every_attempt_is_limited()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import unittest
+
+import tests  # noqa: F401  src を import パスに追加する
+
+from gs2_core_client.model.RefreshingGs2Credential import RefreshingGs2Credential
+
+
+class _Clock(object):
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class _Timer(object):
+    """
+    threading.Timer の代わりに予約内容を記録し、テストから fire() で実行する
+    """
+
+    def __init__(self, interval, function):
+        self.interval = interval
+        self.function = function
+        self.daemon = False
+        self.started = False
+        self.cancelled = False
+
+    def start(self):
+        self.started = True
+
+    def cancel(self):
+        self.cancelled = True
+
+    def fire(self):
+        self.function()
+
+
+class _Refresher(object):
+
+    def __init__(self, clock, lifetime=300.0):
+        self.clock = clock
+        self.lifetime = lifetime
+        self.calls = 0
+        self.error = None
+
+    def __call__(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return 'token-{calls}'.format(calls=self.calls), self.clock() + self.lifetime
+
+
+class RefreshingGs2CredentialTest(unittest.TestCase):
+
+    def setUp(self):
+        self.timers = []
+        self.clock = _Clock()
+        self.refresher = _Refresher(self.clock)
+
+    def create_timer(self, interval, function):
+        timer = _Timer(interval, function)
+        self.timers.append(timer)
+        return timer
+
+    def create(self, **kwargs):
+        kwargs.setdefault('refresh_before', 60.0)
+        kwargs.setdefault('retry_interval', 5.0)
+        return RefreshingGs2Credential(self.refresher, clock=self.clock, timer_factory=self.create_timer, **kwargs)
+
+    def last_timer(self):
+        return self.timers[-1]
+
+    def test_first_token_is_fetched_on_demand(self):
+        credential = self.create()
+        self.assertEqual(self.refresher.calls, 0)
+        self.assertEqual(credential.get_token(), 'token-1')
+        self.assertEqual(credential.get_token(), 'token-1')
+        self.assertEqual(self.refresher.calls, 1)
+
+    def test_refresh_is_scheduled_before_expiry(self):
+        credential = self.create()
+        credential.get_token()
+        timer = self.last_timer()
+        self.assertTrue(timer.started)
+        self.assertAlmostEqual(timer.interval, 240.0)
+
+        self.clock.now += 240.0
+        timer.fire()
+        self.assertEqual(self.refresher.calls, 2)
+        self.assertEqual(credential.get_token(), 'token-2')
+        self.assertAlmostEqual(self.last_timer().interval, 240.0)
+        self.assertEqual(credential.get_stats()['refreshes'], 2)
+
+    def test_short_lived_token_is_refreshed_at_half_lifetime(self):
+        self.refresher.lifetime = 30.0
+        credential = self.create()
+        credential.get_token()
+        self.assertAlmostEqual(self.last_timer().interval, 15.0)
+
+    def test_refresh_interval_never_drops_below_retry_interval(self):
+        self.refresher.lifetime = 2.0
+        credential = self.create()
+        credential.get_token()
+        self.assertAlmostEqual(self.last_timer().interval, 5.0)
+
+        # 予約した更新が実行されても、次の更新をすぐに予約し直さない
+        self.last_timer().fire()
+        self.assertEqual(self.refresher.calls, 2)
+        self.assertAlmostEqual(self.last_timer().interval, 5.0)
+
+    def test_failed_background_refresh_keeps_current_token(self):
+        credential = self.create()
+        credential.get_token()
+        self.clock.now += 240.0
+        self.refresher.error = ValueError('unavailable')
+        self.last_timer().fire()
+
+        self.assertEqual(credential.get_token(), 'token-1')
+        stats = credential.get_stats()
+        self.assertEqual(stats['failures'], 1)
+        self.assertIs(stats['last_error'], self.refresher.error)
+        self.assertAlmostEqual(self.last_timer().interval, 5.0)
+
+        self.refresher.error = None
+        self.clock.now += 5.0
+        self.last_timer().fire()
+        self.assertEqual(credential.get_token(), 'token-3')
+
+    def test_no_retry_is_scheduled_past_expiry(self):
+        credential = self.create()
+        credential.get_token()
+        timers = len(self.timers)
+        self.clock.now += 298.0
+        self.refresher.error = ValueError('unavailable')
+        self.last_timer().fire()
+        self.assertEqual(len(self.timers), timers)
+
+    def test_expired_token_waits_for_refresh_and_raises_on_failure(self):
+        credential = self.create()
+        credential.get_token()
+        self.clock.now += 300.0
+        self.refresher.error = ValueError('unavailable')
+        self.assertRaises(ValueError, credential.get_token)
+
+        self.refresher.error = None
+        self.assertEqual(credential.get_token(), 'token-3')
+
+    def test_close_cancels_scheduled_refresh(self):
+        credential = self.create()
+        credential.get_token()
+        timer = self.last_timer()
+        credential.close()
+        self.assertTrue(timer.cancelled)
+
+        timers = len(self.timers)
+        credential.refresh()
+        self.assertEqual(len(self.timers), timers)
+
+    def test_authorized_sets_token_header(self):
+        credential = self.create()
+        headers = {}
+        credential.authorized('module', 'function', headers, 1234)
+        self.assertEqual(headers['X-GS2-ONETIME-TOKEN'], 'token-1')
+        self.assertEqual(headers['X-GS2-REQUEST-TIMESTAMP'], '1234')
+
+
+if __name__ == '__main__':
+    unittest.main()
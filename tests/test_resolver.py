@@ -0,0 +1,233 @@
+# encoding: utf-8
+#
+# Copyright 2016 Game Server Services, Inc. or its affiliates. All Rights
+# Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import socket
+import threading
+import time
+import unittest
+
+import tests  # noqa: F401  src を import パスに追加する
+
+from gs2_core_client.fast_requests import resolver
+from gs2_core_client.fast_requests.resolver import CachingResolver, FakeResolver, SystemResolver, interleave, connect
+
+V4_A = (socket.AF_INET, ('192.0.2.1', 443))
+V4_B = (socket.AF_INET, ('192.0.2.2', 443))
+V6_A = (socket.AF_INET6, ('2001:db8::1', 443, 0, 0))
+V6_B = (socket.AF_INET6, ('2001:db8::2', 443, 0, 0))
+
+
+class _Clock(object):
+    """
+    resolver モジュールの time の代わりに使う
+    """
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class CachingResolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.original_time = resolver.time
+        self.clock = resolver.time = _Clock()
+        self.fake = FakeResolver({'example.com': ['192.0.2.1', '2001:db8::1']})
+
+    def tearDown(self):
+        resolver.time = self.original_time
+
+    def test_cached_until_ttl_expires(self):
+        caching = CachingResolver(self.fake, ttl=30.0)
+        expected = [(socket.AF_INET, ('192.0.2.1', 443)), (socket.AF_INET6, ('2001:db8::1', 443, 0, 0))]
+        self.assertEqual(caching.resolve('example.com', 443), expected)
+        self.clock.now += 29.0
+        self.assertEqual(caching.resolve('example.com', 443), expected)
+        self.assertEqual(self.fake.lookups, 1)
+
+        self.clock.now += 1.0
+        caching.resolve('example.com', 443)
+        self.assertEqual(self.fake.lookups, 2)
+        stats = caching.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 2, 1))
+
+    def test_ttl_from_resolver_takes_precedence(self):
+        self.fake.ttl = 5.0
+        caching = CachingResolver(self.fake, ttl=30.0)
+        caching.resolve('example.com', 443)
+        self.clock.now += 5.0
+        caching.resolve('example.com', 443)
+        self.assertEqual(self.fake.lookups, 2)
+
+    def test_ports_are_cached_separately(self):
+        caching = CachingResolver(self.fake)
+        self.assertEqual(caching.resolve('example.com', 80)[0], (socket.AF_INET, ('192.0.2.1', 80)))
+        self.assertEqual(caching.resolve('example.com', 443)[0], (socket.AF_INET, ('192.0.2.1', 443)))
+        self.assertEqual(self.fake.lookups, 2)
+
+    def test_failures_are_cached_for_negative_ttl(self):
+        caching = CachingResolver(self.fake, negative_ttl=5.0)
+        self.assertRaises(socket.gaierror, caching.resolve, 'unknown.example.com', 443)
+        self.assertRaises(socket.gaierror, caching.resolve, 'unknown.example.com', 443)
+        self.assertEqual(self.fake.lookups, 1)
+        self.assertEqual(caching.get_stats()['negative_hits'], 1)
+
+        self.fake.records['unknown.example.com'] = ['192.0.2.9']
+        self.clock.now += 5.0
+        self.assertEqual(caching.resolve('unknown.example.com', 443), [(socket.AF_INET, ('192.0.2.9', 443))])
+
+    def test_ip_address_is_not_resolved(self):
+        caching = CachingResolver(self.fake)
+        self.assertEqual(caching.resolve('192.0.2.7', 443), [(socket.AF_INET, ('192.0.2.7', 443))])
+        self.assertEqual(caching.resolve('2001:db8::7', 443), [(socket.AF_INET6, ('2001:db8::7', 443, 0, 0))])
+        self.assertEqual(self.fake.lookups, 0)
+
+    def test_invalidate(self):
+        caching = CachingResolver(self.fake)
+        caching.resolve('example.com', 443)
+        caching.invalidate('example.com')
+        caching.resolve('example.com', 443)
+        self.assertEqual(self.fake.lookups, 2)
+
+    def test_max_entries(self):
+        self.fake.records.update({'a.example.com': ['192.0.2.3'], 'b.example.com': ['192.0.2.4']})
+        caching = CachingResolver(self.fake, max_entries=2)
+        for host in ('example.com', 'a.example.com', 'b.example.com'):
+            caching.resolve(host, 443)
+        self.assertLessEqual(caching.get_stats()['entries'], 2)
+
+
+class SystemResolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.original_getaddrinfo = socket.getaddrinfo
+
+    def tearDown(self):
+        socket.getaddrinfo = self.original_getaddrinfo
+
+    def test_duplicates_are_removed(self):
+        def getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+            return [
+                (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('192.0.2.1', port)),
+                (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('192.0.2.1', port)),
+                (socket.AF_INET6, socket.SOCK_STREAM, 6, '', ('2001:db8::1', port, 0, 0)),
+            ]
+
+        socket.getaddrinfo = getaddrinfo
+        addresses, ttl = SystemResolver().resolve('example.com', 443)
+        self.assertEqual(addresses, [V4_A, V6_A])
+        self.assertIsNone(ttl)
+
+
+class InterleaveTest(unittest.TestCase):
+
+    def test_families_alternate_starting_with_first(self):
+        self.assertEqual(interleave([V6_A, V6_B, V4_A, V4_B]), [V6_A, V4_A, V6_B, V4_B])
+        self.assertEqual(interleave([V4_A, V6_A, V6_B]), [V4_A, V6_A, V6_B])
+        self.assertEqual(interleave([V4_A]), [V4_A])
+
+
+class _Socket(object):
+
+    def __init__(self, address):
+        self.address = address
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectTest(unittest.TestCase):
+    """
+    _connect_address を差し替え、アドレスごとの接続の成否と所要時間を指定して Happy Eyeballs の動作を確認する
+    """
+
+    def setUp(self):
+        self.original_connect_address = resolver._connect_address
+        self.behaviors = {}
+        self.release = threading.Event()
+        self.sockets = []
+        resolver._connect_address = self.connect_address
+
+    def tearDown(self):
+        self.release.set()
+        resolver._connect_address = self.original_connect_address
+
+    def connect_address(self, address, timeout, source_address):
+        behavior = self.behaviors[address]
+        if behavior == 'hang':
+            self.release.wait(5)
+            behavior = 'ok'
+        if behavior == 'refused':
+            raise socket.error('connection refused')
+        sock = _Socket(address)
+        self.sockets.append(sock)
+        return sock
+
+    def test_single_address(self):
+        self.behaviors = {V4_A: 'ok'}
+        address, sock = connect([V4_A], 1.0)
+        self.assertEqual((address, sock.address), (V4_A, V4_A))
+
+    def test_falls_back_immediately_when_first_address_fails(self):
+        self.behaviors = {V6_A: 'refused', V4_A: 'ok'}
+        started_at = time.time()
+        address, sock = connect([V6_A, V4_A], 10.0, attempt_delay=5.0)
+        self.assertEqual(address, V4_A)
+        self.assertLess(time.time() - started_at, 1.0)
+
+    def test_starts_next_address_after_attempt_delay(self):
+        self.behaviors = {V6_A: 'hang', V4_A: 'ok'}
+        started_at = time.time()
+        address, sock = connect([V6_A, V4_A], 10.0, attempt_delay=0.05)
+        elapsed = time.time() - started_at
+        self.assertEqual(address, V4_A)
+        self.assertGreaterEqual(elapsed, 0.04)
+        self.assertLess(elapsed, 1.0)
+
+        # 遅れて確立した接続は使われずに閉じられる
+        self.release.set()
+        for _ in range(100):
+            if len(self.sockets) == 2:
+                break
+            time.sleep(0.01)
+        late = [s for s in self.sockets if s.address == V6_A]
+        self.assertEqual(len(late), 1)
+        for _ in range(100):
+            if late[0].closed:
+                break
+            time.sleep(0.01)
+        self.assertTrue(late[0].closed)
+        self.assertFalse(sock.closed)
+
+    def test_raises_last_error_when_all_addresses_fail(self):
+        self.behaviors = {V6_A: 'refused', V4_A: 'refused'}
+        self.assertRaises(socket.error, connect, [V6_A, V4_A], 1.0, attempt_delay=0.05)
+
+    def test_times_out_when_no_address_answers(self):
+        self.behaviors = {V6_A: 'hang', V4_A: 'hang'}
+        started_at = time.time()
+        self.assertRaises(socket.timeout, connect, [V6_A, V4_A], 0.2, attempt_delay=0.05)
+        self.assertLess(time.time() - started_at, 1.0)
+
+    def test_no_address(self):
+        self.assertRaises(socket.error, connect, [], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()